@@ -1,18 +1,80 @@
+from .async_iter_to_sync import async_iter_to_sync
 from .async_to_sync import async_to_sync
+from .background_loop import BackgroundLoop
+from .background_loop import get_background_loop
+from .background_loop import start_background_loop
+from .background_loop import stop_background_loop
+from .channel import Channel
+from .channel import ChannelClosed
 from .event_loop import EventLoop
 from .event_loop_policy import EventLoopPolicy
 from .future_to_greenlet import future_to_greenlet
+from .gather_greenlets import gather_greenlets
+from .greenlet_pool import GreenletPool
+from .greenlet_pool import GreenletPoolStats
 from .greenlet_to_future import greenlet_to_future
+from .hub_event_loop import HubEventLoop
+from .hub_event_loop_policy import HubEventLoopPolicy
+from .instrumentation import BridgeCollector
+from .instrumentation import BridgeEvent
+from .instrumentation import BridgeStats
+from .instrumentation import LatencyHistogram
+from .instrumentation import add_bridge_observer
+from .instrumentation import remove_bridge_observer
+from .locks import Condition
+from .locks import Event
+from .locks import Lock
+from .locks import Semaphore
+from .loop_group import LoopGroup
+from .loop_group import LoopGroupFuture
+from .loop_group import LoopThreadStats
+from .loop_monitor import LoopMonitor
+from .loop_monitor import LoopMonitorStats
+from .loop_monitor import Stall
+from .prefork import PreforkServer
+from .sync_iter_to_async import sync_iter_to_async
 from .sync_to_async import sync_to_async
+from .wait_futures import wait_futures
 
 # from .gevent_loop import GeventLoop
 
 __all__ = [
+    "add_bridge_observer",
+    "async_iter_to_sync",
     "async_to_sync",
+    "BackgroundLoop",
+    "BridgeCollector",
+    "BridgeEvent",
+    "BridgeStats",
+    "Channel",
+    "ChannelClosed",
+    "Condition",
+    "Event",
     "EventLoop",
     "EventLoopPolicy",
     "future_to_greenlet",
+    "gather_greenlets",
+    "get_background_loop",
     # "GeventLoop",
     "greenlet_to_future",
+    "GreenletPool",
+    "GreenletPoolStats",
+    "HubEventLoop",
+    "HubEventLoopPolicy",
+    "LatencyHistogram",
+    "Lock",
+    "LoopGroup",
+    "LoopGroupFuture",
+    "LoopMonitor",
+    "LoopMonitorStats",
+    "LoopThreadStats",
+    "PreforkServer",
+    "remove_bridge_observer",
+    "Semaphore",
+    "Stall",
+    "start_background_loop",
+    "stop_background_loop",
+    "sync_iter_to_async",
     "sync_to_async",
+    "wait_futures",
 ]
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any
+from typing import Deque
+from typing import Optional
+
+import gevent
+from gevent.hub import Waiter
+
+from ._loop_helpers import call_soon_from_greenlet
+
+__all__ = ["Handoff", "HandoffWaiters"]
+
+
+def _noop():
+    pass
+
+
+class Handoff:
+    """
+    A greenlet or a task that waits in a FIFO queue of a `HandoffWaiters`, e.g. for an item of a `Channel` or for a
+    `Lock`.
+
+    A greenlet waits on a `Waiter` and a task waits on a future. Either way, the item (or the error) is stored on the
+    handoff before the waiter is woken up, so a waiter that is interrupted after it was woken up can tell whether the
+    handoff already happened.
+    """
+
+    __slots__ = ("item", "waiter", "future", "done", "error")
+
+    def __init__(self, item: Any, waiter: Optional[Waiter] = None, future: Optional[asyncio.Future] = None):
+        self.item = item
+        self.waiter = waiter
+        self.future = future
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class HandoffWaiters:
+    """
+    The base of objects that greenlets and tasks of the same thread wait on in shared FIFO queues.
+
+    A waiting greenlet is woken up by a hub callback and a waiting task by resolving its future, so waking either one
+    doesn't create a greenlet, a task or a thread. When a greenlet resolves futures, their loop is woken up once by
+    `_wake_loop` at the end of the operation, however many futures were resolved. A task resolving futures of its own
+    loop doesn't wake it.
+    """
+
+    def __init__(self):
+        self._loop_to_wake: Optional[asyncio.AbstractEventLoop] = None
+
+    def _next_waiter(self, waiters: Deque[Handoff]) -> Optional[Handoff]:
+        while waiters:
+            handoff = waiters.popleft()
+            # A task that has been cancelled will withdraw once it runs
+            if handoff.future is None or not handoff.future.done():
+                return handoff
+        return None
+
+    def _resolve(self, handoff: Handoff, item: Any, error: Optional[BaseException] = None):
+        handoff.item = item
+        handoff.error = error
+        handoff.done = True
+
+        future = handoff.future
+        if future is None:
+            waiter = handoff.waiter
+            # A waiter can only be switched to from the hub
+            waiter.hub.loop.run_callback(waiter.switch, None)  # type: ignore
+            return
+
+        future.set_result(None)
+        loop = future.get_loop()
+        if self._loop_to_wake is not None and self._loop_to_wake is not loop:
+            self._wake_loop()
+        self._loop_to_wake = loop
+
+    def _wake_loop(self):
+        # A loop whose futures were resolved by a greenlet may be blocked in
+        # its selector, unless one of its tasks is running, e.g. the one that
+        # called `release` or `set`
+        loop = self._loop_to_wake
+        if loop is not None:
+            self._loop_to_wake = None
+            if asyncio.current_task(loop) is None:
+                call_soon_from_greenlet(loop, _noop)
+
+    def _withdraw(self, handoff: Handoff, waiters: Deque[Handoff]):
+        # Called when a waiter was interrupted. Subclasses undo handoffs that
+        # already happened.
+        if not handoff.done:
+            try:
+                waiters.remove(handoff)
+            except ValueError:
+                pass
+
+    def _wait(self, handoff: Handoff, waiters: Deque[Handoff], timeout: Optional[float], timeout_error: type):
+        waiters.append(handoff)
+        try:
+            with gevent.Timeout(timeout, timeout_error):
+                handoff.waiter.get()  # type: ignore
+        except BaseException:
+            # The greenlet was killed, interrupted or timed out
+            self._withdraw(handoff, waiters)
+            self._wake_loop()
+            raise
+        if handoff.error is not None:
+            raise handoff.error
+
+    async def _await(self, handoff: Handoff, waiters: Deque[Handoff]):
+        waiters.append(handoff)
+        try:
+            await handoff.future  # type: ignore
+        except BaseException:
+            # The task was cancelled
+            self._withdraw(handoff, waiters)
+            self._loop_to_wake = None
+            raise
+        if handoff.error is not None:
+            raise handoff.error
@@ -0,0 +1,233 @@
+import asyncio
+import collections
+import threading
+import weakref
+from typing import Coroutine
+from typing import Deque
+from typing import Optional
+from typing import Union
+
+import gevent.monkey
+from gevent._hub_local import get_hub_if_exists
+from gevent.hub import Waiter
+
+__all__ = [
+    "call_soon_from_greenlet",
+    "in_foreign_thread",
+    "loop_in_other_thread",
+    "wait_from_greenlet",
+    "wait_from_thread",
+]
+
+_allocate_lock = gevent.monkey.get_original("_thread", "allocate_lock")
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+_thread_local = gevent.monkey.get_original("_thread", "_local")
+
+
+def _noop():
+    pass
+
+
+class _FutureDoneWaiter(Waiter):
+    """
+    A waiter that is its future's done callback.
+
+    The callback runs in the loop's greenlet, but a waiter can only be switched to from the hub, so it wakes the
+    waiting greenlet with a hub callback.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, future: asyncio.Future):
+        self.hub.loop.run_callback(self.switch, None)
+
+
+def call_soon_from_greenlet(loop: asyncio.AbstractEventLoop, callback, *args) -> asyncio.Handle:
+    """
+    Schedule `callback(*args)` on `loop` from gevent code, e.g. a hub callback or a greenlet link.
+
+    `asyncio_gevent.EventLoop` wakes its greenlet through the gevent selector. Any other loop is woken with
+    `call_soon_threadsafe`, since it may be blocked in a selector that gevent knows nothing about.
+    """
+    call_soon = getattr(loop, "call_soon_from_greenlet", None)
+    if call_soon is not None:
+        return call_soon(callback, *args)
+    return loop.call_soon_threadsafe(callback, *args)
+
+
+def wait_from_greenlet(
+    loop: asyncio.AbstractEventLoop, future_or_coro: Union[asyncio.Future, Coroutine]
+) -> asyncio.Future:
+    """
+    Schedule `future_or_coro` on `loop`, which is running in another greenlet, and block the current greenlet until it
+    is done.
+
+    Returns the done future.
+    """
+    future = asyncio.ensure_future(future_or_coro, loop=loop)
+
+    if not future.done():
+        waiter = _FutureDoneWaiter()
+        future.add_done_callback(waiter)
+
+        # `ensure_future` scheduled the first step of the task from outside the
+        # loop greenlet, so the loop may need to be woken up to notice it
+        call_soon_from_greenlet(loop, _noop)
+
+        try:
+            waiter.get()
+        except BaseException:
+            # The waiting greenlet was killed or interrupted, so the future
+            # won't be waited for anymore
+            call_soon_from_greenlet(loop, future.cancel)
+            raise
+
+    return future
+
+
+def loop_in_other_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    Whether `loop` is running in another OS thread than the current one.
+    """
+    # `asyncio_gevent.EventLoop` records the native thread it runs in, other
+    # loops record the thread ident that asyncio uses
+    if hasattr(loop, "_native_thread_id"):
+        thread_id = loop._native_thread_id  # type: ignore
+        return thread_id is not None and thread_id != _get_ident()
+    thread_id = getattr(loop, "_thread_id", None)
+    return thread_id is not None and thread_id != threading.get_ident()
+
+
+def in_foreign_thread(loop: asyncio.AbstractEventLoop) -> bool:
+    """
+    Whether `loop` is running in another OS thread than the current one and the current thread doesn't have a gevent
+    hub, e.g. a thread of the gevent threadpool or a thread that a C library calls back from.
+    """
+    return get_hub_if_exists() is None and loop_in_other_thread(loop)
+
+
+class _ThreadWaiter(_thread_local):
+    """
+    A lock per OS thread that a thread blocks on while it waits for a future on a loop in another thread.
+
+    The lock is held between waits, so the done callback of the future releases it and the waiting thread acquires it
+    again.
+    """
+
+    def __init__(self):
+        self.lock = _allocate_lock()
+        self.lock.acquire()
+
+
+_thread_waiter = _ThreadWaiter()
+
+
+class _ThreadCall:
+    __slots__ = ("future_or_coro", "wake", "future", "error", "crossing")
+
+    def __init__(self, future_or_coro, wake, crossing):
+        self.future_or_coro = future_or_coro
+        self.wake = wake
+        self.future: Optional[asyncio.Future] = None
+        self.error: Optional[BaseException] = None
+        self.crossing = crossing
+
+    def start(self, loop: asyncio.AbstractEventLoop):
+        # Runs in the loop's thread
+        if self.crossing is not None:
+            self.crossing.start()
+        try:
+            self.future = asyncio.ensure_future(self.future_or_coro, loop=loop)
+        except BaseException as e:
+            self.error = e
+            self.wake()
+            return
+        self.future.add_done_callback(self)
+
+    def cancel(self):
+        # Runs in the loop's thread, after the call has been started
+        if self.future is not None:
+            self.future.cancel()
+
+    def __call__(self, future: asyncio.Future):
+        self.wake()
+
+
+class _ThreadSubmitter:
+    """
+    The queue of futures and coroutines that foreign threads have submitted to a loop.
+
+    A submission only wakes the loop if no wakeup is pending yet, so that the calls of many threads are started by a
+    single callback.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: Deque[_ThreadCall] = collections.deque()
+        self.wakeup_pending = False
+
+    def submit(self, call: _ThreadCall):
+        self.queue.append(call)
+        if not self.wakeup_pending:
+            self.wakeup_pending = True
+            self.loop.call_soon_threadsafe(self._drain)
+
+    def _drain(self):
+        # Cleared before draining, so that a call that is queued meanwhile is
+        # either drained too or schedules another wakeup
+        self.wakeup_pending = False
+        queue = self.queue
+        while queue:
+            queue.popleft().start(self.loop)
+
+
+_submitters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ThreadSubmitter]" = weakref.WeakKeyDictionary()
+_submitters_lock = _allocate_lock()
+
+
+def wait_from_thread(
+    loop: asyncio.AbstractEventLoop, future_or_coro: Union[asyncio.Future, Coroutine], crossing=None
+) -> asyncio.Future:
+    """
+    Schedule `future_or_coro` on `loop`, which is running in another OS thread, and block until it is done.
+
+    A thread without a gevent hub blocks on a lock of its own. In a thread with a hub, only the current greenlet
+    blocks.
+
+    Returns the done future.
+    """
+    submitter = _submitters.get(loop)
+    if submitter is None:
+        with _submitters_lock:
+            submitter = _submitters.get(loop)
+            if submitter is None:
+                submitter = _submitters[loop] = _ThreadSubmitter(loop)
+
+    hub = get_hub_if_exists()
+    if hub is None:
+        lock = _thread_waiter.lock
+        call = _ThreadCall(future_or_coro, lock.release, crossing)
+        submitter.submit(call)
+        lock.acquire()
+    else:
+        # A thread with a hub only blocks the current greenlet, which is woken
+        # by an async watcher, the loop's thread-safe way to be woken up
+        waiter = Waiter(hub)
+        watcher = hub.loop.async_()
+        watcher.start(waiter.switch, None)
+        call = _ThreadCall(future_or_coro, watcher.send, crossing)
+        try:
+            submitter.submit(call)
+            waiter.get()
+        except BaseException:
+            # The waiting greenlet was killed or interrupted, so the future
+            # won't be waited for anymore
+            loop.call_soon_threadsafe(call.cancel)
+            raise
+        finally:
+            watcher.close()
+
+    if call.error is not None:
+        raise call.error
+    assert call.future is not None
+    return call.future
@@ -0,0 +1,243 @@
+import asyncio
+import collections
+from typing import Any
+from typing import AsyncIterable
+from typing import AsyncIterator
+from typing import Deque
+from typing import Iterator
+from typing import List
+from typing import Optional
+
+import gevent
+
+from ._loop_helpers import call_soon_from_greenlet
+from ._loop_helpers import loop_in_other_thread
+from ._loop_helpers import wait_from_greenlet
+from ._loop_helpers import wait_from_thread
+from .background_loop import BackgroundLoop
+from .background_loop import _get_background_loop_of_any_thread
+
+__all__ = ["async_iter_to_sync"]
+
+
+class _AsyncIterBridge:
+    """
+    The state of one `async_iter_to_sync` stream.
+
+    A task on the loop iterates the async iterable ahead of the consumer into a buffer and pauses while the buffer
+    holds `prefetch` items. The consuming greenlet takes up to `batch` items out of the buffer per crossing and hands
+    them out one at a time. The buffer is only touched on the loop.
+    """
+
+    def __init__(self, aiterator: AsyncIterator, prefetch: int, batch: int, loop: Optional[asyncio.AbstractEventLoop]):
+        self.aiterator = aiterator
+        self.prefetch = prefetch
+        self.batch = batch
+        self.loop = loop
+        self.owned_loop: Optional[BackgroundLoop] = None
+        self.items: Deque[Any] = collections.deque()
+        self.started = False
+        self.done = False
+
+        # Only used on the loop
+        self.buffer: Deque[Any] = collections.deque()
+        self.task: Optional[asyncio.Future] = None
+        self.finished = False
+        self.cancelled = False
+        self.error: Optional[BaseException] = None
+        self.readable: Optional[asyncio.Future] = None
+        self.writable: Optional[asyncio.Future] = None
+
+    def __iter__(self) -> "_AsyncIterBridge":
+        return self
+
+    def __next__(self):
+        items = self.items
+        if not items:
+            if self.done:
+                raise StopIteration
+            self._fetch()
+        return items.popleft()
+
+    def __enter__(self) -> "_AsyncIterBridge":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if self.started and not self.done:
+            try:
+                self._abort()
+            except Exception:
+                pass
+
+    def close(self):
+        """
+        Stop iterating, cancel the task that iterates ahead and close the async iterable.
+        """
+        if self.done:
+            return
+        self.done = True
+        if not self.started:
+            return
+        try:
+            self._wait(self._aclose())
+        finally:
+            self._release_loop()
+
+    def _resolve_loop(self) -> asyncio.AbstractEventLoop:
+        if self.loop is not None:
+            return self.loop
+
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+        background_loop = _get_background_loop_of_any_thread()
+        if background_loop is None:
+            # The stream needs a loop that keeps running between batches
+            background_loop = self.owned_loop = BackgroundLoop()
+        return background_loop.loop
+
+    def _wait(self, coro):
+        loop = self.loop
+        if loop_in_other_thread(loop):
+            future = wait_from_thread(loop, coro)
+        else:
+            future = wait_from_greenlet(loop, coro)
+        return future.result()
+
+    def _fetch(self):
+        if not self.started:
+            self.loop = self._resolve_loop()
+            self.started = True
+
+        try:
+            items = self._wait(self._next_batch())
+        except asyncio.CancelledError:
+            self._abort()
+            raise gevent.GreenletExit()
+        except BaseException:
+            # The consuming greenlet was killed or interrupted
+            self._abort()
+            raise
+
+        if items:
+            self.items.extend(items)
+            return
+
+        self.done = True
+        self._release_loop()
+        if self.error is not None:
+            raise self.error
+        if self.cancelled:
+            # Like the greenlet of a cancelled future
+            raise gevent.GreenletExit()
+        raise StopIteration
+
+    def _abort(self):
+        # Doesn't block, so that it can be called from a greenlet that is
+        # being killed
+        self.done = True
+        if self.owned_loop is not None:
+            gevent.spawn(self.owned_loop.stop)
+        elif loop_in_other_thread(self.loop):
+            self.loop.call_soon_threadsafe(self._cancel_task)
+        else:
+            call_soon_from_greenlet(self.loop, self._cancel_task)
+
+    def _release_loop(self):
+        if self.owned_loop is not None:
+            self.owned_loop.stop()
+            self.owned_loop = None
+
+    def _cancel_task(self):
+        # Runs on the loop
+        if self.task is not None:
+            self.task.cancel()
+
+    async def _aclose(self):
+        task = self.task
+        if task is not None and not task.done():
+            task.cancel()
+            await asyncio.wait([task])
+
+    async def _next_batch(self) -> List[Any]:
+        if self.task is None:
+            self.task = asyncio.ensure_future(self._produce())
+
+        buffer = self.buffer
+        while not buffer and not self.finished:
+            self.readable = asyncio.get_running_loop().create_future()
+            try:
+                await self.readable
+            finally:
+                self.readable = None
+
+        items = [buffer.popleft() for _ in range(min(self.batch, len(buffer)))]
+        writable = self.writable
+        if writable is not None and not writable.done() and len(buffer) < self.prefetch:
+            writable.set_result(None)
+        return items
+
+    def _wake_consumer(self):
+        readable = self.readable
+        if readable is not None and not readable.done():
+            readable.set_result(None)
+
+    async def _produce(self):
+        buffer = self.buffer
+        try:
+            async for item in self.aiterator:
+                buffer.append(item)
+                self._wake_consumer()
+                if len(buffer) >= self.prefetch:
+                    self.writable = asyncio.get_running_loop().create_future()
+                    await self.writable
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            try:
+                # The async generator is suspended at a `yield` if the task was
+                # cancelled while the buffer was full
+                aclose = getattr(self.aiterator, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            finally:
+                self.finished = True
+                self._wake_consumer()
+
+
+def async_iter_to_sync(
+    aiterable: AsyncIterable,
+    prefetch: int = 64,
+    batch: int = 16,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> Iterator:
+    """
+    Wrap an async iterable, e.g. an async generator, in an iterator that greenlets can iterate over.
+
+    The async iterable is iterated by a task on `loop`, or on the running loop, or on the background loop, also if it
+    was started in another thread. Otherwise, a loop is started in a greenlet for the lifetime of the iterator. The
+    task iterates ahead of the consumer into a buffer of at most `prefetch` items and pauses while the buffer is full.
+    The consuming greenlet blocks on the loop once for up to `batch` items instead of once per item, and doesn't
+    block at all while it has items left over from the previous batch.
+
+    Exceptions raised by the async iterable are raised by the iterator after the items that were produced before.
+
+    If the consuming greenlet is killed while it waits for items, the task is cancelled and the async iterable is
+    closed. Breaking out of the iteration early should be followed by `close()`, or the iterator can be used as a
+    context manager. If the task gets cancelled, the iterator raises `GreenletExit`, which kills the consuming
+    greenlet like a cancelled `future_to_greenlet`.
+    """
+    if prefetch < 1:
+        raise ValueError("prefetch must be at least 1")
+    if batch < 1:
+        raise ValueError("batch must be at least 1")
+
+    return _AsyncIterBridge(aiterable.__aiter__(), prefetch, batch, loop)
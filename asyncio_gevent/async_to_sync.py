@@ -1,7 +1,29 @@
+import asyncio
 from typing import Callable
 from typing import Optional
 
-from .future_to_greenlet import future_to_greenlet
+import gevent
+
+from ._loop_helpers import in_foreign_thread
+from ._loop_helpers import wait_from_thread
+from .background_loop import _get_background_loop_of_any_thread
+from .future_to_greenlet import _future_to_greenlet
+from .instrumentation import _Crossing
+from .instrumentation import _observers
+
+
+def _call_from_foreign_thread(loop: asyncio.AbstractEventLoop, coro, autokill_greenlet: bool):
+    crossing = _Crossing("async_to_sync") if _observers else None
+    future = wait_from_thread(loop, coro, crossing)
+    if crossing is not None:
+        crossing(future)
+    try:
+        return future.result()
+    except asyncio.CancelledError:
+        if autokill_greenlet:
+            # Like the greenlet of a cancelled future, return the `GreenletExit`
+            return gevent.GreenletExit()
+        raise
 
 
 def async_to_sync(
@@ -9,9 +31,15 @@ def async_to_sync(
     autostart_future: bool = True,
     autocancel_future: bool = True,
     autokill_greenlet: bool = True,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
 ):
     """
     Wrap a coroutine function in a blocking function that spawns a greenlet and blocks until the future is done.
+
+    The coroutine runs on `loop` if it's passed, like with `future_to_greenlet`. When the blocking function is called
+    from an OS thread without a gevent hub, e.g. a thread of the gevent threadpool or a thread that a C library calls
+    back from, and `loop` or the background loop runs in another thread, the coroutine is handed to that loop
+    directly. The calling thread then blocks on a lock of its own, without a greenlet, a hub or a new loop.
     """
     if coroutine is None:
 
@@ -21,16 +49,28 @@ def async_to_sync(
                 autostart_future=autostart_future,
                 autocancel_future=autocancel_future,
                 autokill_greenlet=autokill_greenlet,
+                loop=loop,
             )
 
         return decorator
 
     def fn(*args, **kwargs):
-        greenlet = future_to_greenlet(
+        owner = loop
+        if owner is None:
+            background_loop = _get_background_loop_of_any_thread()
+            if background_loop is not None:
+                owner = background_loop.loop
+
+        if owner is not None and autostart_future and in_foreign_thread(owner):
+            return _call_from_foreign_thread(owner, coroutine(*args, **kwargs), autokill_greenlet)
+
+        greenlet = _future_to_greenlet(
             coroutine(*args, **kwargs),
-            autostart_future=autostart_future,
-            autocancel_future=autocancel_future,
-            autokill_greenlet=autokill_greenlet,
+            loop,
+            autostart_future,
+            autocancel_future,
+            autokill_greenlet,
+            _Crossing("async_to_sync") if _observers else None,
         )
         greenlet.start()
         greenlet.join()
@@ -0,0 +1,156 @@
+import asyncio
+import atexit
+from typing import Callable
+from typing import Coroutine
+from typing import Optional
+from typing import Union
+
+import gevent
+import gevent.monkey
+
+from ._loop_helpers import call_soon_from_greenlet
+from ._loop_helpers import wait_from_greenlet
+from .event_loop import EventLoop
+
+__all__ = [
+    "BackgroundLoop",
+    "get_background_loop",
+    "start_background_loop",
+    "stop_background_loop",
+]
+
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+
+
+class BackgroundLoop:
+    """
+    A long-lived asyncio event loop that runs forever in a dedicated greenlet.
+
+    Greenlets of the thread that created the background loop can submit
+    futures and coroutines to it with `run`, which costs a single callback on
+    the loop instead of creating, running and closing a new event loop.
+    """
+
+    def __init__(self, loop_factory: Callable[[], asyncio.AbstractEventLoop] = EventLoop):
+        self.loop_factory = loop_factory
+        self.loop = loop_factory()
+        self.thread_id = _get_ident()
+        self._greenlet: Optional[gevent.Greenlet] = gevent.spawn(self.loop.run_forever)
+
+    @property
+    def running(self) -> bool:
+        return self._greenlet is not None
+
+    def run(self, future_or_coro: Union[asyncio.Future, Coroutine]) -> asyncio.Future:
+        """
+        Schedule `future_or_coro` on the background loop and block the current
+        greenlet until it is done.
+
+        Returns the done future.
+        """
+        return wait_from_greenlet(self.loop, future_or_coro)
+
+    def stop(self):
+        """
+        Cancel all remaining tasks, stop the loop and close it.
+        """
+        if self._greenlet is None:
+            return
+
+        self.run(self._shutdown())
+        call_soon_from_greenlet(self.loop, self.loop.stop)
+        self._greenlet.join()
+        self._greenlet = None
+        self.loop.close()
+
+    def _abandon(self):
+        # In a forked child, the loop and its tasks belong to the parent
+        # process, so its greenlets are killed without running any callbacks
+        if self._greenlet is None:
+            return
+        loop_greenlet = getattr(self.loop, "_greenlet", None)
+        gevent.killall([greenlet for greenlet in (loop_greenlet, self._greenlet) if greenlet is not None])
+        self._greenlet = None
+
+    async def _shutdown(self):
+        current_task = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current_task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.loop.shutdown_asyncgens()
+
+
+_background_loop: Optional[BackgroundLoop] = None
+_atexit_registered = False
+
+
+def start_background_loop(loop_factory: Callable[[], asyncio.AbstractEventLoop] = EventLoop) -> BackgroundLoop:
+    """
+    Start the shared background loop, if it isn't already running.
+
+    Once started, `future_to_greenlet` and `async_to_sync` will run futures
+    and coroutines on the background loop when they're called from the same
+    thread without a running loop or a `loop` argument, instead of creating a
+    new event loop for every call. The background loop is stopped
+    automatically when the interpreter exits.
+    """
+    global _background_loop, _atexit_registered
+
+    if _background_loop is None or not _background_loop.running:
+        _background_loop = BackgroundLoop(loop_factory)
+
+    if not _atexit_registered:
+        atexit.register(stop_background_loop)
+        _atexit_registered = True
+
+    return _background_loop
+
+
+def stop_background_loop() -> None:
+    """
+    Stop the shared background loop, if it is running.
+    """
+    global _background_loop
+
+    background_loop = _background_loop
+    if background_loop is None or background_loop.thread_id != _get_ident():
+        return
+
+    _background_loop = None
+    background_loop.stop()
+
+
+def get_background_loop() -> Optional[BackgroundLoop]:
+    """
+    Return the shared background loop if it is running and owned by the
+    current thread, otherwise `None`.
+    """
+    background_loop = _background_loop
+    if background_loop is None or not background_loop.running or background_loop.thread_id != _get_ident():
+        return None
+    return background_loop
+
+
+def _get_background_loop_of_any_thread() -> Optional[BackgroundLoop]:
+    # Threads without a loop of their own, e.g. threads of the gevent
+    # threadpool, submit their coroutines to the background loop of the thread
+    # that started it
+    background_loop = _background_loop
+    if background_loop is None or not background_loop.running:
+        return None
+    return background_loop
+
+
+def _reinit_background_loop_after_fork() -> None:
+    # Replaces a background loop that was running in the forking thread of the
+    # parent process with a new one
+    global _background_loop
+
+    background_loop = _background_loop
+    _background_loop = None
+    if background_loop is None or not background_loop.running or background_loop.thread_id != _get_ident():
+        return
+
+    background_loop._abandon()
+    start_background_loop(background_loop.loop_factory)
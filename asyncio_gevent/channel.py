@@ -0,0 +1,260 @@
+import asyncio
+import collections
+import queue
+from typing import Any
+from typing import Deque
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import gevent
+from gevent.hub import Waiter
+
+from ._handoff import Handoff
+from ._handoff import HandoffWaiters
+
+__all__ = ["Channel", "ChannelClosed"]
+
+
+def _check_max_items(max_items: Optional[int]):
+    if max_items is not None and max_items < 1:
+        raise ValueError("max_items must be at least 1")
+
+
+class ChannelClosed(Exception):
+    """
+    Raised when putting into a closed `Channel`, or getting from a closed `Channel` that has no items left.
+    """
+
+
+class Channel(HandoffWaiters):
+    """
+    A FIFO channel between greenlets and coroutines that run in the same thread.
+
+    Greenlets call `put`, `get`, `put_many` and `get_many`, which block the current greenlet. Coroutines await `aput`,
+    `aget`, `aput_many` and `aget_many`. Greenlets and tasks wait in the same FIFO queues, and an item is handed
+    directly to the greenlet or task that has waited the longest, which is woken up in its own world: a greenlet by a
+    hub callback and a task by resolving its future. No greenlet, task or thread is created for a handoff, and the
+    loop is woken up once per operation of a greenlet, however many tasks it hands items to.
+
+    With `maxsize`, the channel holds at most `maxsize` items and puts wait while it's full. Once the channel is
+    closed with `close`, puts raise `ChannelClosed`, and gets return the remaining items and then raise
+    `ChannelClosed`. Iterating over the channel, with `for` in a greenlet or `async for` in a coroutine, gets items
+    until it's closed.
+
+    ```py
+    channel = asyncio_gevent.Channel(maxsize=100)
+
+
+    def produce():
+        for row in read_rows():
+            channel.put(row)
+        channel.close()
+
+
+    async def consume():
+        async for row in channel:
+            await store(row)
+    ```
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        super().__init__()
+        self.maxsize = maxsize
+        self._items: Deque[Any] = collections.deque()
+        self._getters: Deque[Handoff] = collections.deque()
+        self._putters: Deque[Handoff] = collections.deque()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+    def empty(self) -> bool:
+        return not self._items
+
+    def full(self) -> bool:
+        return self.maxsize is not None and len(self._items) >= self.maxsize
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def close(self):
+        """
+        Close the channel and wake up all waiting greenlets and tasks with `ChannelClosed`.
+
+        The items in the channel can still be got.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for waiters in (self._getters, self._putters):
+            while waiters:
+                handoff = self._next_waiter(waiters)
+                if handoff is not None:
+                    self._resolve(handoff, None, ChannelClosed())
+        self._wake_loop()
+
+    # Greenlets
+
+    def put(self, item: Any, block: bool = True, timeout: Optional[float] = None):
+        """
+        Put `item` into the channel, blocking the current greenlet while the channel is full.
+
+        Raises `queue.Full` if the channel is still full after `timeout` seconds, or right away with `block=False`.
+        """
+        if self._put_nowait(item):
+            self._wake_loop()
+            return
+        if not block:
+            raise queue.Full
+        self._wait(Handoff(item, Waiter()), self._putters, timeout, queue.Full)
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """
+        Remove and return the next item, blocking the current greenlet while the channel is empty.
+
+        Raises `queue.Empty` if the channel is still empty after `timeout` seconds, or right away with `block=False`.
+        """
+        if self._items:
+            item = self._get_nowait()
+            self._wake_loop()
+            return item
+        if self._closed:
+            raise ChannelClosed()
+        if not block:
+            raise queue.Empty
+        handoff = Handoff(None, Waiter())
+        self._wait(handoff, self._getters, timeout, queue.Empty)
+        return handoff.item
+
+    def put_many(self, items: Iterable[Any], timeout: Optional[float] = None):
+        """
+        Put all of `items` into the channel in order, blocking the current greenlet whenever the channel is full.
+
+        Raises `queue.Full` if the items haven't all been put after `timeout` seconds. The items before the one that
+        didn't fit are in the channel then.
+        """
+        with gevent.Timeout(timeout, queue.Full):
+            for item in items:
+                if not self._put_nowait(item):
+                    self._wake_loop()
+                    self._wait(Handoff(item, Waiter()), self._putters, None, queue.Full)
+        self._wake_loop()
+
+    def get_many(self, max_items: Optional[int] = None, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Remove and return up to `max_items` items, or all of them, blocking the current greenlet only while the channel
+        is empty.
+
+        Raises `queue.Empty` if the channel is still empty after `timeout` seconds.
+        """
+        _check_max_items(max_items)
+        items = [] if self._items else [self.get(True, timeout)]
+        self._take(items, max_items)
+        self._wake_loop()
+        return items
+
+    def __iter__(self):
+        while True:
+            try:
+                yield self.get()
+            except ChannelClosed:
+                return
+
+    # Coroutines
+
+    async def aput(self, item: Any):
+        """
+        Put `item` into the channel, waiting while the channel is full.
+        """
+        if not self._put_nowait(item):
+            await self._await(Handoff(item, future=asyncio.get_running_loop().create_future()), self._putters)
+        self._loop_to_wake = None
+
+    async def aget(self) -> Any:
+        """
+        Remove and return the next item, waiting while the channel is empty.
+        """
+        if self._items:
+            item = self._get_nowait()
+            self._loop_to_wake = None
+            return item
+        if self._closed:
+            raise ChannelClosed()
+        handoff = Handoff(None, future=asyncio.get_running_loop().create_future())
+        await self._await(handoff, self._getters)
+        return handoff.item
+
+    async def aput_many(self, items: Iterable[Any]):
+        """
+        Put all of `items` into the channel in order, waiting whenever the channel is full.
+        """
+        for item in items:
+            if not self._put_nowait(item):
+                await self._await(Handoff(item, future=asyncio.get_running_loop().create_future()), self._putters)
+        self._loop_to_wake = None
+
+    async def aget_many(self, max_items: Optional[int] = None) -> List[Any]:
+        """
+        Remove and return up to `max_items` items, or all of them, waiting only while the channel is empty.
+        """
+        _check_max_items(max_items)
+        items = [] if self._items else [await self.aget()]
+        self._take(items, max_items)
+        self._loop_to_wake = None
+        return items
+
+    async def __aiter__(self):
+        while True:
+            try:
+                item = await self.aget()
+            except ChannelClosed:
+                return
+            yield item
+
+    # Internals
+
+    def _put_nowait(self, item: Any) -> bool:
+        if self._closed:
+            raise ChannelClosed()
+        # Getters only wait while the channel is empty
+        getter = self._next_waiter(self._getters)
+        if getter is not None:
+            self._resolve(getter, item)
+            return True
+        if self.maxsize is None or len(self._items) < self.maxsize:
+            self._items.append(item)
+            return True
+        return False
+
+    def _get_nowait(self) -> Any:
+        item = self._items.popleft()
+        # Putters only wait while the channel is full, so a slot became free
+        putter = self._next_waiter(self._putters)
+        if putter is not None:
+            self._items.append(putter.item)
+            self._resolve(putter, None)
+        return item
+
+    def _take(self, items: List[Any], max_items: Optional[int]):
+        while self._items and (max_items is None or len(items) < max_items):
+            items.append(self._get_nowait())
+
+    def _withdraw(self, handoff: Handoff, waiters: Deque[Handoff]):
+        if not handoff.done:
+            super()._withdraw(handoff, waiters)
+        elif handoff.error is None and waiters is self._getters:
+            # The item has been handed over already, so it goes back to the
+            # front of the channel. The item of a putter has already been put.
+            getter = self._next_waiter(self._getters)
+            if getter is not None:
+                self._resolve(getter, handoff.item)
+            else:
+                self._items.appendleft(handoff.item)
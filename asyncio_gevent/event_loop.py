@@ -1,9 +1,13 @@
 import asyncio
 
+import gevent
+import gevent.monkey
 import gevent.selectors
 
 __all__ = ["EventLoop"]
 
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+
 
 class EventLoop(asyncio.SelectorEventLoop):
     """
@@ -13,7 +17,43 @@ class EventLoop(asyncio.SelectorEventLoop):
 
     def __init__(self, selector=None):
         super().__init__(selector or gevent.selectors.DefaultSelector())
+        self._greenlet = None
+        self._native_thread_id = None
 
     def run_forever(self):
-        greenlet = gevent.spawn(super(EventLoop, self).run_forever)
-        greenlet.join()
+        self._native_thread_id = _get_ident()
+        self._greenlet = gevent.spawn(super(EventLoop, self).run_forever)
+        try:
+            self._greenlet.join()
+        finally:
+            self._greenlet = None
+            self._native_thread_id = None
+
+    def call_soon_from_greenlet(self, callback, *args, context=None):
+        """
+        Like `call_soon`, but safe to call from any greenlet (including the hub
+        and greenlet link callbacks).
+
+        If the loop is running in the current OS thread, the callback is
+        scheduled directly and the loop greenlet is woken through the gevent
+        selector without writing to the self-pipe. Otherwise, this falls back
+        to `call_soon_threadsafe`.
+        """
+        if self._native_thread_id != _get_ident():
+            return self.call_soon_threadsafe(callback, *args, context=context)
+
+        handle = self.call_soon(callback, *args, context=context)
+
+        if gevent.getcurrent() is not self._greenlet:
+            self._wakeup()
+
+        return handle
+
+    def _wakeup(self):
+        # `GeventSelector.select` blocks on a gevent event, so setting it is
+        # enough to wake the loop greenlet. Other selectors need the self-pipe.
+        ready = getattr(self._selector, "_ready", None)
+        if ready is not None:
+            ready.set()
+        else:
+            self._write_to_self()
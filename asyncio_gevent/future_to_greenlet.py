@@ -1,101 +1,115 @@
 import asyncio
-from typing import Callable
+import inspect
 from typing import Optional
 from typing import Coroutine
+from typing import Tuple
 from typing import Union
 
 import gevent.event
 
+from ._loop_helpers import loop_in_other_thread
+from ._loop_helpers import wait_from_greenlet
+from ._loop_helpers import wait_from_thread
+from .background_loop import BackgroundLoop
+from .background_loop import _get_background_loop_of_any_thread
+from .background_loop import get_background_loop
+from .instrumentation import _Crossing
+from .instrumentation import _observers
+
 __all__ = ["future_to_greenlet"]
 
 
-def future_to_greenlet(
-    future: Union[asyncio.Future, Coroutine],
-    loop: Optional[asyncio.AbstractEventLoop] = None,
-    autostart_future: bool = True,
-    autocancel_future: bool = True,
-    autokill_greenlet: bool = True,
-) -> gevent.Greenlet:
+class _FutureBridge:
     """
-    Wrap a future (or coroutine object) in a greenlet.
+    The state of one `future_to_greenlet` crossing.
 
-    The greenlet returned by this function will not start automatically, so you
-    need to call `Greenlet.start()` manually.
+    Its bound `run` method is the greenlet's function and it is raw-linked to the greenlet itself, so that the link runs
+    in the hub instead of a greenlet of its own. A crossing doesn't create any closures or a kwargs dict.
+    """
 
-    If `future` is a coroutine object, it will be scheduled as a task on the
-    `loop` when the greenlet starts. If no `loop` argument has been passed, the
-    running event loop will be used. If there is no running event loop, a new
-    event loop will be started using the current event loop policy.
+    __slots__ = ("future_or_coro", "loop", "autostart_future", "autocancel_future", "autokill_greenlet", "crossing")
 
-    If the future is not already scheduled, then it won't be scheduled for
-    execution until the greenlet starts running. To prevent the future from
-    being scheduled automatically, you can pass `autostart_future=False` as an
-    argument to `future_to_greenlet`.
+    def __init__(self, future_or_coro, loop, autostart_future, autocancel_future, autokill_greenlet, crossing):
+        self.future_or_coro = future_or_coro
+        self.loop = loop
+        self.autostart_future = autostart_future
+        self.autocancel_future = autocancel_future
+        self.autokill_greenlet = autokill_greenlet
+        self.crossing = crossing
 
-    If the greenlet gets killed, the by default the future gets cancelled. To
-    prevent this from happening and having the future return the
-    `GreenletExit` object instead, you can pass `autocancel_future=False` as an
-    argument to `future_to_greenlet`.
+    def __call__(self, greenlet: gevent.Greenlet):
+        # Runs in the hub when the greenlet is dead
+        if self.crossing is not None:
+            self.crossing.finish_greenlet(greenlet)
 
-    If the future gets cancelled, the greenlet gets killed and will return a
-    `GreenletExit`. This default behaviour can be circumvented by passing
-    `autokill_greenlet=False` and the greenlet will raise the `CancelledError`
-    instead.
-    """
+        if not self.autocancel_future:
+            return
 
-    def on_cancelled():
-        if autokill_greenlet:
-            greenlet.kill()
-        else:
-            raise
-
-    greenlet = gevent.Greenlet(
-        run=_run,
-        future_or_coro=future,
-        loop=loop,
-        autostart_future=autostart_future,
-        on_cancelled=on_cancelled,
-    )
-
-    def cb(gt):
-        if isinstance(gt.value, gevent.GreenletExit):
+        if greenlet.successful() and isinstance(greenlet.value, gevent.GreenletExit):
+            future = self.future_or_coro
             if asyncio.iscoroutine(future):
-                future.close()
+                # Once the coroutine has been started, it's owned by a task
+                # that has already been cancelled
+                if inspect.getcoroutinestate(future) == inspect.CORO_CREATED:
+                    future.close()
             elif asyncio.isfuture(future):
                 future.cancel()
 
-    if autocancel_future:
-        greenlet.link_value(cb)
+    def run(self):
+        if self.crossing is not None:
+            self.crossing.start()
 
-    return greenlet
+        try:
+            return self._wait().result()
+        except asyncio.CancelledError:
+            if self.crossing is not None:
+                self.crossing.finish("cancelled")
+            if self.autokill_greenlet:
+                # Like being killed, the greenlet returns the `GreenletExit`
+                raise gevent.GreenletExit()
+            raise
 
+    def _resolve_loop(self) -> Tuple[Optional[asyncio.AbstractEventLoop], Optional[BackgroundLoop]]:
+        active_loop = self.loop
 
-def _run(
-    future_or_coro: Union[asyncio.Future, Coroutine],
-    loop: Optional[asyncio.AbstractEventLoop],
-    autostart_future: bool,
-    on_cancelled: Callable,
-):
-    active_loop = loop
+        # If not loop argument was specified, try and use the running loop
 
-    # If not loop argument was specified, try and use the running loop
+        if not active_loop:
+            try:
+                active_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
 
-    if not active_loop:
-        try:
-            active_loop = asyncio.get_running_loop()
-        except RuntimeError:
-            pass
+        background_loop = get_background_loop() if not active_loop else None
+
+        if not active_loop and background_loop is None and self.autostart_future:
+            # Rather than creating a new loop, use the background loop of
+            # another thread
+            other_background_loop = _get_background_loop_of_any_thread()
+            if other_background_loop is not None:
+                active_loop = other_background_loop.loop
+
+        return active_loop, background_loop
+
+    def _wait(self) -> asyncio.Future:
+        future_or_coro = self.future_or_coro
+        active_loop, background_loop = self._resolve_loop()
 
-    try:
         future: asyncio.Future
 
-        if not autostart_future:
+        if not self.autostart_future:
             if asyncio.iscoroutine(future_or_coro):
                 future = asyncio.create_task(future_or_coro)
             elif asyncio.isfuture(future_or_coro):
                 future = future_or_coro
             else:
                 raise TypeError("Expected a future or coroutine")
+        elif not active_loop and background_loop is not None:
+            # If there's no running loop and no loop argument was specified,
+            # but the background loop has been started, then run the future
+            # on it and block until it's done
+
+            future = background_loop.run(future_or_coro)
         elif not active_loop:
             # If there's no running loop and no loop argument was specified,
             # then get a loop and run it to completion in a spawned greenlet
@@ -111,17 +125,75 @@ def _run(
             # If there's a running loop already or a loop argument was specified,
             # then schedule the future and block until it's done
 
-            future = asyncio.ensure_future(future_or_coro, loop=active_loop)
+            if loop_in_other_thread(active_loop):
+                future = wait_from_thread(active_loop, future_or_coro)
+            else:
+                future = wait_from_greenlet(active_loop, future_or_coro)
+
+        return future
+
+
+def future_to_greenlet(
+    future: Union[asyncio.Future, Coroutine],
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    autostart_future: bool = True,
+    autocancel_future: bool = True,
+    autokill_greenlet: bool = True,
+) -> gevent.Greenlet:
+    """
+    Wrap a future (or coroutine object) in a greenlet.
+
+    The greenlet returned by this function will not start automatically, so you
+    need to call `Greenlet.start()` manually.
+
+    If `future` is a coroutine object, it will be scheduled as a task on the
+    `loop` when the greenlet starts. If no `loop` argument has been passed, the
+    running event loop will be used. If there is no running event loop, the
+    background loop will be used if it has been started with
+    `start_background_loop`, also if it was started in another thread.
+    Otherwise, a new event loop will be started using the current event loop
+    policy.
+
+    If the loop runs in another OS thread, the future is handed to it through
+    a thread-safe queue that is drained once per wakeup of the loop.
 
-            event = gevent.event.Event()
+    If the future is not already scheduled, then it won't be scheduled for
+    execution until the greenlet starts running. To prevent the future from
+    being scheduled automatically, you can pass `autostart_future=False` as an
+    argument to `future_to_greenlet`.
 
-            def done(_):
-                event.set()
+    If the greenlet gets killed, the by default the future gets cancelled. To
+    prevent this from happening and having the future return the
+    `GreenletExit` object instead, you can pass `autocancel_future=False` as an
+    argument to `future_to_greenlet`.
 
-            future.add_done_callback(done)
+    If the future gets cancelled, the greenlet gets killed and will return a
+    `GreenletExit`. This default behaviour can be circumvented by passing
+    `autokill_greenlet=False` and the greenlet will raise the `CancelledError`
+    instead.
+    """
+    return _future_to_greenlet(
+        future,
+        loop,
+        autostart_future,
+        autocancel_future,
+        autokill_greenlet,
+        _Crossing("future_to_greenlet") if _observers else None,
+    )
+
+
+def _future_to_greenlet(
+    future: Union[asyncio.Future, Coroutine],
+    loop: Optional[asyncio.AbstractEventLoop],
+    autostart_future: bool,
+    autocancel_future: bool,
+    autokill_greenlet: bool,
+    crossing: Optional[_Crossing],
+) -> gevent.Greenlet:
+    bridge = _FutureBridge(future, loop, autostart_future, autocancel_future, autokill_greenlet, crossing)
+    greenlet = gevent.Greenlet(bridge.run)
 
-            event.wait()
+    if autocancel_future or crossing is not None:
+        greenlet.rawlink(bridge)
 
-        return future.result()
-    except asyncio.CancelledError:
-        on_cancelled()
+    return greenlet
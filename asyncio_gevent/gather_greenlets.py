@@ -0,0 +1,161 @@
+import asyncio
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Optional
+from typing import Set
+
+import gevent
+
+from ._loop_helpers import call_soon_from_greenlet
+
+__all__ = ["gather_greenlets"]
+
+
+class _GreenletGatherer:
+    """
+    The shared completion dispatcher of one `gather_greenlets` call.
+
+    It is linked to every greenlet of the batch and collects their results in
+    the hub. The asyncio loop is only called into once, when the batch is done.
+    """
+
+    def __init__(
+        self,
+        greenlets: List[gevent.Greenlet],
+        future: asyncio.Future,
+        loop: asyncio.AbstractEventLoop,
+        return_exceptions: bool,
+        limit: Optional[int],
+    ):
+        self.greenlets = greenlets
+        self.future = future
+        self.loop = loop
+        self.return_exceptions = return_exceptions
+        self.limit = limit
+        self.results: list = [None] * len(greenlets)
+        self.indices: Dict[gevent.Greenlet, List[int]] = {}
+        self.remaining = 0
+        self.exception: Optional[BaseException] = None
+        self.settled = False
+        self.unstarted: List[gevent.Greenlet] = []
+        self.running: Set[gevent.Greenlet] = set()
+
+    def start(self):
+        for index, greenlet in enumerate(self.greenlets):
+            self.indices.setdefault(greenlet, []).append(index)
+
+        self.remaining = len(self.indices)
+
+        for greenlet in self.indices:
+            if greenlet.dead:
+                self._record(greenlet)
+                continue
+
+            if greenlet:
+                self.running.add(greenlet)
+            else:
+                self.unstarted.append(greenlet)
+
+            greenlet.rawlink(self)
+
+        # Start greenlets in order, but with at most `limit` of them running
+        self.unstarted.reverse()
+        self._start_next()
+
+        if self.remaining == 0:
+            self._settle()
+
+    def _start_next(self):
+        while self.unstarted and (self.limit is None or len(self.running) < self.limit):
+            greenlet = self.unstarted.pop()
+            # It may have been killed before it got its turn
+            if not greenlet.dead:
+                greenlet.start()
+                self.running.add(greenlet)
+
+    def __call__(self, greenlet: gevent.Greenlet):
+        # Runs in the hub, once for every greenlet that was alive when the
+        # batch started
+        self.running.discard(greenlet)
+        self._record(greenlet)
+        self._start_next()
+
+    def _record(self, greenlet: gevent.Greenlet):
+        if greenlet.successful():
+            result = greenlet.value
+            if isinstance(result, gevent.GreenletExit):
+                result = asyncio.CancelledError()
+        else:
+            result = greenlet.exception
+
+        for index in self.indices[greenlet]:
+            self.results[index] = result
+
+        if isinstance(result, BaseException) and not self.return_exceptions and self.exception is None:
+            self.exception = result
+            self._settle()
+
+        self.remaining -= 1
+        if self.remaining == 0:
+            self._settle()
+
+    def _settle(self):
+        if self.settled:
+            return
+        self.settled = True
+        call_soon_from_greenlet(self.loop, self._set_future)
+
+    def _set_future(self):
+        future = self.future
+        if future.done():
+            return
+        if self.exception is not None:
+            future.set_exception(self.exception)
+        else:
+            future.set_result(self.results)
+
+    def on_future_done(self, future: asyncio.Future):
+        if future.cancelled():
+            self.unstarted.clear()
+            gevent.killall([greenlet for greenlet in self.indices if not greenlet.dead], block=False)
+
+
+def gather_greenlets(
+    greenlets: Iterable[gevent.Greenlet],
+    return_exceptions: bool = False,
+    limit: Optional[int] = None,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+) -> asyncio.Future:
+    """
+    Wrap a batch of greenlets in a single future that resolves with the list
+    of their results, in the order of `greenlets`.
+
+    This behaves like `asyncio.gather(*map(greenlet_to_future, greenlets))`,
+    but all greenlets share one completion dispatcher, so the asyncio loop is
+    only woken up once for the whole batch instead of once per greenlet.
+
+    Greenlets that haven't been started yet are started in order. If `limit`
+    is given, at most `limit` of the greenlets run at the same time and the
+    next one is only started once a running one has finished.
+
+    If `return_exceptions` is `False`, the first exception raised by a
+    greenlet is propagated to the future. Otherwise, exceptions are returned
+    in the list of results. Killed greenlets are treated as if they raised
+    `asyncio.CancelledError`.
+
+    If the future gets cancelled, all greenlets that are still alive are
+    killed and the remaining ones aren't started.
+    """
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    future = loop.create_future()
+    gatherer = _GreenletGatherer(list(greenlets), future, loop, return_exceptions, limit)
+    future.add_done_callback(gatherer.on_future_done)
+    gatherer.start()
+
+    return future
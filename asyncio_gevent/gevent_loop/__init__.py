@@ -2,26 +2,38 @@
 # currently _not_ working yet
 from .async_watcher import AsyncWatcher
 from .callback import Callback
+from .check_watcher import CheckWatcher
 from .child_watcher import ChildWatcher
 from .fork_watcher import ForkWatcher
 from .gevent_loop import GeventLoop
+from .idle_watcher import IdleWatcher
 from .io_watcher import IoWatcher
+from .iteration_selector import IterationSelector
 from .monkey_jail import MonkeyJail
+from .prepare_watcher import PrepareWatcher
 from .ref_mixin import RefMixin
 from .signal_watcher import SignalWatcher
+from .stat_watcher import StatWatcher
 from .timer_watcher import TimerWatcher
+from .timer_wheel import TimerWheel
 from .watcher import Watcher
 
 __all__ = [
     "AsyncWatcher",
     "Callback",
+    "CheckWatcher",
     "ChildWatcher",
     "ForkWatcher",
     "GeventLoop",
+    "IdleWatcher",
     "IoWatcher",
+    "IterationSelector",
     "MonkeyJail",
+    "PrepareWatcher",
     "RefMixin",
     "SignalWatcher",
+    "StatWatcher",
     "TimerWatcher",
+    "TimerWheel",
     "Watcher",
 ]
@@ -4,18 +4,30 @@ __all__ = ["AsyncWatcher"]
 
 
 class AsyncWatcher(Watcher):
-    def __init__(self, loop, ref=True):
-        super().__init__(loop, ref=ref)
-        self._handle = None
+    """
+    A watcher that can be sent from any thread, with the semantics of libev's
+    `ev_async`.
+
+    Sends collapse until the callback runs: a watcher that is already
+    pending isn't queued again. All watchers sent between two iterations of
+    the loop share one wakeup of the asyncio loop, so a burst of sends costs
+    one write to its self-pipe.
+    """
+
+    __slots__ = ()
 
     def _start(self, **kwargs):
-        # return True
-        return None
+        # Like libev, sends from before the start are forgotten
+        self.pending = False
+        # Nothing else refers to a started watcher until it is sent
+        self.loop.async_watchers.add(self)
+        return True
 
     def _stop(self):
-        if self._handle is not None:
-            self._handle.cancel()
+        self.loop.async_watchers.discard(self)
 
     def send(self):
+        if self.pending:
+            return
         self.pending = True
-        self._handle = self.loop.aio.call_soon_threadsafe(self._invoke)
+        self.loop._send_async(self)
@@ -3,42 +3,40 @@ import sys
 from gevent._interfaces import ICallback
 from zope.interface import implementer
 
-from .ref_mixin import RefMixin
-
 __all__ = ["Callback"]
 
 
 @implementer(ICallback)
-class Callback(RefMixin):
-    def __init__(self, loop, callback, args, thread_safe=False):
-        super().__init__(loop)
+class Callback:
+    """
+    A callback scheduled with `GeventLoop.run_callback`.
+
+    Callbacks don't have an asyncio handle of their own. The loop queues them
+    and runs all queued callbacks from a single asyncio handle.
+    """
+
+    __slots__ = ("loop", "callback", "args")
+
+    def __init__(self, loop, callback, args):
+        self.loop = loop
         self.callback = callback
         self.args = args
-        self._handle = (
-            self.loop.aio.call_soon_threadsafe(self.run) if thread_safe else self.loop.aio.call_soon(self.run)
-        )
-        self._increase_ref()
 
     def stop(self):
         self.callback = None
         self.args = None
-        self._handle.cancel()
-        self._decrease_ref()
 
     def run(self):
+        callback, args = self.callback, self.args
+        self.callback = None
+        self.args = None
+        if callback is None or args is None:
+            # It has been stopped
+            return
         try:
-            callback, args = self.callback, self.args
-            self.callback = None
-            self.args = None
-            if callback is None or args is None:
-                raise RuntimeError("Callback is already stopped")
             callback(*args)
-        except Exception:
-            raise
         except:  # noqa: E722
             self.loop.handle_error(self, *sys.exc_info())
-        finally:
-            self._decrease_ref()
 
     def __bool__(self):
         return self.args is not None
@@ -0,0 +1,19 @@
+from .watcher import Watcher
+
+__all__ = ["CheckWatcher"]
+
+
+class CheckWatcher(Watcher):
+    """
+    Fires in every iteration of the loop, after it polled for IO
+    """
+
+    __slots__ = ()
+
+    def _start(self, **kwargs):
+        self.loop._install_iteration_selector()
+        self.loop.check_watchers[self] = None
+        return True
+
+    def _stop(self):
+        self.loop.check_watchers.pop(self, None)
@@ -4,6 +4,8 @@ __all__ = ["ChildWatcher"]
 
 
 class ChildWatcher(Watcher):
+    __slots__ = ("pid", "watcher", "rcode", "rpid")
+
     def __init__(self, loop, pid, ref=True):
         super().__init__(loop, ref=ref)
         self.pid = pid
@@ -13,8 +15,7 @@ class ChildWatcher(Watcher):
 
     def _start(self, **kwargs):
         self.watcher.add_child_handler(self.pid, self._invoke_wrapper)
-        # return True
-        return None
+        return True
 
     def _stop(self):
         self.watcher.remove_child_handler(self.pid)
@@ -4,10 +4,11 @@ __all__ = ["ForkWatcher"]
 
 
 class ForkWatcher(Watcher):
+    __slots__ = ()
+
     def _start(self, **kwargs):
         self.loop.fork_watchers.add(self)
-        return None
-        # return True
+        return True
 
     def _stop(self):
         self.loop.fork_watchers.discard(self)
@@ -1,22 +1,39 @@
+import os
 import sys
-import time
 from asyncio import AbstractEventLoop
+from asyncio import Handle
+from asyncio.selector_events import BaseSelectorEventLoop
+from collections import deque
+from typing import Deque
 from typing import Optional
 
+import gevent.monkey
 from gevent._interfaces import ILoop
 from zope.interface import implementer
 
 from .async_watcher import AsyncWatcher
 from .callback import Callback
+from .check_watcher import CheckWatcher
 from .child_watcher import ChildWatcher
 from .fork_watcher import ForkWatcher
+from .idle_watcher import IdleWatcher
+from .io_watcher import READ
+from .io_watcher import WRITE
 from .io_watcher import IoWatcher
+from .iteration_selector import IterationSelector
 from .monkey_jail import MonkeyJail
+from .prepare_watcher import PrepareWatcher
 from .signal_watcher import SignalWatcher
+from .stat_watcher import Inotify
+from .stat_watcher import StatPoller
+from .stat_watcher import StatWatcher
 from .timer_watcher import TimerWatcher
+from .timer_wheel import TimerWheel
 
 __all__ = ["GeventLoop"]
 
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+
 
 @implementer(ILoop)
 class GeventLoop:
@@ -29,17 +46,58 @@ class GeventLoop:
     All of those methods have one or two common arguments. *ref* is a
     boolean saying whether the event loop is allowed to exit even if
     this watcher is still started. *priority* is event loop specific.
+
+    Timers are exact by default. With a positive `timer_slack` (which
+    defaults to the `ASYNCIO_GEVENT_TIMER_SLACK` environment variable),
+    their deadlines are rounded up to multiples of `timer_slack` seconds and
+    they are kept in a `TimerWheel` instead.
     """
 
     MAXPRI = 0
 
-    def __init__(self, flags=None, default=None):
+    # The same guess as gevent's libev loop. asyncio's timers are only as
+    # fine as the monotonic clock.
+    approx_timer_resolution = 0.00001
+
+    # Like in gevent's own loops, how many callbacks to run between checks of
+    # the switch interval
+    CALLBACK_CHECK_COUNT = 50
+
+    def __init__(self, flags=None, default=None, timer_slack=None):
         self._aio: Optional[AbstractEventLoop] = None
+        self._now = 0.0
+        self._clock_per_iteration = False
+        self._timer_slack = 0.0
+        self.timer_wheel: Optional[TimerWheel] = None
         self.error_handler = None
         self.fork_watchers = set()
+        self.async_watchers = set()
+        # Ordered sets of the started watchers
+        self.prepare_watchers = {}
+        self.check_watchers = {}
+        self.idle_watchers = {}
         self._ref_count = 0
         self._stop_handle = None
+        self._thread_id = _get_ident()
+        self._callbacks: Deque[Callback] = deque()
+        self._callbacks_handle: Optional[Handle] = None
+        self._io_registrations = {}
+        # Async watchers that were sent, possibly from other threads, and one
+        # wakeup of the asyncio loop for all of them, like libev's async pipe
+        self._asyncs_pending: Deque[AsyncWatcher] = deque()
+        self._asyncs_wakeup = False
+        # Set to False to poll stat watchers even where inotify is available
+        self.use_inotify = True
+        self._inotify = None
+        self._stat_pollers = {}
         self.aio.set_exception_handler(self._handle_aio_error)
+        # All asyncio loops use the monotonic clock, so this stays valid even
+        # if `aio` gets replaced by a new loop
+        self._clock = self.aio.time
+        self.update_now()
+        if timer_slack is None:
+            timer_slack = float(os.environ.get("ASYNCIO_GEVENT_TIMER_SLACK", 0.0))
+        self.timer_slack = timer_slack
 
     def run(self, nowait=False, once=False):
         """
@@ -50,7 +108,7 @@ class GeventLoop:
         this to control how the event loop runs (for example, to integrate
         it with another event loop).
         """
-        if self.aio.is_running:
+        if self.aio.is_running():
             return
         self.aio.run_forever()
 
@@ -63,8 +121,11 @@ class GeventLoop:
         This may not necessarily be related to :func:`time.time` (it
         may have a different starting point), but it must be expressed
         in fractional seconds (the same *units* used by :func:`time.time`).
+
+        Like libev, this is the time of the asyncio loop's monotonic clock,
+        cached once per iteration of the loop, right after it polled for IO.
         """
-        return time.time()
+        return self._now
 
     def update_now(self):
         """
@@ -74,7 +135,18 @@ class GeventLoop:
            In the past, this available as ``update``. This is still available as
            an alias but will be removed in the future.
         """
-        pass
+        self._now = self._clock()
+
+    @property
+    def timer_slack(self) -> float:
+        return self._timer_slack
+
+    @timer_slack.setter
+    def timer_slack(self, timer_slack: float):
+        # Timers that are already scheduled keep their wheel or handle until
+        # they are started again
+        self._timer_slack = timer_slack
+        self.timer_wheel = TimerWheel(self, timer_slack) if timer_slack > 0.0 else None
 
     def destroy(self):
         """
@@ -91,7 +163,9 @@ class GeventLoop:
             and libev CFFI implementations do not. The C implementation may change.
 
         """
-        pass
+        if self._inotify:
+            self._inotify.close()
+            self._inotify = None
 
     def io(self, fd, events, ref=True, priority=None):
         """
@@ -114,7 +188,22 @@ class GeventLoop:
            queued to run. Closing the FD should be deferred until the next
            run of the eventloop with a callback.
         """
-        pass
+        registration = self._io_registrations.get(fd)
+        if registration is None:
+            return False
+
+        if registration.watchers:
+            # Like libev, wake up the watchers with all of their events, so
+            # that they notice that the fd is being closed. gevent then closes
+            # it in a check watcher, which runs after them.
+            self.aio.call_soon(registration.feed, READ | WRITE)
+            return True
+
+        # Unregister the events that are only kept registered until the next
+        # iteration, so that a new file descriptor with the same number
+        # doesn't inherit the registration
+        registration.sync()
+        return False
 
     def timer(self, after, repeat=0.0, ref=True, priority=None):
         """
@@ -122,7 +211,7 @@ class GeventLoop:
 
         If *repeat* is given, the timer will continue to fire every *repeat* seconds.
         """
-        return TimerWatcher(self, after, ref)
+        return TimerWatcher(self, after, repeat, ref)
 
     def signal(self, signum, ref=True, priority=None):
         """
@@ -137,7 +226,7 @@ class GeventLoop:
         """
         Create and return a watcher that fires when the event loop is idle.
         """
-        pass
+        return IdleWatcher(self, ref=ref)
 
     def prepare(self, ref=True, priority=None):
         """
@@ -146,14 +235,14 @@ class GeventLoop:
 
         .. caution:: This method is not supported by libuv.
         """
-        pass
+        return PrepareWatcher(self, ref=ref)
 
     def check(self, ref=True, priority=None):
         """
         Create and return a watcher that fires after the event loop
         polls for IO.
         """
-        pass
+        return CheckWatcher(self, ref=ref)
 
     def fork(self, ref=True, priority=None):
         """
@@ -195,6 +284,19 @@ class GeventLoop:
         If the operating system doesn't support event notifications
         from the filesystem, poll for changes every *interval* seconds.
         """
+        return StatWatcher(self, path, interval, ref)
+
+    def _get_inotify(self) -> Optional[Inotify]:
+        if self._inotify is None:
+            # False if inotify isn't available
+            self._inotify = self.use_inotify and Inotify.create(self) or False
+        return self._inotify or None
+
+    def _get_stat_poller(self, interval: float) -> StatPoller:
+        poller = self._stat_pollers.get(interval)
+        if poller is None:
+            poller = self._stat_pollers[interval] = StatPoller(self, interval)
+        return poller
 
     def run_callback(self, func, *args):
         """
@@ -209,7 +311,11 @@ class GeventLoop:
         .. seealso:: :meth:`asyncio.loop.call_soon`
            The :mod:`asyncio` equivalent.
         """
-        return Callback(self, func, args)
+        callback = Callback(self, func, args)
+        self._callbacks.append(callback)
+        if self._callbacks_handle is None:
+            self._schedule_callbacks()
+        return callback
 
     def run_callback_threadsafe(self, func, *args):
         """
@@ -225,7 +331,60 @@ class GeventLoop:
         .. seealso:: :meth:`asyncio.loop.call_soon_threadsafe`
            The :mod:`asyncio` equivalent.
         """
-        return Callback(self, func, args, thread_safe=True)
+        callback = Callback(self, func, args)
+        self._callbacks.append(callback)
+        self.aio.call_soon_threadsafe(self._schedule_callbacks)
+        return callback
+
+    def _schedule_callbacks(self):
+        # A single asyncio handle runs all queued callbacks, and the loop is
+        # referenced once while there are any, instead of once per callback
+        if self._callbacks_handle is None and self._callbacks:
+            self.increase_ref()
+            self._callbacks_handle = self.aio.call_soon(self._run_callbacks)
+
+    def _run_callbacks(self):
+        callbacks = self._callbacks
+        count = self.CALLBACK_CHECK_COUNT
+        if not self._clock_per_iteration:
+            self.update_now()
+        expiration = self._clock() + sys.getswitchinterval()
+        try:
+            # Callbacks scheduled by the callbacks that run here are run in the
+            # same batch, until the switch interval is used up. Then the rest
+            # is left for the next iteration, so that IO and timers get a turn.
+            while callbacks:
+                callbacks.popleft().run()
+                count -= 1
+                if count == 0:
+                    count = self.CALLBACK_CHECK_COUNT
+                    if self.aio.time() >= expiration:
+                        break
+        finally:
+            if callbacks:
+                self._callbacks_handle = self.aio.call_soon(self._run_callbacks)
+            else:
+                self._callbacks_handle = None
+                self.decrease_ref()
+
+    def _send_async(self, watcher: AsyncWatcher):
+        # May be called from any thread. The flag is cleared before the queue
+        # is drained, so a watcher appended while it is set is always run.
+        self._asyncs_pending.append(watcher)
+        if not self._asyncs_wakeup:
+            self._asyncs_wakeup = True
+            self.aio.call_soon_threadsafe(self._run_asyncs)
+
+    def _run_asyncs(self):
+        self._asyncs_wakeup = False
+        pending = self._asyncs_pending
+        while pending:
+            watcher = pending.popleft()
+            if watcher.pending and watcher.active:
+                try:
+                    watcher._invoke()
+                except:  # noqa: E722
+                    self.handle_error(watcher, *sys.exc_info())
 
     def handle_error(self, context, _type, value, tb):
         error_handler = self.error_handler
@@ -246,6 +405,26 @@ class GeventLoop:
             # stop the main loop unexpectedly
             pass
 
+    def _install_iteration_selector(self):
+        if not self._install_iteration_selector_on(self.aio):
+            raise RuntimeError("Prepare, check and idle watchers need an asyncio event loop with a selector")
+
+    def _install_iteration_selector_on(self, aio: AbstractEventLoop) -> bool:
+        if not isinstance(aio, BaseSelectorEventLoop):
+            return False
+        if not isinstance(aio._selector, IterationSelector):
+            aio._selector = IterationSelector(self, aio, aio._selector)
+        return True
+
+    def _run_watchers(self, watchers: dict):
+        # Watchers may be stopped or started by the callbacks of the others
+        for watcher in list(watchers):
+            if watcher in watchers:
+                try:
+                    watcher._invoke()
+                except:  # noqa: E722
+                    self.handle_error(watcher, *sys.exc_info())
+
     def reinit(self):
         for watcher in self.fork_watchers:
             self.run_callback(watcher.callback, *watcher.args)
@@ -255,14 +434,18 @@ class GeventLoop:
 
     def increase_ref(self):
         self._ref_count += 1
-        if self._stop_handle is not None:
-            self._stop_handle.cancel()
-            self._stop_handle = None
 
     def decrease_ref(self):
         self._ref_count -= 1
         if self._ref_count <= 0 and self._stop_handle is None:
-            self._stop_handle = self.aio.call_soon_threadsafe(self._stop)
+            # The count is checked again in the next iteration of the loop
+            # and it usually went up again by then, so there is no point in
+            # cancelling the check when it does. Only a call from another
+            # thread needs to wake up the loop, which costs a syscall.
+            if _get_ident() == self._thread_id:
+                self._stop_handle = self.aio.call_soon(self._stop)
+            else:
+                self._stop_handle = self.aio.call_soon_threadsafe(self._stop)
 
     def _stop(self):
         self._stop_handle = None
@@ -290,6 +473,9 @@ class GeventLoop:
                 self._aio = asyncio.new_event_loop()
                 asyncio.set_event_loop(self._aio)
 
+        # The cached clock is refreshed by the selector once per iteration.
+        # Without one, it is refreshed once per batch of callbacks instead.
+        self._clock_per_iteration = self._install_iteration_selector_on(self._aio)
         return self._aio
 
     def _format(self):
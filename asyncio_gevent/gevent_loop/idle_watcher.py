@@ -0,0 +1,21 @@
+from .watcher import Watcher
+
+__all__ = ["IdleWatcher"]
+
+
+class IdleWatcher(Watcher):
+    """
+    Fires in the iterations of the loop in which there is nothing else to do.
+
+    While an idle watcher is active, the loop polls for IO without blocking.
+    """
+
+    __slots__ = ()
+
+    def _start(self, **kwargs):
+        self.loop._install_iteration_selector()
+        self.loop.idle_watchers[self] = None
+        return True
+
+    def _stop(self):
+        self.loop.idle_watchers.pop(self, None)
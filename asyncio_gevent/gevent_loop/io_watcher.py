@@ -1,3 +1,5 @@
+import sys
+
 from .watcher import Watcher
 
 __all__ = ["IoWatcher"]
@@ -7,23 +9,138 @@ WRITE = 2
 
 
 class IoWatcher(Watcher):
+    __slots__ = ("fd", "events", "_pass_events")
+
     def __init__(self, loop, fd, events, ref=True, priority=None):
         super().__init__(loop, ref=ref)
         self.fd = fd
         self.events = events
-        self._reader = events & READ
-        self._writer = events & WRITE
+        self._pass_events = False
 
     def _start(self, pass_events=False, **kwargs):
-        if self._reader:
-            self.loop.aio.add_reader(self.fd, self._invoke)
-        if self._writer:
-            self.loop.aio.add_writer(self.fd, self._invoke)
-        # return True
-        return None
+        self._pass_events = pass_events
+        registrations = self.loop._io_registrations
+        registration = registrations.get(self.fd)
+        if registration is None:
+            registration = registrations[self.fd] = _FdRegistration(self.loop, self.fd)
+        registration.add(self)
+        return True
 
     def _stop(self):
-        if self._reader:
-            self.loop.aio.remove_reader(self.fd)
-        if self._writer:
-            self.loop.aio.remove_writer(self.fd)
+        registration = self.loop._io_registrations.get(self.fd)
+        if registration is not None:
+            registration.remove(self)
+
+    def _ready(self, events):
+        if self._pass_events:
+            self._invoke(events)
+        else:
+            self._invoke()
+
+
+class _FdRegistration:
+    """
+    All started `IoWatcher`s of one file descriptor of a `GeventLoop`.
+
+    asyncio only allows one reader and one writer callback per file
+    descriptor, so the registration is the reader and writer for all of them
+    and passes readiness on to every watcher that waits for it.
+
+    The file descriptor is registered with the asyncio loop for the combined
+    events of the watchers. New events are registered right away, but events
+    nobody waits for anymore are only unregistered in the next iteration of
+    the loop. gevent stops and starts a socket's watcher around every single
+    read or write, and this way the selector isn't modified for each of
+    them.
+
+    Once all watchers have stopped, the file descriptor may have been closed
+    and its number reused by a new file before the registration is synced. A
+    watcher that wasn't among the stopped ones therefore registers the file
+    descriptor from scratch, since the selector may still hold the closed
+    file under the same number.
+    """
+
+    __slots__ = ("loop", "fd", "watchers", "stopped", "registered", "sync_scheduled")
+
+    def __init__(self, loop, fd: int):
+        self.loop = loop
+        self.fd = fd
+        # Ordered sets of the started watchers and of the watchers that were
+        # stopped since the last sync
+        self.watchers = {}
+        self.stopped = {}
+        self.registered = 0
+        self.sync_scheduled = False
+
+    def add(self, watcher: IoWatcher):
+        if self.sync_scheduled and not self.watchers and watcher not in self.stopped:
+            self._register(0)
+        self.watchers[watcher] = None
+        events = self.registered | watcher.events
+        if events != self.registered:
+            self._register(events)
+
+    def remove(self, watcher: IoWatcher):
+        if self.watchers.pop(watcher, 0) is None:
+            self.stopped[watcher] = None
+        if not self.sync_scheduled:
+            self.sync_scheduled = True
+            self.loop.aio.call_soon(self._scheduled_sync)
+
+    def sync(self):
+        """
+        Register the file descriptor for exactly the events the watchers wait
+        for
+        """
+        self.stopped.clear()
+        events = 0
+        for watcher in self.watchers:
+            events |= watcher.events
+        if events != self.registered:
+            self._register(events)
+        if not events and self.loop._io_registrations.get(self.fd) is self:
+            del self.loop._io_registrations[self.fd]
+
+    def _scheduled_sync(self):
+        self.sync_scheduled = False
+        self.sync()
+
+    def _register(self, events: int):
+        aio = self.loop.aio
+        changed = events ^ self.registered
+        self.registered = events
+        if changed & READ:
+            if events & READ:
+                aio.add_reader(self.fd, self._ready, READ)
+            else:
+                aio.remove_reader(self.fd)
+        if changed & WRITE:
+            if events & WRITE:
+                aio.add_writer(self.fd, self._ready, WRITE)
+            else:
+                aio.remove_writer(self.fd)
+
+    def feed(self, events: int):
+        """
+        Pass `events` on to the watchers that wait for them, as if the file
+        descriptor was ready
+        """
+        self._ready(events)
+
+    def _ready(self, events: int):
+        watchers = self.watchers
+        waiting = False
+        # Watchers may be stopped or started by the callbacks of the others
+        for watcher in list(watchers):
+            if not watcher.events & events or watcher not in watchers:
+                continue
+            waiting = True
+            try:
+                watcher._ready(events & watcher.events)
+            except:  # noqa: E722
+                self.loop.handle_error(watcher, *sys.exc_info())
+
+        if not waiting:
+            # The events are still registered, but nobody waits for them
+            # anymore, so stop polling for them right away
+            self.sync()
@@ -0,0 +1,61 @@
+__all__ = ["IterationSelector"]
+
+
+class IterationSelector:
+    """
+    A wrapper around the selector of an asyncio event loop that runs the
+    prepare, check and idle watchers of a `GeventLoop` and refreshes its
+    cached time in every iteration of the asyncio loop.
+
+    asyncio calls `select` exactly once per iteration, followed by
+    `_process_events`, which queues the callbacks of the IO events. Prepare
+    watchers run right before `select`. Like in libev, check watchers and, if
+    there was nothing to do, idle watchers are queued after the IO events are
+    processed, so that they run in the same iteration, after the callbacks of
+    the IO events and of the timers that are due.
+    """
+
+    def __init__(self, loop, aio, selector):
+        self._loop = loop
+        self._aio = aio
+        self._selector = selector
+        self._idle = False
+        self._process_events = aio._process_events
+        aio._process_events = self.process_events
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+    def select(self, timeout=None):
+        loop = self._loop
+        aio = self._aio
+
+        if loop.prepare_watchers:
+            loop._run_watchers(loop.prepare_watchers)
+            # The timeout was computed before the prepare watchers ran
+            if aio._ready:
+                timeout = 0
+            elif aio._scheduled:
+                delay = max(0, aio._scheduled[0]._when - aio.time())
+                timeout = delay if timeout is None else min(timeout, delay)
+
+        if loop.idle_watchers:
+            timeout = 0
+
+        events = self._selector.select(timeout)
+        # Like libev, the cached time is updated once per iteration, after
+        # polling
+        loop.update_now()
+
+        self._idle = not events and not aio._ready and not (aio._scheduled and aio._scheduled[0]._when <= loop._now)
+        return events
+
+    def process_events(self, event_list):
+        self._process_events(event_list)
+
+        loop = self._loop
+        aio = self._aio
+        if loop.check_watchers:
+            aio.call_soon(loop._run_watchers, loop.check_watchers)
+        if self._idle and loop.idle_watchers:
+            aio.call_soon(loop._run_watchers, loop.idle_watchers)
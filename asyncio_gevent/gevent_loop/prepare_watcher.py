@@ -0,0 +1,19 @@
+from .watcher import Watcher
+
+__all__ = ["PrepareWatcher"]
+
+
+class PrepareWatcher(Watcher):
+    """
+    Fires in every iteration of the loop, before it polls for IO
+    """
+
+    __slots__ = ()
+
+    def _start(self, **kwargs):
+        self.loop._install_iteration_selector()
+        self.loop.prepare_watchers[self] = None
+        return True
+
+    def _stop(self):
+        self.loop.prepare_watchers.pop(self, None)
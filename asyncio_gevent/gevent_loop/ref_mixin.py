@@ -2,6 +2,16 @@ __all__ = ["RefMixin"]
 
 
 class RefMixin:
+    """
+    Keeps the loop running while the object is active, if `ref` is true.
+
+    There is no finalizer: the reference is given back explicitly, when the
+    watcher is stopped. The loop keeps every active watcher reachable, so a
+    watcher can't be garbage collected while it holds a reference.
+    """
+
+    __slots__ = ("loop", "ref", "_ref_increased")
+
     def __init__(self, loop, ref=True):
         self.loop = loop
         self.ref = ref
@@ -16,6 +26,3 @@ class RefMixin:
         if self._ref_increased:
             self._ref_increased = False
             self.loop.decrease_ref()
-
-    def __del__(self):
-        self._decrease_ref()
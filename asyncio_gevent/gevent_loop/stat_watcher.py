@@ -0,0 +1,298 @@
+import ctypes
+import os
+import struct
+import sys
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+
+from .io_watcher import READ
+from .watcher import Watcher
+
+__all__ = ["StatWatcher"]
+
+# The same defaults as libev
+DEF_STAT_INTERVAL = 5.0074891
+MIN_STAT_INTERVAL = 0.1074891
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0)
+
+# Everything that may change the stat of an entry of a watched directory
+_DIRECTORY_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+    | IN_ONLYDIR
+)
+
+_EVENT = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(None, use_errno=True)
+                libc.inotify_init1
+                libc.inotify_add_watch
+                libc.inotify_rm_watch
+            except (OSError, AttributeError):
+                pass
+            else:
+                _libc = libc
+    return _libc or None
+
+
+def _stat(path) -> Optional[os.stat_result]:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def _stat_key(attr: Optional[os.stat_result]):
+    # Like libev, but nanosecond precise and without the access time, which
+    # changes by merely reading the file
+    if attr is None:
+        return None
+    return (
+        attr.st_dev,
+        attr.st_ino,
+        attr.st_mode,
+        attr.st_nlink,
+        attr.st_uid,
+        attr.st_gid,
+        attr.st_size,
+        attr.st_mtime_ns,
+        attr.st_ctime_ns,
+    )
+
+
+def _check_all(loop, watchers):
+    # Callbacks may stop other watchers of the batch
+    for watcher in list(watchers):
+        if watcher.active:
+            try:
+                watcher._check()
+            except:  # noqa: E722
+                loop.handle_error(watcher, *sys.exc_info())
+
+
+class StatWatcher(Watcher):
+    """
+    Fires when the result of `os.stat` for `path` changes, including when the
+    path is created or deleted.
+
+    On Linux, all stat watchers of a loop share one inotify instance, which
+    watches the directories that contain the watched paths, so tens of
+    thousands of files in a handful of directories only need a handful of
+    inotify watches. Where inotify can't be used, e.g. if the directory
+    doesn't exist, the watchers with the same `interval` are polled together
+    by one repeating timer.
+    """
+
+    __slots__ = ("path", "_interval", "attr", "prev", "_backend")
+
+    def __init__(self, loop, path, interval=0.0, ref=True):
+        super().__init__(loop, ref=ref)
+        self.path = path
+        self._interval = interval
+        self.attr: Optional[os.stat_result] = None
+        self.prev: Optional[os.stat_result] = None
+        self._backend = None
+
+    @property
+    def interval(self) -> float:
+        # Like libev, only used for polling
+        if not self._interval:
+            return DEF_STAT_INTERVAL
+        return max(self._interval, MIN_STAT_INTERVAL)
+
+    def _start(self, **kwargs):
+        self.attr = _stat(self.path)
+        self.prev = None
+        self._register()
+        return True
+
+    def _register(self):
+        inotify = self.loop._get_inotify()
+        if inotify is not None and inotify.add(self):
+            self._backend = inotify
+        else:
+            self._backend = self.loop._get_stat_poller(self.interval)
+            self._backend.add(self)
+
+    def _stop(self):
+        if self._backend is not None:
+            self._backend.remove(self)
+            self._backend = None
+
+    def _check(self):
+        attr = _stat(self.path)
+        if _stat_key(attr) != _stat_key(self.attr):
+            self.prev = self.attr
+            self.attr = attr
+            self._invoke()
+
+
+class StatPoller:
+    """
+    Polls all stat watchers of a loop that have the same interval, with one
+    repeating timer
+    """
+
+    def __init__(self, loop, interval: float):
+        self.loop = loop
+        self.interval = interval
+        self.watchers: Dict[StatWatcher, None] = {}
+        self._timer = loop.timer(interval, interval, ref=False)
+
+    def add(self, watcher: StatWatcher):
+        self.watchers[watcher] = None
+        if not self._timer.active:
+            self._timer.start(self._poll)
+
+    def remove(self, watcher: StatWatcher):
+        self.watchers.pop(watcher, None)
+        if not self.watchers:
+            self._timer.stop()
+
+    def _poll(self):
+        _check_all(self.loop, self.watchers)
+
+
+class Inotify:
+    """
+    One inotify instance, shared by all stat watchers of a loop.
+
+    It watches the directories of the watched paths and checks the watchers
+    of the entries it gets events for, once per batch of events.
+    """
+
+    def __init__(self, loop, libc, fd: int):
+        self.loop = loop
+        self._libc = libc
+        self.fd = fd
+        # directory -> watch descriptor
+        self._directories: Dict[str, int] = {}
+        # watch descriptor -> (directory, {name: {watcher: None}})
+        self._watches: Dict[int, Tuple[str, Dict[str, Dict[StatWatcher, None]]]] = {}
+        self._keys: Dict[StatWatcher, Tuple[int, str]] = {}
+        self._io = loop.io(fd, READ, ref=False)
+        self._io.start(self._read)
+
+    @classmethod
+    def create(cls, loop) -> Optional["Inotify"]:
+        libc = _load_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        return cls(loop, libc, fd)
+
+    def add(self, watcher: StatWatcher) -> bool:
+        directory, name = os.path.split(os.path.abspath(os.fsdecode(watcher.path)))
+        wd = self._directories.get(directory)
+        if wd is None:
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _DIRECTORY_MASK)
+            if wd < 0:
+                # The directory doesn't exist, isn't accessible or there are
+                # no inotify watches left
+                return False
+            self._directories[directory] = wd
+            self._watches[wd] = (directory, {})
+        self._watches[wd][1].setdefault(name, {})[watcher] = None
+        self._keys[watcher] = (wd, name)
+        return True
+
+    def remove(self, watcher: StatWatcher):
+        key = self._keys.pop(watcher, None)
+        if key is None:
+            return
+        wd, name = key
+        directory, names = self._watches[wd]
+        watchers = names[name]
+        del watchers[watcher]
+        if not watchers:
+            del names[name]
+        if not names:
+            self._drop(wd)
+
+    def close(self):
+        self._io.stop()
+        os.close(self.fd)
+
+    def _drop(self, wd: int, remove: bool = True):
+        directory, names = self._watches.pop(wd)
+        del self._directories[directory]
+        if remove:
+            # The watch of a moved directory stays in the kernel otherwise
+            self._libc.inotify_rm_watch(self.fd, wd)
+        return names
+
+    def _read(self):
+        try:
+            data = os.read(self.fd, 65536)
+        except BlockingIOError:
+            return
+
+        changed: Dict[StatWatcher, None] = {}
+        orphaned: Dict[StatWatcher, None] = {}
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost, so check everything
+                changed.update(self._keys)
+                continue
+
+            entry = self._watches.get(wd)
+            if entry is None:
+                continue
+
+            if mask & (IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF):
+                # The directory is gone, so its watchers have to start over
+                for watchers in self._drop(wd, not mask & IN_IGNORED).values():
+                    orphaned.update(watchers)
+                continue
+
+            watchers = entry[1].get(name)
+            if watchers:
+                changed.update(watchers)
+
+        for watcher in orphaned:
+            del self._keys[watcher]
+            watcher._backend = None
+            if watcher.active:
+                watcher._register()
+            changed[watcher] = None
+
+        _check_all(self.loop, changed)
@@ -1,30 +1,131 @@
+from asyncio import TimerHandle
+from typing import Optional
+
+from .timer_wheel import TimerWheel
 from .watcher import Watcher
 
 __all__ = ["TimerWatcher"]
 
 
 class TimerWatcher(Watcher):
-    def __init__(self, loop, after, ref=True):
+    """
+    A timer that fires after `after` seconds and then every `repeat` seconds,
+    if `repeat` isn't zero, with the semantics of libev's `ev_timer`.
+
+    Deadlines are based on the loop's cached time, `loop.now()`. If the loop
+    has a `TimerWheel`, the timer is added to it. Otherwise, the watcher
+    keeps a single asyncio `TimerHandle`. Moving the deadline later, with
+    `again` or by repeating, doesn't touch the asyncio loop: the handle fires
+    at its old time and is rescheduled for the new deadline.
+    """
+
+    __slots__ = ("after", "repeat", "_when", "_handle", "_scheduled", "_wheel", "_slot")
+
+    def __init__(self, loop, after=0.0, repeat=0.0, ref=True):
+        if repeat < 0.0:
+            raise ValueError("repeat must be positive or zero: %r" % repeat)
         super().__init__(loop, ref=ref)
         self.after = after
-        self._handle = None
+        self.repeat = repeat
+        self._when = 0.0
+        self._handle: Optional[TimerHandle] = None
+        self._scheduled = False
+        self._wheel: Optional[TimerWheel] = None
+        self._slot = 0
+
+    @property
+    def at(self):
+        """
+        The loop time at which the timer fires next
+        """
+        return self._when
+
+    def _start(self, update=None, **kwargs):
+        if update:
+            self.loop.update_now()
+        self._arm(self.after)
+        return True
+
+    def again(self, callback, *args, update=None):
+        """
+        Restart the timer like libev's `ev_timer_again`.
+
+        A repeating timer is (re)started to fire `repeat` seconds from now. A
+        timer that doesn't repeat is stopped, if it is active.
+        """
+        if callback is None:
+            raise TypeError("callback must be callable, not None")
+        if update:
+            self.loop.update_now()
 
-    def _start(self, update=True, **kwargs):
-        self._handle = self.loop.aio.call_later(self.after, self._invoke)
-        # return True
-        return None
+        if not self.repeat:
+            if self.active:
+                self.stop()
+            return
+
+        self.callback = callback
+        self.args = args
+        self._arm(self.repeat)
+        if not self.active:
+            self.active = True
+            self._increase_ref()
 
     def _stop(self):
-        if self._handle is not None:
+        if self._wheel is not None:
+            self._wheel.remove(self, self._slot)
+            self._wheel = None
+        if self._scheduled:
+            self._scheduled = False
             self._handle.cancel()
+            # A cancelled handle can't be reused
+            self._handle = None
+
+    def _arm(self, delay):
+        self._when = self.loop.now() + delay
+        self._schedule()
+
+    def _schedule(self):
+        wheel = self.loop.timer_wheel
+        if wheel is not None:
+            self._stop()
+            self._wheel = wheel
+            self._slot = wheel.add(self, self._when)
+            return
+
+        if self._wheel is not None:
+            self._stop()
+        elif self._scheduled:
+            if self._handle.when() <= self._when:
+                # It fires early and gets pushed back in `_on_timer`
+                return
+            self._stop()
+        self._push()
+
+    def _push(self):
+        self._handle = self.loop.aio.call_at(self._when, self._on_timer)
+        self._scheduled = True
+
+    def _on_timer(self):
+        self._scheduled = False
+        if self._when > self._handle.when():
+            # The deadline was moved since the handle was scheduled
+            self._push()
+            return
+
+        self._expire()
 
-    def _invoke(self):
-        self.active = False
-        super()._invoke()
+    def _on_wheel(self):
+        self._wheel = None
+        self._expire()
 
-    def __enter__(self):
-        self._start()
-        return self
+    def _expire(self):
+        if self.repeat:
+            # Like libev, keep the period instead of drifting by the time it
+            # took to run the callbacks, but never schedule into the past
+            self._when = max(self._when + self.repeat, self.loop.aio.time())
+            self._schedule()
+        else:
+            self.active = False
+            self._decrease_ref()
 
-    def __exit__(self, *args):
-        self._stop()
+        self._invoke()
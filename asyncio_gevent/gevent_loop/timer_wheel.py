@@ -0,0 +1,66 @@
+import math
+import sys
+from typing import Dict
+
+__all__ = ["TimerWheel"]
+
+
+class TimerWheel:
+    """
+    Coarse timers for a `GeventLoop`.
+
+    Deadlines are rounded up to the next multiple of `slack` seconds, so a
+    timer fires up to `slack` seconds late, but never early. All timers of
+    the same slot share one asyncio handle, and starting or stopping a timer
+    in a slot that is already scheduled is just a dict operation. This suits
+    the many short-lived timeouts gevent creates, which are almost always
+    cancelled before they fire.
+    """
+
+    def __init__(self, loop, slack: float):
+        if slack <= 0.0:
+            raise ValueError("slack must be positive: %r" % slack)
+        self.loop = loop
+        self.slack = slack
+        # The watchers of each scheduled slot, in the order they were added
+        self._slots: Dict[int, dict] = {}
+
+    def add(self, watcher, when: float) -> int:
+        slot = math.ceil(when / self.slack)
+        watchers = self._slots.get(slot)
+        if watchers is None:
+            watchers = self._slots[slot] = {}
+            self.loop.aio.call_at(slot * self.slack, self._expire, slot)
+        watchers[watcher] = None
+        return slot
+
+    def remove(self, watcher, slot: int):
+        # The handle of a slot that becomes empty is left alone, it's cheaper
+        # to let it fire for nothing than to cancel it
+        watchers = self._slots.get(slot)
+        if watchers is not None:
+            watchers.pop(watcher, None)
+
+    def __len__(self):
+        return sum(map(len, self._slots.values()))
+
+    def _expire(self, slot: int):
+        watchers = self._slots.get(slot)
+        if watchers is None:
+            return
+
+        # The callbacks may stop other timers of this slot or add new ones to
+        # it, so the slot stays in place until all of them ran
+        for watcher in list(watchers):
+            if watcher not in watchers:
+                continue
+            del watchers[watcher]
+            try:
+                watcher._on_wheel()
+            except:  # noqa: E722
+                self.loop.handle_error(watcher, *sys.exc_info())
+
+        if watchers:
+            self.loop.aio.call_at(slot * self.slack, self._expire, slot)
+        else:
+            del self._slots[slot]
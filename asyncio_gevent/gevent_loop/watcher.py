@@ -11,6 +11,8 @@ __all__ = ["Watcher"]
 
 @implementer(IWatcher)
 class Watcher(RefMixin, metaclass=abc.ABCMeta):
+    __slots__ = ("_callback", "args", "pending", "active", "__weakref__")
+
     def __init__(self, loop, ref=True):
         super().__init__(loop, ref)
         self._callback = None
@@ -54,14 +56,24 @@ class Watcher(RefMixin, metaclass=abc.ABCMeta):
     def _stop(self):
         pass
 
-    def _invoke(self):
+    def close(self):
+        if self.active:
+            self.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _invoke(self, *args):
         self.pending = False
         # noinspection PyBroadException
         try:
             # noinspection PyCallingNonCallable
             if self.callback is None:
                 raise RuntimeError("Callback is already stopped")
-            self.callback(*self.args)
+            self.callback(*args, *self.args)
         except Exception:
             raise
         except:  # noqa: E722
@@ -0,0 +1,242 @@
+import asyncio
+import time
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+from typing import Set
+
+import gevent
+import gevent.queue
+
+from ._loop_helpers import call_soon_from_greenlet
+
+__all__ = ["GreenletPool", "GreenletPoolStats"]
+
+
+class GreenletPoolStats(NamedTuple):
+    """
+    A snapshot of the state and counters of a `GreenletPool`
+    """
+
+    size: int
+    workers: int
+    idle_workers: int
+    queue_depth: int
+    submitted: int
+    started: int
+    completed: int
+    cancelled: int
+    total_wait_time: float
+    max_wait_time: float
+
+    @property
+    def mean_wait_time(self) -> float:
+        return self.total_wait_time / self.started if self.started > 0 else 0.0
+
+
+class _Job:
+    __slots__ = (
+        "fn",
+        "args",
+        "kwargs",
+        "loop",
+        "future",
+        "autocancel_future",
+        "submitted_at",
+        "worker",
+        "interrupted",
+    )
+
+    def __init__(self, fn, args, kwargs, loop, future, autocancel_future):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.loop = loop
+        self.future = future
+        self.autocancel_future = autocancel_future
+        self.submitted_at = time.perf_counter()
+        self.worker: Optional[gevent.Greenlet] = None
+        self.interrupted = False
+
+
+def _settle(job: _Job, result, exception: Optional[BaseException]):
+    future = job.future
+    if future.done():
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    elif job.autocancel_future and isinstance(result, gevent.GreenletExit):
+        future.cancel()
+    else:
+        future.set_result(result)
+
+
+class GreenletPool:
+    """
+    A pool of reusable worker greenlets that run blocking functions for
+    coroutines.
+
+    At most `size` functions run at the same time. Further submissions wait in
+    a FIFO admission queue until a worker becomes available. Workers are
+    spawned lazily and then stay alive, waiting for more work, until the pool
+    is closed.
+    """
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.size = size
+        self._queue: gevent.queue.Queue = gevent.queue.Queue()
+        self._workers: Set[gevent.Greenlet] = set()
+        self._idle_workers = 0
+        self._closed = False
+        self._submitted = 0
+        self._started = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of submitted functions waiting for a worker
+        """
+        return self._queue.qsize()
+
+    def stats(self) -> GreenletPoolStats:
+        return GreenletPoolStats(
+            size=self.size,
+            workers=len(self._workers),
+            idle_workers=self._idle_workers,
+            queue_depth=self.queue_depth,
+            submitted=self._submitted,
+            started=self._started,
+            completed=self._completed,
+            cancelled=self._cancelled,
+            total_wait_time=self._total_wait_time,
+            max_wait_time=self._max_wait_time,
+        )
+
+    def submit(
+        self,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        autocancel_future: bool = True,
+        autokill_greenlet: bool = True,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+    ) -> asyncio.Future:
+        """
+        Run `fn(*args, **kwargs)` on a worker greenlet and return a future for
+        its result.
+
+        `autocancel_future` and `autokill_greenlet` behave like the arguments
+        of the same name of `greenlet_to_future`, except that cancelling the
+        future only interrupts the function and not the worker running it.
+        Cancelling the future before the function started removes it from the
+        queue.
+        """
+        if self._closed:
+            raise RuntimeError("GreenletPool is closed")
+
+        if loop is None:
+            loop = asyncio.get_event_loop()
+
+        future = loop.create_future()
+        job = _Job(fn, args, kwargs or {}, loop, future, autocancel_future)
+
+        def on_future_done(_):
+            if future.cancelled():
+                self._cancelled += 1
+                if autokill_greenlet and job.worker is not None:
+                    gevent.get_hub().loop.run_callback(self._interrupt, job)
+
+        future.add_done_callback(on_future_done)
+
+        self._submitted += 1
+        self._queue.put(job)
+
+        if self.queue_depth > self._idle_workers and len(self._workers) < self.size:
+            self._spawn_worker()
+
+        return future
+
+    def close(self):
+        """
+        Stop all workers once the queued functions have run.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(len(self._workers)):
+            self._queue.put(None)
+
+    def _interrupt(self, job: _Job):
+        # Runs in the hub, so the worker is suspended and this can't race with
+        # the worker moving on to another job
+        worker = job.worker
+        if worker is not None:
+            job.interrupted = True
+            worker.throw(gevent.GreenletExit())
+
+    def _spawn_worker(self):
+        worker = gevent.spawn(self._work)
+        self._workers.add(worker)
+        worker.rawlink(self._workers.discard)
+
+    def _work(self):
+        try:
+            self._run_jobs()
+        except BaseException:
+            # The worker was killed, or a function raised a BaseException that
+            # isn't an Exception. A new worker takes over the queued jobs, so
+            # that they don't wait for the next submission.
+            self._workers.discard(gevent.getcurrent())
+            if self.queue_depth > self._idle_workers:
+                self._spawn_worker()
+            raise
+
+    def _run_jobs(self):
+        current = gevent.getcurrent()
+
+        while True:
+            self._idle_workers += 1
+            try:
+                job = self._queue.get()
+            finally:
+                self._idle_workers -= 1
+
+            if job is None:
+                return
+
+            if job.future.done():
+                # Cancelled while it was waiting in the queue
+                continue
+
+            self._started += 1
+            wait_time = time.perf_counter() - job.submitted_at
+            self._total_wait_time += wait_time
+            if wait_time > self._max_wait_time:
+                self._max_wait_time = wait_time
+
+            result = exception = None
+            job.worker = current
+            try:
+                result = job.fn(*job.args, **job.kwargs)
+            except gevent.GreenletExit as e:
+                # Only an interrupt of the job keeps the worker alive, killing
+                # the worker itself still kills it
+                result = e
+                if not job.interrupted:
+                    raise
+            except Exception as e:
+                exception = e
+            except BaseException as e:
+                # Like `KeyboardInterrupt` or `SystemExit`, it ends the worker
+                exception = e
+                raise
+            finally:
+                job.worker = None
+                self._completed += 1
+                call_soon_from_greenlet(job.loop, _settle, job, result, exception)
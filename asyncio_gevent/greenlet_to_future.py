@@ -1,11 +1,21 @@
 import asyncio
+from typing import Optional
 
 import gevent
 
+from ._loop_helpers import call_soon_from_greenlet
+from .instrumentation import _Crossing
+from .instrumentation import _observers
+
 __all__ = ["greenlet_to_future"]
 
 
 def _dead_greenlet_to_future(greenlet: gevent.Greenlet, future: asyncio.Future, autocancel_future: bool) -> None:
+    # The future may already have been cancelled while the greenlet was
+    # finishing
+    if future.done():
+        return
+
     try:
         result = greenlet.get(block=False)
         if autocancel_future and isinstance(result, gevent.GreenletExit):
@@ -16,39 +26,64 @@ def _dead_greenlet_to_future(greenlet: gevent.Greenlet, future: asyncio.Future,
         future.set_exception(e)
 
 
-async def _await_greenlet(
-    greenlet: gevent.Greenlet,
-    autocancel_future: bool,
-    autostart_greenlet: bool,
-    autokill_greenlet: bool,
-):
-    # Start the greenlet if it is not yet running
-    if not greenlet and autostart_greenlet:
-        greenlet.start()
+def _dead_greenlet_result(greenlet: gevent.Greenlet, autocancel_future: bool):
+    # What awaiting the future of a dead greenlet would return or raise
+    result = greenlet.get(block=False)
+    if autocancel_future and isinstance(result, gevent.GreenletExit):
+        raise asyncio.CancelledError()
+    return result
 
-    future: asyncio.Future = asyncio.Future()
 
-    # If the greenlet is dead, set the result
+def _start_eagerly(greenlet: gevent.Greenlet) -> None:
+    """
+    Run a greenlet that hasn't been started right away, until it is dead or blocks.
 
-    if greenlet.dead:
-        _dead_greenlet_to_future(greenlet, future, autocancel_future)
-    else:
+    A greenlet always returns to the hub, its parent, when it finishes or blocks. If the current greenlet isn't the
+    hub, a hub callback switches back to it, which runs before the hub polls for IO again.
+    """
+    hub = gevent.get_hub()
+    current = gevent.getcurrent()
+    if current is hub:
+        greenlet.switch()
+        return
 
-        def cb(_):
-            _dead_greenlet_to_future(greenlet, future, autocancel_future)
+    hub.loop.run_callback(current.switch)
+    greenlet.switch()
 
-        greenlet.link(cb)
 
-    try:
-        loop = asyncio.get_running_loop()
+class _GreenletBridge:
+    """
+    The state of one `greenlet_to_future` crossing.
+
+    It is raw-linked to the greenlet, so that the link runs in the hub instead
+    of a greenlet of its own, and its bound methods are the callbacks on the
+    loop, so a crossing doesn't create any closures.
+    """
+
+    __slots__ = ("loop", "greenlet", "future", "autocancel_future", "autokill_greenlet", "crossing")
+
+    def __init__(self, loop, greenlet, future, autocancel_future, autokill_greenlet, crossing):
+        self.loop = loop
+        self.greenlet = greenlet
+        self.future = future
+        self.autocancel_future = autocancel_future
+        self.autokill_greenlet = autokill_greenlet
+        self.crossing = crossing
 
-        result, _ = await asyncio.gather(future, loop.run_in_executor(None, greenlet.join))
+    def __call__(self, greenlet: gevent.Greenlet):
+        # Runs in the hub when the greenlet is dead
+        call_soon_from_greenlet(self.loop, self.settle)
 
-        return result
-    except asyncio.CancelledError:
-        if autokill_greenlet:
-            greenlet.kill()
-        raise
+    def settle(self):
+        if self.crossing is not None and not self.future.done():
+            self.crossing.finish_greenlet(self.greenlet)
+        _dead_greenlet_to_future(self.greenlet, self.future, self.autocancel_future)
+
+    def on_future_done(self, future: asyncio.Future):
+        if future.cancelled():
+            # Runs on the loop, so the greenlet is only killed later and a
+            # greenlet that ignores `GreenletExit` can't block the loop
+            self.greenlet.kill(block=False)
 
 
 def greenlet_to_future(
@@ -56,19 +91,21 @@ def greenlet_to_future(
     autocancel_future: bool = True,
     autostart_greenlet: bool = True,
     autokill_greenlet: bool = True,
+    loop: Optional[asyncio.AbstractEventLoop] = None,
+    eager: bool = False,
 ) -> asyncio.Future:
     """
     Wrap a greenlet in a future.
 
-    If the greenlet is already dead when the future is awaited/scheduled, then
-    the future will resolve with the result or raise the exception thrown
-    immediately.
+    If the greenlet is already dead when `greenlet_to_future` is called, then
+    the returned future is already resolved with the result or the exception
+    thrown.
 
     If the greenlet is not yet running, the greenlet will by default be started
-    when the future is awaited/scheduled. This is to ensure a sensible default
-    behaviour and prevent odd concurrency issues. To prevent this
-    auto-starting, you can pass `autostart_greenlet=False` as an argument to
-    `greenlet_to_future`.
+    right away when `greenlet_to_future` is called, so it runs even if the
+    future is never awaited. This is to ensure a sensible default behaviour and
+    prevent odd concurrency issues. To prevent this auto-starting, you can pass
+    `autostart_greenlet=False` as an argument to `greenlet_to_future`.
 
     When a greenlet is killed without a custom exception type, it will return
     (*not* raise) a `GreenletExit` exception. In this instance, by default, the
@@ -80,6 +117,63 @@ def greenlet_to_future(
     If the future gets cancelled, then by default the greenlet is killed. To
     prevent the greenlet from getting killed, you can pass
     `autokill_greenlet=False` as an argument to `greenlet_to_future`.
+
+    The future is created on `loop`, or on the current event loop if no `loop`
+    argument has been passed. It is resolved directly from a link on the
+    greenlet, so no thread, task or executor is involved.
+
+    With `eager=True`, a greenlet that hasn't been started yet is switched to
+    right away instead of being scheduled on the hub, like with asyncio's
+    eager task factory. If it finishes without blocking, the returned future
+    is already done.
     """
+    return _greenlet_to_future(
+        greenlet,
+        autocancel_future,
+        autostart_greenlet,
+        autokill_greenlet,
+        loop,
+        eager,
+        _Crossing("greenlet_to_future") if _observers else None,
+    )
+
+
+def _greenlet_to_future(
+    greenlet: gevent.Greenlet,
+    autocancel_future: bool,
+    autostart_greenlet: bool,
+    autokill_greenlet: bool,
+    loop: Optional[asyncio.AbstractEventLoop],
+    eager: bool,
+    crossing: Optional[_Crossing],
+) -> asyncio.Future:
+    if loop is None:
+        loop = asyncio.get_event_loop()
+
+    future = loop.create_future()
+    if crossing is not None:
+        # Added before the greenlet is killed by a cancelled future, so that
+        # the crossing counts as cancelled rather than killed
+        future.add_done_callback(crossing)
+
+    # Start the greenlet if it is not yet running
+    if not greenlet and autostart_greenlet:
+        if eager and not greenlet.dead:
+            _start_eagerly(greenlet)
+        else:
+            greenlet.start()
+
+    # If the greenlet is dead, set the result
+
+    if greenlet.dead:
+        if crossing is not None:
+            crossing.finish_greenlet(greenlet)
+        _dead_greenlet_to_future(greenlet, future, autocancel_future)
+        return future
+
+    bridge = _GreenletBridge(loop, greenlet, future, autocancel_future, autokill_greenlet, crossing)
+    greenlet.rawlink(bridge)
+    if autokill_greenlet:
+        future.add_done_callback(bridge.on_future_done)
 
-    return asyncio.ensure_future(_await_greenlet(greenlet, autocancel_future, autostart_greenlet, autokill_greenlet))
+    return future
@@ -0,0 +1,266 @@
+import asyncio
+
+import gevent
+import gevent.hub
+
+from .event_loop import EventLoop
+
+__all__ = ["HubEventLoop"]
+
+READ = 1
+WRITE = 2
+
+
+class _TimerHandle(asyncio.TimerHandle):
+    __slots__ = ("_watcher",)
+
+
+class _IoRegistration:
+    """
+    A persistent gevent IO watcher for one direction (read or write) of a file
+    descriptor registered with a `HubEventLoop`.
+
+    The watcher stays started while a callback is registered. When it fires,
+    a dispatch handle is queued on the asyncio loop. If it fires again before
+    the loop greenlet got around to running that handle, the watcher is
+    stopped until it does, so that a stalled loop can't make the hub spin.
+    """
+
+    __slots__ = ("loop", "watcher", "handle", "dispatch", "pending")
+
+    def __init__(self, loop: "HubEventLoop", fd: int, events: int):
+        self.loop = loop
+        self.watcher = loop._hub.loop.io(fd, events, ref=False)
+        self.handle = None
+        self.dispatch = asyncio.Handle(self._dispatch, (), loop)
+        self.pending = False
+
+    def set(self, handle: asyncio.Handle):
+        if self.handle is not None:
+            self.handle.cancel()
+        self.handle = handle
+        if not self.pending and not self.watcher.active:
+            self.watcher.start(self._ready)
+
+    def clear(self) -> bool:
+        handle = self.handle
+        if handle is None:
+            return False
+        self.handle = None
+        self.watcher.stop()
+        handle.cancel()
+        return True
+
+    def close(self):
+        self.clear()
+        self.watcher.close()
+
+    def _ready(self):
+        # Runs in the hub
+        if self.pending:
+            self.watcher.stop()
+            return
+        self.pending = True
+        self.loop._ready.append(self.dispatch)
+        self.loop._schedule_wake()
+
+    def _dispatch(self):
+        # Runs in the loop greenlet
+        self.pending = False
+        handle = self.handle
+        if handle is None or handle._cancelled:
+            return
+        if not self.watcher.active:
+            self.watcher.start(self._ready)
+        handle._run()
+
+
+class HubEventLoop(EventLoop):
+    """
+    An asyncio event loop that runs in a spawned greenlet and maps its
+    primitives directly onto the watchers of the gevent hub's loop
+
+    Instead of going through a selector on every iteration, readers and
+    writers are persistent `hub.loop.io` watchers, `call_later` and `call_at`
+    are `hub.loop.timer` watchers and callbacks scheduled from other greenlets
+    wake the loop greenlet with `hub.loop.run_callback`. Between iterations,
+    the loop greenlet parks on the hub until one of those fires.
+    """
+
+    def __init__(self, selector=None):
+        self._hub = gevent.get_hub()
+        self._io_registrations = {}
+        self._timers = set()
+        self._waiter = gevent.hub.Waiter(self._hub)
+        self._parked = False
+        self._wake_scheduled = False
+        self._yield_timer = self._hub.loop.timer(0, ref=False)
+        self._async_watcher = self._hub.loop.async_()
+        super().__init__(selector)
+
+    def run_forever(self):
+        # The async watcher is the only referenced watcher of the loop, so the
+        # hub stays alive while the loop runs, but not after it stopped
+        self._async_watcher.start(self._schedule_wake)
+        try:
+            super().run_forever()
+        finally:
+            self._async_watcher.stop()
+
+    def stop(self):
+        super().stop()
+        if self._parked:
+            self._schedule_wake()
+
+    def close(self):
+        if self.is_closed():
+            return
+
+        super().close()
+
+        for registrations in self._io_registrations.values():
+            for registration in registrations:
+                if registration is not None:
+                    registration.close()
+        self._io_registrations.clear()
+
+        for handle in list(self._timers):
+            handle.cancel()
+
+        self._yield_timer.close()
+        self._async_watcher.close()
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        if self._parked:
+            self._schedule_wake()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        self._check_closed()
+        handle = _TimerHandle(when, callback, args, self, context)
+        self._start_timer(handle, when - self.time())
+        return handle
+
+    def _start_timer(self, handle: _TimerHandle, delay: float):
+        handle._watcher = watcher = self._hub.loop.timer(max(0.0, delay), ref=False)
+        watcher.start(self._on_timer, handle)
+        self._timers.add(handle)
+
+    def _on_timer(self, handle: _TimerHandle):
+        # Runs in the hub. The hub's notion of the current time may lag behind,
+        # so re-arm the timer if it fired early.
+        handle._watcher.close()
+        delay = handle._when - self.time()
+        if delay >= self._clock_resolution:
+            self._start_timer(handle, delay)
+            return
+
+        handle._watcher = None
+        self._timers.discard(handle)
+        self._ready.append(handle)
+        self._schedule_wake()
+
+    def _timer_handle_cancelled(self, handle):
+        watcher = handle._watcher
+        if watcher is not None:
+            handle._watcher = None
+            watcher.stop()
+            watcher.close()
+        self._timers.discard(handle)
+
+    def _add_reader(self, fd, callback, *args):
+        self._check_closed()
+        handle = asyncio.Handle(callback, args, self, None)
+        self._io_registration(fd, READ).set(handle)
+        return handle
+
+    def _remove_reader(self, fd):
+        return self._remove_io_registration(fd, READ)
+
+    def _add_writer(self, fd, callback, *args):
+        self._check_closed()
+        handle = asyncio.Handle(callback, args, self, None)
+        self._io_registration(fd, WRITE).set(handle)
+        return handle
+
+    def _remove_writer(self, fd):
+        return self._remove_io_registration(fd, WRITE)
+
+    def _io_registration(self, fd, events: int) -> _IoRegistration:
+        fd = fd if isinstance(fd, int) else int(fd.fileno())
+        registrations = self._io_registrations.get(fd)
+        if registrations is None:
+            registrations = self._io_registrations[fd] = [None, None]
+        index = events - 1
+        registration = registrations[index]
+        if registration is None:
+            registration = registrations[index] = _IoRegistration(self, fd, events)
+        return registration
+
+    def _remove_io_registration(self, fd, events: int) -> bool:
+        if self.is_closed():
+            return False
+        fd = fd if isinstance(fd, int) else int(fd.fileno())
+        registrations = self._io_registrations.get(fd)
+        if registrations is None:
+            return False
+        registration = registrations[events - 1]
+        removed = registration is not None and registration.clear()
+
+        # Only drop the watchers once neither direction is registered, so that
+        # toggling a writer on a connected socket reuses the same watcher
+        if all(r is None or r.handle is None for r in registrations):
+            del self._io_registrations[fd]
+            for r in registrations:
+                if r is not None:
+                    r.close()
+
+        return removed
+
+    def _write_to_self(self):
+        # Used by `call_soon_threadsafe` and signal handlers
+        self._async_watcher.send()
+
+    def _wakeup(self):
+        if self._parked:
+            self._schedule_wake()
+
+    def _schedule_wake(self):
+        if not self._wake_scheduled:
+            self._wake_scheduled = True
+            self._hub.loop.run_callback(self._wake)
+
+    def _wake(self):
+        # Runs in the hub
+        self._wake_scheduled = False
+        if self._parked:
+            self._parked = False
+            self._waiter.switch(None)
+
+    def _park(self):
+        self._parked = True
+        try:
+            self._waiter.get()
+        finally:
+            self._parked = False
+
+    def _run_once(self):
+        if self._ready or self._stopping:
+            # Still let the hub poll once, so that a busy loop doesn't starve
+            # other greenlets and IO watchers
+            self._yield_timer.start(self._wake)
+            try:
+                self._park()
+            finally:
+                self._yield_timer.stop()
+        else:
+            self._park()
+
+        # Like in `BaseEventLoop._run_once`, only run the callbacks that are
+        # ready now and not any callbacks scheduled by them
+        ready = self._ready
+        for _ in range(len(ready)):
+            handle = ready.popleft()
+            if not handle._cancelled:
+                handle._run()
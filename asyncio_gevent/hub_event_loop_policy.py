@@ -0,0 +1,15 @@
+import asyncio
+
+from .hub_event_loop import HubEventLoop
+
+__all__ = ["HubEventLoopPolicy"]
+
+
+class HubEventLoopPolicy(asyncio.DefaultEventLoopPolicy):  # type: ignore
+    """
+    An asyncio event loop policy with the all the default behaviours except
+    that it uses the `asyncio_gevent.HubEventLoop` which maps asyncio's
+    primitives directly onto the gevent hub's loop
+    """
+
+    _loop_factory = HubEventLoop
@@ -0,0 +1,293 @@
+import asyncio
+import time
+import traceback
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+import gevent
+
+__all__ = [
+    "add_bridge_observer",
+    "BridgeCollector",
+    "BridgeEvent",
+    "BridgeStats",
+    "LatencyHistogram",
+    "remove_bridge_observer",
+]
+
+# Latencies are bucketed like in an HDR histogram: values below
+# `_SUB_BUCKETS` nanoseconds are counted exactly and larger ones in
+# `_SUB_BUCKETS // 2` buckets per power of two, so that every bucket is within
+# 1/64 (~1.6%) of the values it counts
+_SUB_BUCKET_BITS = 7
+_SUB_BUCKETS = 1 << _SUB_BUCKET_BITS
+_HALF_SUB_BUCKETS = _SUB_BUCKETS >> 1
+
+
+def _bucket_index(value: int) -> int:
+    if value < _SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - _SUB_BUCKET_BITS
+    return _SUB_BUCKETS + (shift - 1) * _HALF_SUB_BUCKETS + (value >> shift) - _HALF_SUB_BUCKETS
+
+
+def _bucket_highest_value(index: int) -> int:
+    if index < _SUB_BUCKETS:
+        return index
+    shift, sub_bucket = divmod(index - _SUB_BUCKETS, _HALF_SUB_BUCKETS)
+    shift += 1
+    return ((sub_bucket + _HALF_SUB_BUCKETS + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    A histogram of latencies in seconds with a relative precision of ~1.6%.
+
+    Latencies are recorded in nanoseconds into logarithmic buckets, like an HDR histogram, so recording a value is a
+    constant time operation and the histogram stays small no matter how many values it counts.
+    """
+
+    __slots__ = ("_counts", "count", "_total", "_min", "_max")
+
+    def __init__(self):
+        self._counts: List[int] = []
+        self.count = 0
+        self._total = 0
+        self._min = 0
+        self._max = 0
+
+    def record(self, seconds: float) -> None:
+        value = max(0, int(seconds * 1e9))
+        index = _bucket_index(value)
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+
+        if self.count == 0 or value < self._min:
+            self._min = value
+        if value > self._max:
+            self._max = value
+        self.count += 1
+        self._total += value
+
+    @property
+    def min(self) -> float:
+        return self._min / 1e9
+
+    @property
+    def max(self) -> float:
+        return self._max / 1e9
+
+    @property
+    def mean(self) -> float:
+        return self._total / self.count / 1e9 if self.count > 0 else 0.0
+
+    def percentile(self, percentile: float) -> float:
+        """
+        The latency that `percentile` percent of the recorded values are at or below, rounded up to its bucket
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank:
+                return min(_bucket_highest_value(index), self._max) / 1e9
+        return self.max
+
+    def copy(self) -> "LatencyHistogram":
+        histogram = LatencyHistogram()
+        histogram._counts = list(self._counts)
+        histogram.count = self.count
+        histogram._total = self._total
+        histogram._min = self._min
+        histogram._max = self._max
+        return histogram
+
+
+class BridgeEvent(NamedTuple):
+    """
+    A finished crossing of one of the bridge functions
+
+    `outcome` is one of:
+
+    - `"result"`: the bridged call returned
+    - `"exception"`: the bridged call raised an exception
+    - `"cancelled"`: the asyncio side was cancelled
+    - `"killed"`: the greenlet was killed
+
+    `wait_time` is the time from the bridge function call until the bridged call started running, or `None` if the
+    bridge doesn't run the call itself (`greenlet_to_future`) or it was killed before it started. `duration` is the
+    time from the bridge function call until the crossing finished.
+    """
+
+    bridge: str
+    outcome: str
+    wait_time: Optional[float]
+    duration: float
+
+
+Observer = Callable[[BridgeEvent], None]
+
+# Checked by the bridges before they record anything, so instrumentation costs
+# a truthiness check of this list when there aren't any observers
+_observers: List[Observer] = []
+
+
+def add_bridge_observer(observer: Observer) -> None:
+    """
+    Call `observer` with a `BridgeEvent` whenever a crossing of `greenlet_to_future`, `future_to_greenlet`,
+    `sync_to_async` or `async_to_sync` finishes.
+
+    Observers are called in the greenlet or event loop that finished the crossing, so they should be quick and must
+    not block. Exceptions raised by observers are printed and otherwise ignored.
+    """
+    _observers.append(observer)
+
+
+def remove_bridge_observer(observer: Observer) -> None:
+    """
+    Stop calling an observer that has been added with `add_bridge_observer`.
+    """
+    _observers.remove(observer)
+
+
+class _Crossing:
+    """
+    The timings of one instrumented crossing.
+
+    A crossing can be finished from both sides of the bridge, e.g. by a cancelled future and the greenlet that is
+    killed because of it. Only the first outcome is reported.
+    """
+
+    __slots__ = ("bridge", "created_at", "started_at", "finished")
+
+    def __init__(self, bridge: str):
+        self.bridge = bridge
+        self.created_at = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.finished = False
+
+    def start(self) -> None:
+        self.started_at = time.perf_counter()
+
+    def call(self, fn: Callable, *args, **kwargs):
+        # Runs the bridged function in place of `fn`
+        self.start()
+        try:
+            return fn(*args, **kwargs)
+        except gevent.GreenletExit:
+            self.finish("killed")
+            raise
+
+    def finish(self, outcome: str) -> None:
+        if self.finished:
+            return
+        self.finished = True
+
+        now = time.perf_counter()
+        started_at = self.started_at
+        event = BridgeEvent(
+            self.bridge,
+            outcome,
+            started_at - self.created_at if started_at is not None else None,
+            now - self.created_at,
+        )
+        for observer in tuple(_observers):
+            try:
+                observer(event)
+            except Exception:
+                traceback.print_exc()
+
+    def finish_greenlet(self, greenlet: gevent.Greenlet) -> None:
+        if not greenlet.successful():
+            self.finish("exception")
+        elif isinstance(greenlet.value, gevent.GreenletExit):
+            self.finish("killed")
+        else:
+            self.finish("result")
+
+    def __call__(self, future: asyncio.Future):
+        # A done callback of the crossing's future
+        if future.cancelled():
+            self.finish("cancelled")
+        elif future.exception() is not None:
+            self.finish("exception")
+        else:
+            self.finish("result")
+
+
+class BridgeStats(NamedTuple):
+    """
+    A snapshot of the counters and latency histograms of one bridge function in a `BridgeCollector`
+    """
+
+    crossings: int
+    results: int
+    exceptions: int
+    cancelled: int
+    killed: int
+    wait_time: LatencyHistogram
+    duration: LatencyHistogram
+
+
+class _BridgeCounters:
+    __slots__ = ("outcomes", "wait_time", "duration")
+
+    def __init__(self):
+        self.outcomes: Dict[str, int] = {"result": 0, "exception": 0, "cancelled": 0, "killed": 0}
+        self.wait_time = LatencyHistogram()
+        self.duration = LatencyHistogram()
+
+
+class BridgeCollector:
+    """
+    An observer that counts the crossings of each bridge function by outcome and records histograms of their wait
+    times and durations.
+
+    ```py
+    collector = asyncio_gevent.BridgeCollector()
+    asyncio_gevent.add_bridge_observer(collector)
+    ...
+    stats = collector.stats()["sync_to_async"]
+    print(stats.crossings, stats.duration.percentile(99))
+    ```
+    """
+
+    def __init__(self):
+        self._bridges: Dict[str, _BridgeCounters] = {}
+
+    def __call__(self, event: BridgeEvent) -> None:
+        counters = self._bridges.get(event.bridge)
+        if counters is None:
+            counters = self._bridges[event.bridge] = _BridgeCounters()
+        counters.outcomes[event.outcome] += 1
+        if event.wait_time is not None:
+            counters.wait_time.record(event.wait_time)
+        counters.duration.record(event.duration)
+
+    def stats(self) -> Dict[str, BridgeStats]:
+        """
+        Snapshots of the bridge functions that have finished crossings, by name
+        """
+        stats = {}
+        for bridge, counters in self._bridges.items():
+            outcomes = counters.outcomes
+            stats[bridge] = BridgeStats(
+                crossings=sum(outcomes.values()),
+                results=outcomes["result"],
+                exceptions=outcomes["exception"],
+                cancelled=outcomes["cancelled"],
+                killed=outcomes["killed"],
+                wait_time=counters.wait_time.copy(),
+                duration=counters.duration.copy(),
+            )
+        return stats
+
+    def reset(self) -> None:
+        self._bridges.clear()
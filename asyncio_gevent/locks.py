@@ -0,0 +1,295 @@
+import asyncio
+import collections
+import time
+from typing import Callable
+from typing import Deque
+from typing import Optional
+
+from gevent.hub import Waiter
+
+from ._handoff import Handoff
+from ._handoff import HandoffWaiters
+
+__all__ = ["Condition", "Event", "Lock", "Semaphore"]
+
+
+class _TimedOut(Exception):
+    pass
+
+
+class Semaphore(HandoffWaiters):
+    """
+    A semaphore that greenlets and coroutines of the same thread can acquire.
+
+    Greenlets call `acquire` or use `with semaphore:`, which blocks the current greenlet. Coroutines await
+    `aacquire` or use `async with semaphore:`. `release` can be called from both. While the semaphore is available
+    and nobody waits for it, acquiring only decrements a counter.
+
+    Greenlets and tasks wait in the same FIFO queue, and `release` hands the semaphore directly to the one that has
+    waited the longest, so a greenlet or task that comes later can't overtake it.
+    """
+
+    def __init__(self, value: int = 1):
+        if value < 0:
+            raise ValueError("value must be at least 0")
+
+        super().__init__()
+        self._value = value
+        self._waiters: Deque[Handoff] = collections.deque()
+
+    def locked(self) -> bool:
+        return self._value == 0
+
+    def acquire(self, blocking: bool = True, timeout: Optional[float] = None) -> bool:
+        """
+        Acquire the semaphore, blocking the current greenlet until it is available.
+
+        Returns `False` if it couldn't be acquired within `timeout` seconds, or right away with `blocking=False`.
+        """
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return True
+        if not blocking:
+            return False
+        try:
+            self._wait(Handoff(None, Waiter()), self._waiters, timeout, _TimedOut)
+        except _TimedOut:
+            return False
+        return True
+
+    async def aacquire(self) -> bool:
+        """
+        Acquire the semaphore, waiting until it is available.
+        """
+        if self._value > 0 and not self._waiters:
+            self._value -= 1
+            return True
+        await self._await(Handoff(None, future=asyncio.get_running_loop().create_future()), self._waiters)
+        return True
+
+    def release(self):
+        waiter = self._next_waiter(self._waiters)
+        if waiter is None:
+            self._value += 1
+            return
+        # The waiter now holds the semaphore, so the value stays the same
+        self._resolve(waiter, None)
+        self._wake_loop()
+
+    def __enter__(self) -> bool:
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    async def __aenter__(self):
+        await self.aacquire()
+
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+    def _withdraw(self, handoff: Handoff, waiters: Deque[Handoff]):
+        if not handoff.done:
+            super()._withdraw(handoff, waiters)
+        else:
+            # The semaphore was handed over already, so it's passed on
+            self.release()
+
+
+class Lock(Semaphore):
+    """
+    A lock that greenlets and coroutines of the same thread can acquire, like a `Semaphore` with a value of 1.
+
+    Like `asyncio.Lock`, it isn't owned by the greenlet or task that acquired it, but releasing it while it's
+    unlocked raises a `RuntimeError`.
+    """
+
+    def __init__(self):
+        super().__init__(1)
+
+    def release(self):
+        if self._value > 0:
+            raise RuntimeError("Lock is not acquired")
+        super().release()
+
+
+class Event(HandoffWaiters):
+    """
+    An event that greenlets and coroutines of the same thread can wait for.
+
+    Greenlets call `wait`, which blocks the current greenlet, and coroutines await the event itself. `set` wakes up
+    all of them directly, without creating a greenlet or a task. Waiting for an event that is already set returns
+    right away.
+
+    ```py
+    async def main():
+        await event
+    ```
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._flag = False
+        self._waiters: Deque[Handoff] = collections.deque()
+
+    def is_set(self) -> bool:
+        return self._flag
+
+    def set(self):
+        if self._flag:
+            return
+        self._flag = True
+        while self._waiters:
+            waiter = self._next_waiter(self._waiters)
+            if waiter is not None:
+                self._resolve(waiter, None)
+        self._wake_loop()
+
+    def clear(self):
+        self._flag = False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block the current greenlet until the event is set.
+
+        Returns `False` if it isn't set within `timeout` seconds.
+        """
+        if self._flag:
+            return True
+        try:
+            self._wait(Handoff(None, Waiter()), self._waiters, timeout, _TimedOut)
+        except _TimedOut:
+            return False
+        return True
+
+    def __await__(self):
+        return self._await_set().__await__()
+
+    async def _await_set(self) -> bool:
+        if not self._flag:
+            await self._await(Handoff(None, future=asyncio.get_running_loop().create_future()), self._waiters)
+        return True
+
+
+class Condition(HandoffWaiters):
+    """
+    A condition variable that greenlets and coroutines of the same thread can wait on, with a `Lock` of this module.
+
+    Greenlets hold the lock with `with condition:` and call `wait` or `wait_for`. Coroutines hold it with
+    `async with condition:` and await the condition itself or `await_for`. `notify` and `notify_all` wake up waiters
+    of both kinds in the order they started waiting, and can be called from both.
+
+    ```py
+    async def consume():
+        async with condition:
+            await condition.await_for(lambda: items)
+            return items.pop()
+    ```
+    """
+
+    def __init__(self, lock: Optional[Lock] = None):
+        super().__init__()
+        self._lock = lock if lock is not None else Lock()
+        self._waiters: Deque[Handoff] = collections.deque()
+        self.acquire = self._lock.acquire
+        self.aacquire = self._lock.aacquire
+        self.release = self._lock.release
+        self.locked = self._lock.locked
+
+    def __enter__(self) -> bool:
+        return self._lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self._lock.release()
+
+    async def __aenter__(self):
+        await self._lock.aacquire()
+
+    async def __aexit__(self, *exc_info):
+        self._lock.release()
+
+    def notify(self, n: int = 1):
+        if not self._lock.locked():
+            raise RuntimeError("cannot notify on un-acquired lock")
+        while n > 0 and self._waiters:
+            waiter = self._next_waiter(self._waiters)
+            if waiter is not None:
+                self._resolve(waiter, None)
+                n -= 1
+        self._wake_loop()
+
+    def notify_all(self):
+        self.notify(len(self._waiters))
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Release the lock, block the current greenlet until the condition is notified and acquire the lock again.
+
+        Returns `False` if it isn't notified within `timeout` seconds.
+        """
+        if not self._lock.locked():
+            raise RuntimeError("cannot wait on un-acquired lock")
+        self._lock.release()
+        try:
+            self._wait(Handoff(None, Waiter()), self._waiters, timeout, _TimedOut)
+        except _TimedOut:
+            return False
+        finally:
+            self._lock.acquire()
+        return True
+
+    def wait_for(self, predicate: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """
+        Wait until `predicate()` is true, like `threading.Condition.wait_for`.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        result = predicate()
+        while not result:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            self.wait(remaining)
+            result = predicate()
+        return result
+
+    def __await__(self):
+        return self._await_notified().__await__()
+
+    async def await_for(self, predicate: Callable[[], bool]) -> bool:
+        """
+        Wait until `predicate()` is true, like `asyncio.Condition.wait_for`.
+        """
+        result = predicate()
+        while not result:
+            await self._await_notified()
+            result = predicate()
+        return result
+
+    def _withdraw(self, handoff: Handoff, waiters: Deque[Handoff]):
+        if not handoff.done:
+            super()._withdraw(handoff, waiters)
+            return
+        # The notification is passed on to the next waiter
+        waiter = self._next_waiter(waiters)
+        if waiter is not None:
+            self._resolve(waiter, None)
+
+    async def _await_notified(self) -> bool:
+        if not self._lock.locked():
+            raise RuntimeError("cannot wait on un-acquired lock")
+        self._lock.release()
+        try:
+            await self._await(Handoff(None, future=asyncio.get_running_loop().create_future()), self._waiters)
+        finally:
+            # Like with `asyncio.Condition`, the lock is acquired again even
+            # if the task is cancelled
+            cancelled = False
+            while True:
+                try:
+                    await self._lock.aacquire()
+                    break
+                except asyncio.CancelledError:
+                    cancelled = True
+            if cancelled:
+                raise asyncio.CancelledError()
+        return True
@@ -0,0 +1,311 @@
+import asyncio
+import collections
+import concurrent.futures
+from typing import Callable
+from typing import Deque
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+import gevent
+import gevent.hub
+import gevent.monkey
+
+from .event_loop import EventLoop
+from .greenlet_to_future import greenlet_to_future
+
+__all__ = ["LoopGroup", "LoopGroupFuture", "LoopThreadStats"]
+
+_allocate_lock = gevent.monkey.get_original("_thread", "allocate_lock")
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+_start_new_thread = gevent.monkey.get_original("_thread", "start_new_thread")
+
+
+class LoopThreadStats(NamedTuple):
+    """
+    A snapshot of the counters of one thread of a `LoopGroup`
+    """
+
+    index: int
+    thread_id: Optional[int]
+    submitted: int
+    completed: int
+    in_flight: int
+    wakeups: int
+
+
+class LoopGroupFuture(concurrent.futures.Future):
+    """
+    The result of `LoopGroup.submit`.
+
+    It is a `concurrent.futures.Future`, so plain threads can wait for it with `result()`. Coroutines can await it
+    and greenlets can wait for it with `get()` without blocking their hub.
+
+    Cancelling the future after the job started running cancels its task, but `cancel()` returns `False` like for
+    any running `concurrent.futures.Future`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._loop_thread: Optional["_LoopThread"] = None
+        self._task: Optional[asyncio.Future] = None
+
+    def __await__(self):
+        return asyncio.wrap_future(self).__await__()
+
+    def get(self, timeout: Optional[float] = None):
+        """
+        Block the current greenlet until the job is done and return its result or raise its exception.
+        """
+        if not self.done():
+            hub = gevent.get_hub()
+            waiter = gevent.hub.Waiter(hub)
+            # Async watchers are the loop's thread-safe way to be woken up
+            watcher = hub.loop.async_()
+            watcher.start(waiter.switch, None)
+            try:
+                self.add_done_callback(lambda _: watcher.send())
+                with gevent.Timeout(timeout, concurrent.futures.TimeoutError):
+                    waiter.get()
+            finally:
+                watcher.close()
+        return self.result(0)
+
+    def cancel(self) -> bool:
+        if super().cancel():
+            return True
+        loop_thread, task = self._loop_thread, self._task
+        if loop_thread is not None and task is not None and not self.done():
+            loop_thread.loop.call_soon_threadsafe(task.cancel)
+        return False
+
+
+class _Job:
+    __slots__ = ("target", "args", "kwargs", "future")
+
+    def __init__(self, target, args, kwargs, future):
+        self.target = target
+        self.args = args
+        self.kwargs = kwargs
+        self.future = future
+
+
+class _LoopThread:
+    """
+    One thread of a `LoopGroup` with its own hub and event loop.
+
+    Jobs are queued in an inbox. A submission only wakes the loop when no wakeup is pending yet, so a burst of jobs
+    from other threads costs a single `call_soon_threadsafe`.
+    """
+
+    def __init__(self, index: int, loop_factory: Callable[[], asyncio.AbstractEventLoop]):
+        self.index = index
+        self.loop_factory = loop_factory
+        self.loop: asyncio.AbstractEventLoop
+        self.thread_id: Optional[int] = None
+        self.inbox: Deque[_Job] = collections.deque()
+        self.wakeup_pending = False
+        self.submitted = 0
+        self.completed = 0
+        self.wakeups = 0
+        self._ready = _allocate_lock()
+        self._done = _allocate_lock()
+
+    @property
+    def in_flight(self) -> int:
+        return self.submitted - self.completed
+
+    def start(self):
+        self._ready.acquire()
+        self._done.acquire()
+        _start_new_thread(self._run, ())
+        # Block until the loop has been created, so that it can be submitted to
+        self._ready.acquire()
+        self._ready.release()
+
+    def join(self):
+        self._done.acquire()
+        self._done.release()
+
+    def stats(self) -> LoopThreadStats:
+        return LoopThreadStats(
+            index=self.index,
+            thread_id=self.thread_id,
+            submitted=self.submitted,
+            completed=self.completed,
+            in_flight=self.in_flight,
+            wakeups=self.wakeups,
+        )
+
+    def submit(self, job: _Job):
+        # Called with the lock of the group held
+        job.future._loop_thread = self
+        self.submitted += 1
+        self.inbox.append(job)
+        if not self.wakeup_pending:
+            self.wakeup_pending = True
+            self.wakeups += 1
+            self.loop.call_soon_threadsafe(self._drain)
+
+    def _drain(self):
+        # Cleared before draining, so that a job that is queued while the
+        # inbox is drained either is drained too or schedules another wakeup
+        self.wakeup_pending = False
+        inbox = self.inbox
+        while inbox:
+            self._start_job(inbox.popleft())
+
+    def _start_job(self, job: _Job):
+        future = job.future
+        if not future.set_running_or_notify_cancel():
+            self.completed += 1
+            return
+
+        try:
+            target = job.target
+            if asyncio.iscoroutine(target):
+                awaitable = target
+            elif asyncio.iscoroutinefunction(target):
+                awaitable = target(*job.args, **job.kwargs)
+            else:
+                awaitable = greenlet_to_future(gevent.Greenlet(target, *job.args, **job.kwargs), loop=self.loop)
+            task = asyncio.ensure_future(awaitable, loop=self.loop)
+        except BaseException as e:
+            self.completed += 1
+            future.set_exception(e)
+            return
+
+        future._task = task
+        task.add_done_callback(lambda task: self._finish_job(future, task))
+
+    def _finish_job(self, future: LoopGroupFuture, task: asyncio.Future):
+        self.completed += 1
+        if task.cancelled():
+            # A running `concurrent.futures.Future` can't be cancelled anymore
+            future.set_exception(concurrent.futures.CancelledError())
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def _run(self):
+        self.thread_id = _get_ident()
+        try:
+            self.loop = self.loop_factory()
+            asyncio.set_event_loop(self.loop)
+        finally:
+            self._ready.release()
+
+        try:
+            self.loop.run_forever()
+            self.loop.run_until_complete(self._shutdown())
+        finally:
+            self.loop.close()
+            asyncio.set_event_loop(None)
+            gevent.get_hub().destroy(destroy_loop=True)
+            self._done.release()
+
+    async def _shutdown(self):
+        # Jobs that were submitted after the loop stopped are cancelled too
+        for job in self.inbox:
+            job.future.cancel()
+        self.inbox.clear()
+
+        tasks = [task for task in asyncio.all_tasks(self.loop) if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class LoopGroup:
+    """
+    A group of `threads` OS threads that each run their own gevent hub and asyncio event loop.
+
+    Coroutines and functions are submitted to one of the threads with `submit`, which places them round-robin or,
+    with `placement="least_loaded"`, on the thread with the fewest jobs in flight. Submissions from other threads
+    are queued, and a loop is only woken up once for all the jobs that are queued while it's busy.
+
+    ```py
+    with asyncio_gevent.LoopGroup(4) as group:
+        future = group.submit(fetch, url)
+        result = future.result()
+    ```
+    """
+
+    def __init__(
+        self,
+        threads: int,
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] = EventLoop,
+        placement: str = "round_robin",
+    ):
+        if threads < 1:
+            raise ValueError("threads must be at least 1")
+        if placement not in ("round_robin", "least_loaded"):
+            raise ValueError("placement must be 'round_robin' or 'least_loaded'")
+
+        self.placement = placement
+        self._threads = [_LoopThread(index, loop_factory) for index in range(threads)]
+        self._next = 0
+        self._lock = _allocate_lock()
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def loops(self) -> List[asyncio.AbstractEventLoop]:
+        return [loop_thread.loop for loop_thread in self._threads]
+
+    def start(self) -> "LoopGroup":
+        if self._running:
+            return self
+        for loop_thread in self._threads:
+            loop_thread.start()
+        self._running = True
+        return self
+
+    def stop(self):
+        """
+        Cancel the remaining jobs, stop the loops and wait for the threads to exit.
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+        for loop_thread in self._threads:
+            loop_thread.loop.call_soon_threadsafe(loop_thread.loop.stop)
+        for loop_thread in self._threads:
+            loop_thread.join()
+
+    def __enter__(self) -> "LoopGroup":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def submit(self, target, *args, thread: Optional[int] = None, **kwargs) -> LoopGroupFuture:
+        """
+        Run `target` on one of the threads and return a future for its result.
+
+        `target` can be a coroutine object, a coroutine function or a plain function, which is called with `args` and
+        `kwargs`. Plain functions run in a new greenlet of the thread. Pass `thread` to run `target` on a specific
+        thread of the group.
+        """
+        future = LoopGroupFuture()
+        job = _Job(target, args, kwargs, future)
+        with self._lock:
+            if not self._running:
+                raise RuntimeError("LoopGroup is not running")
+            if thread is not None:
+                loop_thread = self._threads[thread]
+            elif self.placement == "least_loaded":
+                loop_thread = min(self._threads, key=lambda loop_thread: loop_thread.in_flight)
+            else:
+                loop_thread = self._threads[self._next]
+                self._next = (self._next + 1) % len(self._threads)
+            loop_thread.submit(job)
+        return future
+
+    def stats(self) -> List[LoopThreadStats]:
+        return [loop_thread.stats() for loop_thread in self._threads]
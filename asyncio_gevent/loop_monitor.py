@@ -0,0 +1,239 @@
+import asyncio
+import collections
+import sys
+import time
+import traceback
+from typing import Callable
+from typing import Deque
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+
+import gevent
+import gevent.monkey
+import greenlet
+
+from ._loop_helpers import call_soon_from_greenlet
+
+__all__ = ["LoopMonitor", "LoopMonitorStats", "Stall"]
+
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+_start_new_thread = gevent.monkey.get_original("_thread", "start_new_thread")
+_sleep = gevent.monkey.get_original("time", "sleep")
+_perf_counter = time.perf_counter
+
+
+class Stall(NamedTuple):
+    """
+    A greenlet that ran for longer than the threshold of a `LoopMonitor` without switching
+
+    `greenlet` is the repr of the greenlet. If it is the greenlet of the monitored asyncio loop, `task` is the repr
+    of the task that was running. `stack` is the formatted stack that the sampler thread took during the stall, or
+    `None` if the stall ended before it was sampled.
+    """
+
+    greenlet: str
+    task: Optional[str]
+    duration: float
+    stack: Optional[List[str]]
+
+
+class LoopMonitorStats(NamedTuple):
+    """
+    A snapshot of the gauges and counters of a `LoopMonitor`
+    """
+
+    loop_lag: float
+    max_loop_lag: float
+    max_hub_gap: float
+    current_stall: float
+    switches: int
+    stalls: int
+    stall_time: float
+
+
+class LoopMonitor:
+    """
+    Measure the lag of an asyncio loop running on gevent and find the greenlets and coroutines that stall it.
+
+    While the asyncio loop runs in one greenlet, a greenlet that doesn't yield stalls every coroutine and a coroutine
+    that doesn't yield stalls every other greenlet. The monitor traces greenlet switches to measure how long each
+    greenlet runs and how long the hub goes without running. Runs longer than `threshold` seconds are recorded as
+    stalls, attributed to the greenlet and, for the loop's greenlet, the task that was running. A sampler thread
+    that wakes up every `sample_interval` seconds takes a stack sample of stalls that are in progress. Every
+    `lag_interval` seconds, a timer on the loop measures how late it runs.
+
+    The monitor has to be started in the thread of the loop and the hub. `on_stall` is called with each `Stall`
+    while greenlets are being switched, so it must not block or switch greenlets itself.
+
+    ```py
+    monitor = asyncio_gevent.LoopMonitor(loop, threshold=0.05, on_stall=print)
+    monitor.start()
+    ...
+    print(monitor.stats()._asdict())
+    ```
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        threshold: float = 0.1,
+        lag_interval: float = 0.5,
+        sample_interval: Optional[float] = 0.02,
+        on_stall: Optional[Callable[[Stall], None]] = None,
+        max_stalls: int = 100,
+    ):
+        self.loop = loop
+        self.threshold = threshold
+        self.lag_interval = lag_interval
+        self.sample_interval = sample_interval
+        self.on_stall = on_stall
+        self.stalls: Deque[Stall] = collections.deque(maxlen=max_stalls)
+        self._hub: Optional[greenlet.greenlet] = None
+        self._thread_id: Optional[int] = None
+        self._previous_tracer = None
+        self._running = False
+        self._generation = 0
+        self._lag_handle: Optional[asyncio.TimerHandle] = None
+        self._reset()
+
+    def _reset(self):
+        now = time.perf_counter()
+        self._switched_at = now
+        self._hub_left_at = now
+        self._current: Optional[greenlet.greenlet] = None
+        self._run = 0
+        self._sample: Optional[tuple] = None
+        self._loop_lag = 0.0
+        self._max_loop_lag = 0.0
+        self._max_hub_gap = 0.0
+        self._stalls = 0
+        self._stall_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._generation += 1
+        self._reset()
+        self._hub = gevent.get_hub()
+        self._thread_id = _get_ident()
+        self._current = gevent.getcurrent()
+        self._previous_tracer = greenlet.settrace(self._trace)
+        if self.sample_interval is not None:
+            _start_new_thread(self._sample_stalls, (self._generation,))
+        call_soon_from_greenlet(self.loop, self._schedule_lag_check)
+
+    def stop(self):
+        """
+        Stop tracing and sampling. Has to be called in the thread the monitor was started in.
+        """
+        if not self._running:
+            return
+        self._running = False
+        greenlet.settrace(self._previous_tracer)
+        self._previous_tracer = None
+        if self._lag_handle is not None:
+            self._lag_handle.cancel()
+            self._lag_handle = None
+
+    def stats(self) -> LoopMonitorStats:
+        current_stall = time.perf_counter() - self._switched_at
+        return LoopMonitorStats(
+            loop_lag=self._loop_lag,
+            max_loop_lag=self._max_loop_lag,
+            max_hub_gap=self._max_hub_gap,
+            current_stall=current_stall if self._running and current_stall >= self.threshold else 0.0,
+            switches=self._run,
+            stalls=self._stalls,
+            stall_time=self._stall_time,
+        )
+
+    def reset_max(self):
+        """
+        Reset the maximum loop lag and hub gap, e.g. after they have been scraped.
+        """
+        self._max_loop_lag = 0.0
+        self._max_hub_gap = 0.0
+
+    def _trace(self, event: str, args: tuple):
+        if self._previous_tracer is not None:
+            self._previous_tracer(event, args)
+
+        origin, target = args
+        now = _perf_counter()
+        ran = now - self._switched_at
+        self._switched_at = now
+        self._current = target
+        self._run += 1
+
+        if ran >= self.threshold:
+            self._record_stall(origin, ran)
+
+        if target is self._hub:
+            gap = now - self._hub_left_at
+            if gap > self._max_hub_gap:
+                self._max_hub_gap = gap
+        elif origin is self._hub:
+            self._hub_left_at = now
+
+    def _record_stall(self, origin: greenlet.greenlet, duration: float):
+        sample = self._sample
+        if sample is not None and sample[0] == self._run - 1:
+            _, task, stack = sample
+        else:
+            task = self._current_task(origin)
+            stack = None
+        self._sample = None
+
+        stall = Stall(repr(origin), task, duration, stack)
+        self._stalls += 1
+        self._stall_time += duration
+        self.stalls.append(stall)
+        if self.on_stall is not None:
+            # Exceptions in a trace function would be raised by the switch
+            try:
+                self.on_stall(stall)
+            except Exception:
+                traceback.print_exc()
+
+    def _current_task(self, current) -> Optional[str]:
+        if current is not getattr(self.loop, "_greenlet", None):
+            return None
+        task = asyncio.current_task(self.loop)
+        return repr(task) if task is not None else None
+
+    def _sample_stalls(self, generation: int):
+        # Runs in a native thread, so that it can look at a greenlet that
+        # doesn't yield
+        while self._running and self._generation == generation:
+            _sleep(self.sample_interval)
+
+            run = self._run
+            current = self._current
+            if time.perf_counter() - self._switched_at < self.threshold:
+                continue
+            sample = self._sample
+            if sample is not None and sample[0] == run:
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None or run != self._run:
+                continue
+            stack = traceback.format_stack(frame)
+            self._sample = (run, self._current_task(current), stack)
+
+    def _schedule_lag_check(self):
+        if self._running:
+            self._lag_handle = self.loop.call_later(self.lag_interval, self._check_lag, self.loop.time())
+
+    def _check_lag(self, scheduled_at: float):
+        lag = max(0.0, self.loop.time() - scheduled_at - self.lag_interval)
+        self._loop_lag = lag
+        if lag > self._max_loop_lag:
+            self._max_loop_lag = lag
+        self._schedule_lag_check()
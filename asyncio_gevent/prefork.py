@@ -0,0 +1,243 @@
+import asyncio
+import os
+import signal
+import socket
+import sys
+import time
+import traceback
+from typing import Any
+from typing import Callable
+from typing import Coroutine
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+import gevent
+import gevent.event
+import gevent.os
+
+from ._loop_helpers import call_soon_from_greenlet
+from .background_loop import _reinit_background_loop_after_fork
+from .event_loop import EventLoop
+
+__all__ = ["PreforkServer"]
+
+
+class _Worker:
+    __slots__ = ("index", "pid", "watcher")
+
+    def __init__(self, index: int, pid: int, watcher):
+        self.index = index
+        self.pid = pid
+        self.watcher = watcher
+
+
+class PreforkServer:
+    """
+    Run an asyncio server in `workers` forked processes that share the same listening sockets.
+
+    The supervisor process binds the `addresses` once and forks the workers. Each worker reinitializes gevent's hub,
+    forgets the asyncio loop state of the supervisor, replaces a running background loop with a new one and then
+    runs `main(sockets, index)` on a new loop created by `loop_factory`. `index` is the number of the worker, from 0
+    to `workers - 1`.
+
+    By default, the workers accept connections from the listening sockets of the supervisor. With `reuse_port=True`,
+    every worker binds and listens on sockets of its own with `SO_REUSEPORT` instead, so that the kernel balances
+    the connections between them. The supervisor then only binds its sockets to reserve the addresses. Connections
+    that are queued on the sockets of a worker when it exits are reset.
+
+    A worker that exits is replaced after `restart_delay` seconds. The supervisor stops when it receives `SIGINT`
+    or `SIGTERM`, or when `stop` is called. It then sends `SIGTERM` to the workers, which cancels their `main`
+    coroutine, and kills the workers that haven't exited after `shutdown_timeout` seconds.
+
+    ```py
+    async def main(sockets, index):
+        server = await asyncio.start_server(handle_connection, sock=sockets[0])
+        async with server:
+            await server.serve_forever()
+
+
+    asyncio_gevent.PreforkServer(main, [("0.0.0.0", 8000)], workers=4).run()
+    ```
+
+    `run` should be called before other greenlets are spawned, because every greenlet that exists when a worker is
+    forked also exists in the worker.
+    """
+
+    def __init__(
+        self,
+        main: Callable[[List[socket.socket], int], Coroutine],
+        addresses: Sequence[Tuple[str, int]],
+        workers: Optional[int] = None,
+        reuse_port: bool = False,
+        loop_factory: Callable[[], asyncio.AbstractEventLoop] = EventLoop,
+        backlog: int = 128,
+        restart_delay: float = 0.1,
+        shutdown_timeout: float = 10.0,
+    ):
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if reuse_port and not hasattr(socket, "SO_REUSEPORT"):
+            raise ValueError("SO_REUSEPORT is not supported on this platform")
+
+        self.main = main
+        self.addresses = list(addresses)
+        self.workers = workers
+        self.reuse_port = reuse_port
+        self.loop_factory = loop_factory
+        self.backlog = backlog
+        self.restart_delay = restart_delay
+        self.shutdown_timeout = shutdown_timeout
+        self.sockets: List[socket.socket] = []
+        self.restarts = 0
+        self._workers: Dict[int, _Worker] = {}
+        self._changed = gevent.event.Event()
+        self._stopping = False
+        self._signal_handlers: List[Any] = []
+
+    @property
+    def pids(self) -> List[int]:
+        """
+        The process ids of the running workers, ordered by their index
+        """
+        return [worker.pid for worker in sorted(self._workers.values(), key=lambda worker: worker.index)]
+
+    def run(self):
+        """
+        Bind the sockets, fork the workers and supervise them until the server is stopped.
+        """
+        self._stopping = False
+        self.sockets = [self._bind(address, listen=not self.reuse_port) for address in self.addresses]
+        self._signal_handlers = [
+            gevent.signal_handler(signal.SIGTERM, self.stop),
+            gevent.signal_handler(signal.SIGINT, self.stop),
+        ]
+
+        try:
+            for index in range(self.workers):
+                self._fork(index)
+
+            while not self._stopping:
+                self._changed.wait()
+                self._changed.clear()
+
+                missing = set(range(self.workers)) - {worker.index for worker in self._workers.values()}
+                if missing and not self._stopping:
+                    gevent.sleep(self.restart_delay)
+                for index in sorted(missing):
+                    if self._stopping:
+                        break
+                    self.restarts += 1
+                    self._fork(index)
+        finally:
+            for handler in self._signal_handlers:
+                handler.cancel()
+            self._signal_handlers = []
+            self._shutdown()
+            for sock in self.sockets:
+                sock.close()
+
+    def stop(self):
+        """
+        Stop the workers and return from `run`.
+        """
+        self._stopping = True
+        self._changed.set()
+
+    def _bind(self, address: Tuple[str, int], listen: bool) -> socket.socket:
+        host, port = address
+        family, sock_type, proto, _, sockaddr = socket.getaddrinfo(
+            host, port, 0, socket.SOCK_STREAM, 0, socket.AI_PASSIVE
+        )[0]
+        sock = socket.socket(family, sock_type, proto)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind(sockaddr)
+            if listen:
+                sock.listen(self.backlog)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def _fork(self, index: int):
+        pid = gevent.os.fork_gevent()
+        if pid == 0:
+            self._run_worker(index)
+
+        watcher = gevent.get_hub().loop.child(pid, False)
+        worker = _Worker(index, pid, watcher)
+        watcher.start(self._on_exit, worker)
+        self._workers[pid] = worker
+
+    def _on_exit(self, worker: _Worker):
+        # Runs in the hub when a worker exited
+        worker.watcher.stop()
+        self._workers.pop(worker.pid, None)
+        self._changed.set()
+
+    def _shutdown(self):
+        deadline = time.monotonic() + self.shutdown_timeout
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            for worker in list(self._workers.values()):
+                try:
+                    os.kill(worker.pid, sig)
+                except ProcessLookupError:
+                    pass
+            while self._workers:
+                remaining = deadline - time.monotonic()
+                if sig == signal.SIGTERM and remaining <= 0:
+                    break
+                self._changed.clear()
+                self._changed.wait(remaining if sig == signal.SIGTERM else None)
+
+    def _run_worker(self, index: int):
+        # Runs in the forked child, after `fork_gevent` reinitialized the hub,
+        # and never returns
+        status = 0
+        try:
+            self._reinit_after_fork()
+            sockets = self.sockets
+            if self.reuse_port:
+                sockets = [self._bind(sock.getsockname()[:2], listen=True) for sock in self.sockets]
+
+            loop = self.loop_factory()
+            asyncio.set_event_loop(loop)
+            task = loop.create_task(self.main(sockets, index))
+            handler = gevent.signal_handler(signal.SIGTERM, call_soon_from_greenlet, loop, task.cancel)
+            try:
+                loop.run_until_complete(task)
+            except asyncio.CancelledError:
+                pass
+            finally:
+                handler.cancel()
+                loop.close()
+        except BaseException:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)
+
+    def _reinit_after_fork(self):
+        # The signal handlers and child watchers of the supervisor have been
+        # copied into the child along with the hub
+        for handler in self._signal_handlers:
+            handler.cancel()
+        for worker in self._workers.values():
+            worker.watcher.stop()
+        self._workers = {}
+        # Ctrl-C reaches the whole process group, but the workers are stopped
+        # by the supervisor
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+        asyncio._set_running_loop(None)
+        asyncio.set_event_loop(None)
+        _reinit_background_loop_after_fork()
@@ -0,0 +1,161 @@
+import asyncio
+import collections
+from typing import Any
+from typing import AsyncIterator
+from typing import Deque
+from typing import Iterable
+from typing import Optional
+
+import gevent
+import gevent.event
+
+from ._loop_helpers import call_soon_from_greenlet
+from .greenlet_to_future import _dead_greenlet_result
+from .greenlet_to_future import _greenlet_to_future
+
+__all__ = ["sync_iter_to_async"]
+
+
+class _SyncIterBridge:
+    """
+    The state of one `sync_iter_to_async` stream.
+
+    A greenlet iterates the iterable ahead of the consumer into a buffer and pauses while the buffer holds `prefetch`
+    items. The consuming task is woken once for all the items that were buffered since it started waiting, takes up to
+    `batch` items out of the buffer at a time and hands them out one at a time. The greenlet and the loop run in the
+    same thread, so the buffer doesn't need a lock.
+    """
+
+    def __init__(self, iterable: Iterable, prefetch: int, batch: int):
+        self.iterable = iterable
+        self.prefetch = prefetch
+        self.batch = batch
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.greenlet: Optional[gevent.Greenlet] = None
+        self.items: Deque[Any] = collections.deque()
+        self.buffer: Deque[Any] = collections.deque()
+        self.readable: Optional[asyncio.Future] = None
+        self.wakeup_pending = False
+        self.writable = gevent.event.Event()
+        self.done = False
+
+    def __aiter__(self) -> "_SyncIterBridge":
+        return self
+
+    async def __anext__(self):
+        items = self.items
+        if not items:
+            await self._fetch()
+        return items.popleft()
+
+    async def __aenter__(self) -> "_SyncIterBridge":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """
+        Stop iterating, kill the greenlet that iterates ahead and close the iterable.
+        """
+        if self.done:
+            return
+        self.done = True
+        greenlet = self.greenlet
+        if greenlet is not None and not greenlet.dead:
+            greenlet.kill(block=False)
+            await _greenlet_to_future(greenlet, False, False, False, self.loop, False, None)
+
+    async def _fetch(self):
+        if self.done:
+            raise StopAsyncIteration
+
+        greenlet = self.greenlet
+        if greenlet is None:
+            self.loop = asyncio.get_running_loop()
+            greenlet = self.greenlet = gevent.Greenlet(self._produce)
+            greenlet.rawlink(self._on_producer_dead)
+            greenlet.start()
+
+        buffer = self.buffer
+        try:
+            while not buffer and not greenlet.dead:
+                self.readable = self.loop.create_future()
+                try:
+                    await self.readable
+                finally:
+                    self.readable = None
+        except BaseException:
+            # The consuming task was cancelled
+            self.done = True
+            greenlet.kill(block=False)
+            raise
+
+        if buffer:
+            self.items.extend([buffer.popleft() for _ in range(min(self.batch, len(buffer)))])
+            if len(buffer) < self.prefetch:
+                self.writable.set()
+            return
+
+        self.done = True
+        # Raises the exception of the greenlet, or `CancelledError` if it was
+        # killed, like awaiting `greenlet_to_future` would
+        _dead_greenlet_result(greenlet, True)
+        raise StopAsyncIteration
+
+    def _wake_consumer(self):
+        # Runs in the producing greenlet or the hub
+        if self.readable is not None and not self.wakeup_pending:
+            self.wakeup_pending = True
+            call_soon_from_greenlet(self.loop, self._on_wakeup)
+
+    def _on_wakeup(self):
+        self.wakeup_pending = False
+        readable = self.readable
+        if readable is not None and not readable.done():
+            readable.set_result(None)
+
+    def _on_producer_dead(self, greenlet: gevent.Greenlet):
+        self._wake_consumer()
+
+    def _produce(self):
+        iterator = iter(self.iterable)
+        buffer = self.buffer
+        writable = self.writable
+        try:
+            for item in iterator:
+                buffer.append(item)
+                self._wake_consumer()
+                while len(buffer) >= self.prefetch:
+                    writable.clear()
+                    writable.wait()
+        finally:
+            # The generator is suspended at a `yield` if the greenlet was
+            # killed while the buffer was full
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+
+def sync_iter_to_async(iterable: Iterable, prefetch: int = 64, batch: int = 16) -> AsyncIterator:
+    """
+    Wrap an iterable, e.g. a generator that may block on gevent, in an async iterator.
+
+    The iterable is iterated by a greenlet that runs ahead of the consumer into a buffer of at most `prefetch` items
+    and pauses while the buffer is full. The consuming task is woken up once for all the items that the greenlet
+    buffered in the meantime, takes up to `batch` items at a time and doesn't wait at all while it has items left
+    over from the previous batch.
+
+    Exceptions raised by the iterable are raised by the async iterator after the items that were produced before.
+
+    If the consuming task is cancelled while it waits for items, the greenlet is killed and the iterable is closed.
+    Breaking out of the iteration early should be followed by `aclose()`, or the async iterator can be used as an
+    async context manager. If the greenlet gets killed, the async iterator raises `CancelledError` like
+    `greenlet_to_future`.
+    """
+    if prefetch < 1:
+        raise ValueError("prefetch must be at least 1")
+    if batch < 1:
+        raise ValueError("batch must be at least 1")
+
+    return _SyncIterBridge(iterable, prefetch, batch)
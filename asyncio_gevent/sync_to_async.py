@@ -3,7 +3,69 @@ from typing import Optional
 
 import gevent
 
-from .greenlet_to_future import greenlet_to_future
+from .greenlet_pool import GreenletPool
+from .greenlet_to_future import _dead_greenlet_result
+from .greenlet_to_future import _greenlet_to_future
+from .greenlet_to_future import _start_eagerly
+from .instrumentation import _Crossing
+from .instrumentation import _observers
+
+
+def _pooled_coroutine_function(
+    fn: Callable, pool: GreenletPool, autocancel_future: bool, autokill_greenlet: bool
+) -> Callable:
+    async def pooled_coroutine(*args, **kwargs):
+        if not _observers:
+            return await pool.submit(
+                fn,
+                args,
+                kwargs,
+                autocancel_future=autocancel_future,
+                autokill_greenlet=autokill_greenlet,
+            )
+
+        crossing = _Crossing("sync_to_async")
+        future = pool.submit(
+            crossing.call,
+            (fn, *args),
+            kwargs,
+            autocancel_future=autocancel_future,
+            autokill_greenlet=autokill_greenlet,
+        )
+        future.add_done_callback(crossing)
+        return await future
+
+    pooled_coroutine.pool = pool  # type: ignore
+    return pooled_coroutine
+
+
+def _coroutine_function(
+    fn: Callable, autocancel_future: bool, autostart_greenlet: bool, autokill_greenlet: bool, eager: bool
+) -> Callable:
+    async def coroutine(*args, **kwargs):
+        if _observers:
+            crossing = _Crossing("sync_to_async")
+            greenlet = gevent.Greenlet(crossing.call, fn, *args, **kwargs)
+        else:
+            crossing = None
+            greenlet = gevent.Greenlet(fn, *args, **kwargs)
+        if eager and autostart_greenlet:
+            _start_eagerly(greenlet)
+            if greenlet.dead:
+                if crossing is not None:
+                    crossing.finish_greenlet(greenlet)
+                return _dead_greenlet_result(greenlet, autocancel_future)
+        return await _greenlet_to_future(
+            greenlet,
+            autocancel_future,
+            autostart_greenlet,
+            autokill_greenlet,
+            None,
+            False,
+            crossing,
+        )
+
+    return coroutine
 
 
 def sync_to_async(
@@ -11,12 +73,23 @@ def sync_to_async(
     autocancel_future: bool = True,
     autostart_greenlet: bool = True,
     autokill_greenlet: bool = True,
+    pool: Optional[GreenletPool] = None,
+    max_concurrency: Optional[int] = None,
+    eager: bool = False,
 ) -> Callable:
     """
     Convert a synchronous/blocking function to an asynchronous one.
 
     This wraps the blocking function `fn` (that may spawn greenlets) in a coroutine function that spawns a greenlet to
     execute `fn` and returns when the greenlet is dead.
+
+    If a `pool` is passed, `fn` runs on one of the pool's worker greenlets instead of a new greenlet. Passing
+    `max_concurrency` creates a `GreenletPool` of that size for the wrapped function, so that at most `max_concurrency`
+    calls run at the same time and the rest wait in a FIFO queue.
+
+    With `eager=True`, the greenlet is switched to as soon as the coroutine starts, instead of being scheduled on the
+    hub. If `fn` returns without blocking, the coroutine returns its result without creating a future. Eager calls
+    can't be combined with a pool.
     """
     if fn is None:
 
@@ -26,16 +99,20 @@ def sync_to_async(
                 autocancel_future=autocancel_future,
                 autostart_greenlet=autostart_greenlet,
                 autokill_greenlet=autokill_greenlet,
+                pool=pool,
+                max_concurrency=max_concurrency,
+                eager=eager,
             )
 
         return decorator
 
-    async def coroutine(*args, **kwargs):
-        return await greenlet_to_future(
-            gevent.Greenlet(fn, *args, **kwargs),
-            autocancel_future=autocancel_future,
-            autostart_greenlet=autostart_greenlet,
-            autokill_greenlet=autokill_greenlet,
-        )
+    if eager and (pool is not None or max_concurrency is not None):
+        raise ValueError("eager can't be combined with pool or max_concurrency")
 
-    return coroutine
+    if pool is None and max_concurrency is not None:
+        pool = GreenletPool(max_concurrency)
+
+    if pool is not None:
+        return _pooled_coroutine_function(fn, pool, autocancel_future, autokill_greenlet)
+
+    return _coroutine_function(fn, autocancel_future, autostart_greenlet, autokill_greenlet, eager)
@@ -0,0 +1,80 @@
+import asyncio
+from typing import Iterable
+from typing import List
+from typing import Optional
+
+import gevent.event
+
+__all__ = ["wait_futures"]
+
+
+class _FutureWaiter:
+    """
+    The shared completion dispatcher of one `wait_futures` call.
+
+    It is added as a done callback to every future of the batch and collects
+    them in the loop. The waiting greenlet is only woken up once, when enough
+    futures are done.
+    """
+
+    def __init__(self, count: int):
+        self.count = count
+        self.done: List[asyncio.Future] = []
+        self.event = gevent.event.Event()
+
+    def __call__(self, future: asyncio.Future):
+        self.done.append(future)
+        if len(self.done) == self.count:
+            self.event.set()
+
+
+def wait_futures(
+    futures: Iterable[asyncio.Future],
+    timeout: Optional[float] = None,
+    count: Optional[int] = None,
+) -> List[asyncio.Future]:
+    """
+    Block the current greenlet until `count` of `futures` are done, or until
+    `timeout` seconds have passed.
+
+    This is the greenlet-side counterpart of `asyncio.wait` and behaves like
+    `gevent.wait`: it returns the list of done futures, in the order in which
+    they completed. If `count` is `None`, it waits for all of them.
+
+    All futures share one completion dispatcher, so the waiting greenlet is
+    only woken up once instead of once per future. The futures must belong to
+    event loops running in the current thread.
+    """
+    futures = list(dict.fromkeys(futures))
+
+    for future in futures:
+        if not asyncio.isfuture(future):
+            raise TypeError("Expected a future, got %r" % (future,))
+
+    if count is None or count > len(futures):
+        count = len(futures)
+
+    waiter = _FutureWaiter(count)
+    pending = []
+
+    for future in futures:
+        if future.done():
+            waiter.done.append(future)
+        else:
+            pending.append(future)
+
+    if len(waiter.done) >= count:
+        return waiter.done[:count]
+
+    for future in pending:
+        future.add_done_callback(waiter)
+
+    try:
+        waiter.event.wait(timeout)
+    finally:
+        for future in pending:
+            future.remove_done_callback(waiter)
+
+    # Callbacks that the loop has already scheduled can't be removed anymore
+    # and may still append to the list, so a copy is returned
+    return waiter.done[:count]
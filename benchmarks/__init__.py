@@ -0,0 +1,6 @@
+"""
+Benchmarks for asyncio-gevent.
+
+Each module can be run on its own, e.g. `python -m benchmarks.greenlet_to_future`. `python -m benchmarks.suite` runs
+the main workloads on every runtime and writes the results as JSON.
+"""
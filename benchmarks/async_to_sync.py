@@ -0,0 +1,96 @@
+"""
+Measure the per-call cost of `async_to_sync` from plain gevent code, i.e. without a running event loop.
+
+Compares creating a new event loop for every call with submitting every call to the shared background loop started
+with `asyncio_gevent.start_background_loop`. The threadpool modes make the same calls from 4 threads of the gevent
+threadpool, which don't have a hub of their own.
+
+Usage: python -m benchmarks.async_to_sync [--modes ...] [-n 10000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+@asyncio_gevent.async_to_sync
+async def noop():
+    pass
+
+
+def bench(n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        noop()
+    return (time.perf_counter() - start) / n
+
+
+def bench_new_loop(n: int) -> float:
+    return bench(n)
+
+
+def bench_background_loop(n: int) -> float:
+    asyncio_gevent.start_background_loop()
+    try:
+        return bench(n)
+    finally:
+        asyncio_gevent.stop_background_loop()
+
+
+def _calls(n: int):
+    for _ in range(n):
+        noop()
+
+
+def bench_threadpool(n: int, threads: int = 4) -> float:
+    threadpool = gevent.get_hub().threadpool
+    threadpool.maxsize = threads
+    start = time.perf_counter()
+    gevent.joinall([threadpool.spawn(_calls, n // threads) for _ in range(threads)], raise_error=True)
+    return (time.perf_counter() - start) / n
+
+
+def bench_threadpool_new_loop(n: int) -> float:
+    return bench_threadpool(n)
+
+
+def bench_threadpool_background_loop(n: int) -> float:
+    asyncio_gevent.start_background_loop()
+    try:
+        return bench_threadpool(n)
+    finally:
+        asyncio_gevent.stop_background_loop()
+
+
+MODES = {
+    "new_loop": bench_new_loop,
+    "background_loop": bench_background_loop,
+    "threadpool_new_loop": bench_threadpool_new_loop,
+    "threadpool_background_loop": bench_threadpool_background_loop,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("-n", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<28}{'us/call':>10}{'calls/s':>12}")
+    for mode in args.modes:
+        seconds = MODES[mode](args.n)
+        print(f"{mode:<28}{seconds * 1e6:>10.1f}{1 / seconds:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
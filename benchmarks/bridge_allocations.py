@@ -0,0 +1,107 @@
+"""
+Measure the allocations of `greenlet_to_future` and `future_to_greenlet` crossings.
+
+Directions:
+
+- greenlet_to_future: N greenlets awaited as futures on an `asyncio_gevent.EventLoop`
+- future_to_greenlet: N asyncio futures waited for by greenlets
+
+Reported per crossing: the memory blocks and bytes that are allocated and still alive while all N crossings are in
+flight (traced with `tracemalloc`), and the throughput of N concurrent round trips without tracing.
+
+Usage: python -m benchmarks.bridge_allocations [--directions ...] [-n 10000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+from typing import Callable  # noqa: E402
+from typing import Optional  # noqa: E402
+
+import gevent  # noqa: E402
+import gevent.event  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+
+async def _greenlet_to_future(n: int, in_flight: Callable[[], None]):
+    release = gevent.event.Event()
+    futures = [asyncio_gevent.greenlet_to_future(gevent.Greenlet(release.wait)) for _ in range(n)]
+    # Let all greenlets start waiting
+    await asyncio.sleep(0.001)
+    in_flight()
+    release.set()
+    await asyncio.gather(*futures)
+
+
+async def _future_to_greenlet(n: int, in_flight: Callable[[], None]):
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in range(n)]
+    greenlets = [asyncio_gevent.future_to_greenlet(future, loop=loop) for future in futures]
+    for greenlet in greenlets:
+        greenlet.start()
+    # Let all greenlets start waiting
+    await asyncio.sleep(0.001)
+    in_flight()
+    for future in futures:
+        future.set_result(None)
+    await asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.joinall, greenlets))
+
+
+DIRECTIONS = {
+    "greenlet_to_future": _greenlet_to_future,
+    "future_to_greenlet": _future_to_greenlet,
+}
+
+
+def run(direction: str, n: int, in_flight: Callable[[], None]) -> float:
+    loop = asyncio_gevent.EventLoop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(DIRECTIONS[direction](n, in_flight))
+        return time.perf_counter() - start
+    finally:
+        loop.close()
+
+
+def bench(direction: str, n: int):
+    snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def take_snapshot():
+        nonlocal snapshot
+        snapshot = tracemalloc.take_snapshot()
+
+    tracemalloc.start()
+    try:
+        run(direction, n, take_snapshot)
+    finally:
+        tracemalloc.stop()
+
+    assert snapshot is not None
+    traces = snapshot.traces
+    blocks = len(traces)
+    size = sum(trace.size for trace in traces)
+
+    elapsed = run(direction, n, lambda: None)
+    return blocks / n, size / n, n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directions", nargs="+", default=list(DIRECTIONS), choices=list(DIRECTIONS))
+    parser.add_argument("-n", type=int, default=10000)
+    args = parser.parse_args()
+
+    print(f"{'direction':<20}{'blocks/crossing':>17}{'bytes/crossing':>16}{'crossings/s':>13}")
+    for direction in args.directions:
+        blocks, size, rate = bench(direction, args.n)
+        print(f"{direction:<20}{blocks:>17.1f}{size:>16.0f}{rate:>13.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Compare fanning out many items across the bridges one by one with the bulk APIs.
+
+- gather: N greenlets awaited by a coroutine, with `asyncio.gather` over `greenlet_to_future` and with
+  `gather_greenlets`. Also counts how often the asyncio loop is woken up from gevent.
+- wait: N futures waited for by a greenlet, with `future_to_greenlet` and `gevent.joinall` and with `wait_futures`.
+
+Usage: python -m benchmarks.bulk_bridging [--sizes 1000 10000 100000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+
+class WakeupCounter:
+    def __init__(self, loop: asyncio_gevent.EventLoop):
+        self.count = 0
+        wakeup = loop._wakeup
+
+        def counting_wakeup():
+            self.count += 1
+            wakeup()
+
+        loop._wakeup = counting_wakeup  # type: ignore
+
+
+def work():
+    gevent.sleep(0)
+    return 1
+
+
+async def gather_one_by_one(n: int):
+    await asyncio.gather(*(asyncio_gevent.greenlet_to_future(gevent.spawn(work)) for _ in range(n)))
+
+
+async def gather_bulk(n: int):
+    await asyncio_gevent.gather_greenlets([gevent.spawn(work) for _ in range(n)])
+
+
+async def wait_one_by_one(n: int):
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in range(n)]
+
+    def waiter():
+        greenlets = [asyncio_gevent.future_to_greenlet(future) for future in futures]
+        for greenlet in greenlets:
+            greenlet.start()
+        gevent.joinall(greenlets)
+
+    greenlet = gevent.spawn(waiter)
+    await asyncio.sleep(0.01)
+    for future in futures:
+        future.set_result(1)
+    await asyncio_gevent.greenlet_to_future(greenlet)
+
+
+async def wait_bulk(n: int):
+    loop = asyncio.get_running_loop()
+    futures = [loop.create_future() for _ in range(n)]
+    greenlet = gevent.spawn(asyncio_gevent.wait_futures, futures)
+    await asyncio.sleep(0.01)
+    for future in futures:
+        future.set_result(1)
+    await asyncio_gevent.greenlet_to_future(greenlet)
+
+
+WORKLOADS = {
+    "gather/one_by_one": gather_one_by_one,
+    "gather/bulk": gather_bulk,
+    "wait/one_by_one": wait_one_by_one,
+    "wait/bulk": wait_bulk,
+}
+
+
+def bench(workload: str, n: int):
+    loop = asyncio_gevent.EventLoop()
+    counter = WakeupCounter(loop)
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(WORKLOADS[workload](n))
+        return n / (time.perf_counter() - start), counter.count
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    args = parser.parse_args()
+
+    print(f"{'workload':<20}{'n':>8}{'items/s':>12}{'loop wakeups':>14}")
+    for n in args.sizes:
+        for workload in args.workloads:
+            items_per_second, wakeups = bench(workload, n)
+            print(f"{workload:<20}{n:>8}{items_per_second:>12.0f}{wakeups:>14}")
+
+
+if __name__ == "__main__":
+    main()
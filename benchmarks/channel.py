@@ -0,0 +1,112 @@
+"""
+Measure the throughput of handing items between greenlets and coroutines.
+
+Directions:
+
+- greenlet_to_coroutine: a greenlet puts N items, a coroutine gets them
+- coroutine_to_greenlet: a coroutine puts N items, a greenlet gets them
+
+Modes:
+
+- bridge: a `gevent.queue.Queue` read with `greenlet_to_future` per item, or an `asyncio.Queue` read with
+  `async_to_sync` per item
+- channel: `asyncio_gevent.Channel`, one item per get
+- channel_batched: `asyncio_gevent.Channel`, up to 64 items per get with `get_many`/`aget_many`
+
+All queues hold at most `--maxsize` items. Reports items/s.
+
+Usage: python -m benchmarks.channel [-n 100000] [--maxsize 256] [--modes bridge channel channel_batched]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+import gevent.queue  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+MODES = ["bridge", "channel", "channel_batched"]
+BATCH = 64
+
+
+async def greenlet_to_coroutine(mode: str, n: int, maxsize: int):
+    if mode == "bridge":
+        bridge_queue = gevent.queue.Queue(maxsize)
+        producer = gevent.spawn(lambda: [bridge_queue.put(i) for i in range(n)])
+        for _ in range(n):
+            await asyncio_gevent.greenlet_to_future(gevent.spawn(bridge_queue.get))
+    else:
+        channel = asyncio_gevent.Channel(maxsize)
+        producer = gevent.spawn(channel.put_many, range(n))
+        received = 0
+        while received < n:
+            if mode == "channel_batched":
+                received += len(await channel.aget_many(BATCH))
+            else:
+                await channel.aget()
+                received += 1
+    producer.join()
+
+
+async def coroutine_to_greenlet(mode: str, n: int, maxsize: int):
+    if mode == "bridge":
+        bridge_queue: asyncio.Queue = asyncio.Queue(maxsize)
+        get = asyncio_gevent.async_to_sync(bridge_queue.get)
+        consumer = gevent.spawn(lambda: [get() for _ in range(n)])
+        for i in range(n):
+            await bridge_queue.put(i)
+    else:
+        channel = asyncio_gevent.Channel(maxsize)
+
+        def consume():
+            received = 0
+            while received < n:
+                if mode == "channel_batched":
+                    received += len(channel.get_many(BATCH))
+                else:
+                    channel.get()
+                    received += 1
+
+        consumer = gevent.spawn(consume)
+        await channel.aput_many(range(n))
+    await asyncio_gevent.greenlet_to_future(consumer)
+
+
+DIRECTIONS = {
+    "greenlet_to_coroutine": greenlet_to_coroutine,
+    "coroutine_to_greenlet": coroutine_to_greenlet,
+}
+
+
+def bench(direction: str, mode: str, n: int, maxsize: int) -> float:
+    start = time.perf_counter()
+    asyncio.run(DIRECTIONS[direction](mode, n, maxsize))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directions", nargs="+", default=list(DIRECTIONS), choices=list(DIRECTIONS))
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("--maxsize", type=int, default=256)
+    args = parser.parse_args()
+
+    asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+    print(f"{'direction':<23}{'mode':<17}{'items/s':>12}")
+    for direction in args.directions:
+        for mode in args.modes:
+            # The bridged modes are much slower, so they hand over fewer items
+            n = args.n // 10 if mode == "bridge" else args.n
+            print(f"{direction:<23}{mode:<17}{bench(direction, mode, n, args.maxsize):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
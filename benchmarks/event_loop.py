@@ -0,0 +1,138 @@
+"""
+Run the same workloads on `asyncio_gevent.EventLoop` and `asyncio_gevent.HubEventLoop`.
+
+Workloads:
+
+- call_soon: chains of `call_soon` callbacks (callbacks/s)
+- call_later: many concurrent short `call_later` timers (timers/s)
+- sleep0: `await asyncio.sleep(0)` loop iterations (iterations/s)
+- ping_pong: round trips over a socket pair with `sock_sendall`/`sock_recv` (round trips/s)
+- wakeup: callbacks scheduled from another greenlet with `call_soon_from_greenlet` (wakeups/s)
+
+Usage: python -m benchmarks.event_loop [--loops EventLoop HubEventLoop] [--workloads ...] [-n 100000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import socket  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+LOOPS = {
+    "EventLoop": asyncio_gevent.EventLoop,
+    "HubEventLoop": asyncio_gevent.HubEventLoop,
+}
+
+
+async def call_soon(n: int):
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    remaining = [n]
+
+    def callback():
+        remaining[0] -= 1
+        if remaining[0]:
+            loop.call_soon(callback)
+        else:
+            done.set_result(None)
+
+    # A few independent chains, so that each iteration runs more than one callback
+    for _ in range(10):
+        loop.call_soon(callback)
+    await done
+
+
+async def call_later(n: int):
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    remaining = [n]
+
+    def callback():
+        remaining[0] -= 1
+        if not remaining[0]:
+            done.set_result(None)
+
+    for i in range(n):
+        loop.call_later(0.001 * (i % 10), callback)
+    await done
+
+
+async def sleep0(n: int):
+    for _ in range(n):
+        await asyncio.sleep(0)
+
+
+async def ping_pong(n: int):
+    loop = asyncio.get_running_loop()
+    a, b = socket.socketpair()
+    a.setblocking(False)
+    b.setblocking(False)
+
+    async def echo():
+        for _ in range(n):
+            await loop.sock_sendall(b, await loop.sock_recv(b, 1))
+
+    task = loop.create_task(echo())
+    try:
+        for _ in range(n):
+            await loop.sock_sendall(a, b"x")
+            await loop.sock_recv(a, 1)
+        await task
+    finally:
+        a.close()
+        b.close()
+
+
+async def wakeup(n: int):
+    loop = asyncio.get_running_loop()
+
+    def producer():
+        for _ in range(n):
+            future = loop.create_future()
+            loop.call_soon_from_greenlet(future.set_result, None)
+            gevent.sleep(0)
+
+    await asyncio_gevent.greenlet_to_future(gevent.spawn(producer))
+
+
+WORKLOADS = {
+    "call_soon": call_soon,
+    "call_later": call_later,
+    "sleep0": sleep0,
+    "ping_pong": ping_pong,
+    "wakeup": wakeup,
+}
+
+
+def bench(loop_name: str, workload: str, n: int) -> float:
+    loop = LOOPS[loop_name]()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(WORKLOADS[workload](n))
+        return n / (time.perf_counter() - start)
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loops", nargs="+", default=list(LOOPS), choices=list(LOOPS))
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("-n", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'workload':<12}{'loop':<16}{'ops/s':>14}")
+    for workload in args.workloads:
+        for loop_name in args.loops:
+            print(f"{workload:<12}{loop_name:<16}{bench(loop_name, workload, args.n):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
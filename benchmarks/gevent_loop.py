@@ -0,0 +1,298 @@
+"""
+Run gevent workloads on the libev loop and on `asyncio_gevent.gevent_loop.GeventLoop`.
+
+The gevent loop can only be chosen before the hub is created, so every
+measurement runs in a fresh subprocess. For the asyncio based loops, the
+writes to the asyncio loop's self-pipe (one syscall each), the asyncio timer
+handles created (one heap push each) and the selector registrations and
+modifications (one epoll_ctl each) are counted too.
+
+Loops:
+
+- libev: gevent's default loop
+- GeventLoop: gevent running on an asyncio event loop
+- GeventLoop-per-handle: `GeventLoop` with one asyncio handle and one loop
+  reference per callback, for comparison with the batched callback queue
+- GeventLoop-wheel: `GeventLoop` with a timer slack of 10ms
+- GeventLoop-per-send: `GeventLoop` waking up the asyncio loop for every
+  send of an async watcher, for comparison with the coalesced sends
+
+Workloads:
+
+- sleep0: `gevent.sleep(0)` loop iterations (iterations/s)
+- sleep: `gevent.sleep` with a tiny timeout, so that every iteration waits on
+  a timer (iterations/s)
+- spawn: spawning and joining greenlets (greenlets/s)
+- event: ping pong between two greenlets over `gevent.event.Event` (round trips/s)
+- ping_pong: round trips between two greenlets over a `gevent.socket`
+  socket pair (round trips/s)
+- timeout: `gevent.Timeout(1)` started and cancelled again, like around a
+  request that doesn't time out, yielding to the hub every 100 timeouts
+  (timeouts/s)
+- threadpool: functions run on `gevent.threadpool.ThreadPool` in bursts of
+  100, whose results are sent back with async watchers (functions/s)
+
+Usage: python -m benchmarks.gevent_loop [--loops ...] [--workloads ...] [-n 100000]
+
+The timeout churn is usually measured with more timeouts, e.g.
+`python -m benchmarks.gevent_loop --workloads timeout -n 1000000`.
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from typing import Tuple
+
+from asyncio_gevent.gevent_loop import AsyncWatcher
+from asyncio_gevent.gevent_loop import Callback
+from asyncio_gevent.gevent_loop import GeventLoop
+
+LOOPS = {
+    "libev": None,
+    "GeventLoop": "asyncio_gevent.gevent_loop.GeventLoop",
+    "GeventLoop-per-handle": "benchmarks.gevent_loop.PerHandleGeventLoop",
+    "GeventLoop-wheel": "benchmarks.gevent_loop.WheelGeventLoop",
+    "GeventLoop-per-send": "benchmarks.gevent_loop.PerSendGeventLoop",
+}
+
+
+class PerHandleGeventLoop(GeventLoop):
+    """
+    `GeventLoop` scheduling every callback as its own asyncio handle
+    """
+
+    def run_callback(self, func, *args):
+        callback = Callback(self, func, args)
+        self.increase_ref()
+
+        def run():
+            try:
+                callback.run()
+            finally:
+                self.decrease_ref()
+
+        self.aio.call_soon(run)
+        return callback
+
+
+class WheelGeventLoop(GeventLoop):
+    """
+    `GeventLoop` with coarse timers
+    """
+
+    def __init__(self, flags=None, default=None):
+        super().__init__(flags, default, timer_slack=0.01)
+
+
+class PerSendAsyncWatcher(AsyncWatcher):
+    """
+    `AsyncWatcher` waking up the asyncio loop for every send
+    """
+
+    __slots__ = ()
+
+    def send(self):
+        self.pending = True
+        self.loop.aio.call_soon_threadsafe(self._on_send)
+
+    def _on_send(self):
+        if self.active:
+            self._invoke()
+
+
+class PerSendGeventLoop(GeventLoop):
+    """
+    `GeventLoop` with `PerSendAsyncWatcher`s
+    """
+
+    def async_(self, ref=True, priority=None):
+        return PerSendAsyncWatcher(self, ref)
+
+
+def sleep0(n: int):
+    import gevent
+
+    for _ in range(n):
+        gevent.sleep(0)
+
+
+def sleep(n: int):
+    import gevent
+
+    for _ in range(n):
+        gevent.sleep(0.000001)
+
+
+def spawn(n: int):
+    import gevent
+
+    gevent.joinall([gevent.spawn(int) for _ in range(n)])
+
+
+def event(n: int):
+    import gevent
+    import gevent.event
+
+    ping = gevent.event.Event()
+    pong = gevent.event.Event()
+
+    def ponger():
+        for _ in range(n):
+            ping.wait()
+            ping.clear()
+            pong.set()
+
+    greenlet = gevent.spawn(ponger)
+    for _ in range(n):
+        ping.set()
+        pong.wait()
+        pong.clear()
+    greenlet.join()
+
+
+def ping_pong(n: int):
+    import gevent
+    import gevent.socket
+
+    a, b = gevent.socket.socketpair()
+
+    def echo():
+        for _ in range(n):
+            b.sendall(b.recv(1))
+
+    greenlet = gevent.spawn(echo)
+    for _ in range(n):
+        a.sendall(b"x")
+        a.recv(1)
+    greenlet.join()
+    a.close()
+    b.close()
+
+
+def timeout(n: int):
+    import gevent
+
+    for i in range(n):
+        timeout = gevent.Timeout(1)
+        timeout.start()
+        if i % 100 == 0:
+            gevent.sleep(0)
+        timeout.close()
+
+
+def threadpool(n: int):
+    import gevent.threadpool
+
+    pool = gevent.threadpool.ThreadPool(4)
+    for i in range(0, n, 100):
+        results = [pool.spawn(int) for _ in range(min(100, n - i))]
+        for result in results:
+            result.get()
+    pool.kill()
+
+
+WORKLOADS = {
+    "sleep0": sleep0,
+    "sleep": sleep,
+    "spawn": spawn,
+    "event": event,
+    "ping_pong": ping_pong,
+    "timeout": timeout,
+    "threadpool": threadpool,
+}
+
+
+def count_self_pipe_writes(aio) -> list:
+    writes = [0]
+    write_to_self = aio._write_to_self
+
+    def counting_write_to_self():
+        writes[0] += 1
+        write_to_self()
+
+    aio._write_to_self = counting_write_to_self
+    return writes
+
+
+def count_timer_handles() -> list:
+    created = [0]
+    init = asyncio.TimerHandle.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created[0] += 1
+        init(self, *args, **kwargs)
+
+    asyncio.TimerHandle.__init__ = counting_init
+    return created
+
+
+def count_selector_calls(aio) -> list:
+    calls = [0]
+    selector = aio._selector
+
+    def counting(method):
+        def counting_method(*args, **kwargs):
+            calls[0] += 1
+            return method(*args, **kwargs)
+
+        return counting_method
+
+    for name in ("register", "modify", "unregister"):
+        setattr(selector, name, counting(getattr(selector, name)))
+    return calls
+
+
+def run_worker(loop_name: str, workload: str, n: int):
+    import gevent
+
+    writes = [0]
+    timer_handles = [0]
+    selector_calls = [0]
+    if LOOPS[loop_name] is not None:
+        gevent.config.loop = LOOPS[loop_name]
+        aio = gevent.get_hub().loop.aio
+        writes = count_self_pipe_writes(aio)
+        timer_handles = count_timer_handles()
+        selector_calls = count_selector_calls(aio)
+    gevent.get_hub()
+
+    start = time.perf_counter()
+    WORKLOADS[workload](n)
+    print(n / (time.perf_counter() - start), writes[0], timer_handles[0], selector_calls[0])
+
+
+def bench(loop_name: str, workload: str, n: int) -> Tuple[float, int, int, int]:
+    output = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.gevent_loop", "--worker", loop_name, workload, str(n)],
+        text=True,
+    )
+    rate, writes, timer_handles, selector_calls = output.split()[-4:]
+    return float(rate), int(writes), int(timer_handles), int(selector_calls)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loops", nargs="+", default=list(LOOPS), choices=list(LOOPS))
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("--worker", nargs=3, metavar=("LOOP", "WORKLOAD", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        loop_name, workload, n = args.worker
+        run_worker(loop_name, workload, int(n))
+        return
+
+    print(
+        f"{'workload':<12}{'loop':<24}{'ops/s':>14}{'self-pipe writes':>18}{'timer handles':>15}{'selector calls':>16}"
+    )
+    for workload in args.workloads:
+        for loop_name in args.loops:
+            rate, writes, timer_handles, selector_calls = bench(loop_name, workload, args.n)
+            print(f"{workload:<12}{loop_name:<24}{rate:>14.0f}{writes:>18}{timer_handles:>15}{selector_calls:>16}")
+
+
+if __name__ == "__main__":
+    main()
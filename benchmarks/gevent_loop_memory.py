@@ -0,0 +1,92 @@
+"""
+Measure the memory and garbage collection cost of the watchers and callbacks
+of `asyncio_gevent.gevent_loop.GeventLoop`.
+
+Kinds:
+
+- io: IO watchers that aren't started (like the watchers of idle sockets)
+- timer: started timer watchers, including their asyncio timer handles
+- async: started async watchers
+- callback: callbacks queued with `loop.run_callback`
+
+Reported per kind: the bytes allocated per object, the time of a full
+`gc.collect()` while the objects are alive and the time it takes to free
+them again.
+
+Usage: python -m benchmarks.gevent_loop_memory [--kinds io timer async callback] [-n 200000]
+"""
+
+import argparse
+import gc
+import socket
+import statistics
+import time
+import tracemalloc
+
+from asyncio_gevent.gevent_loop import GeventLoop
+
+KINDS = ["io", "timer", "async", "callback"]
+
+
+def create(loop: GeventLoop, kind: str, n: int, fd: int) -> list:
+    if kind == "io":
+        return [loop.io(fd, 1) for _ in range(n)]
+    if kind == "timer":
+        watchers = [loop.timer(3600) for _ in range(n)]
+        for watcher in watchers:
+            watcher.start(int)
+        return watchers
+    if kind == "async":
+        watchers = [loop.async_() for _ in range(n)]
+        for watcher in watchers:
+            watcher.start(int)
+        return watchers
+    return [loop.run_callback(int) for _ in range(n)]
+
+
+def bench(kind: str, n: int, collections: int):
+    # The loop is driven directly, it doesn't need a hub
+    loop = GeventLoop()
+    a, b = socket.socketpair()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        objects = create(loop, kind, n, a.fileno())
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        pauses = []
+        for _ in range(collections):
+            start = time.perf_counter()
+            gc.collect()
+            pauses.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for obj in objects:
+            obj.stop()
+        del objects
+        gc.collect()
+        free = time.perf_counter() - start
+    finally:
+        loop.aio.close()
+        a.close()
+        b.close()
+
+    return allocated / n, statistics.median(pauses) * 1e3, free * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", nargs="+", default=KINDS, choices=KINDS)
+    parser.add_argument("-n", type=int, default=200000)
+    parser.add_argument("--collections", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'kind':<10}{'bytes/object':>14}{'gc pause ms':>14}{'free ms':>10}")
+    for kind in args.kinds:
+        size, pause, free = bench(kind, args.n, args.collections)
+        print(f"{kind:<10}{size:>14.0f}{pause:>14.2f}{free:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Watch many files with the stat watchers of `asyncio_gevent.gevent_loop.GeventLoop`.
+
+Modes:
+
+- inotify: all watchers share one inotify instance (Linux only)
+- poll: the watchers are polled together every `--interval` seconds
+
+Reported: the time to start a watcher, the number of `stat` calls per second
+while nothing changes and the time it takes to notice that a file changed.
+
+Usage: python -m benchmarks.gevent_loop_stat [--modes inotify poll] [-n 20000] [--changes 10]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+
+from asyncio_gevent.gevent_loop import GeventLoop
+from asyncio_gevent.gevent_loop import stat_watcher
+
+MODES = ["inotify", "poll"]
+
+
+def bench(mode: str, n: int, changes: int, interval: float, idle: float):
+    # The loop is driven directly, it doesn't need a hub to run watchers
+    loop = GeventLoop()
+    loop.use_inotify = mode == "inotify"
+    aio = loop.aio
+    directory = tempfile.mkdtemp()
+    stat = stat_watcher._stat
+    stats = [0]
+
+    def counting_stat(path):
+        stats[0] += 1
+        return stat(path)
+
+    stat_watcher._stat = counting_stat
+    try:
+        paths = [os.path.join(directory, str(i)) for i in range(n)]
+        for path in paths:
+            open(path, "w").close()
+
+        changed = [None]
+
+        def on_change(watcher):
+            if changed[0] is not None and not changed[0].done():
+                changed[0].set_result(watcher.path)
+
+        start = time.perf_counter()
+        watchers = []
+        for path in paths:
+            watcher = loop.stat(path, interval)
+            watcher.start(on_change, watcher)
+            watchers.append(watcher)
+        start_us = (time.perf_counter() - start) / n * 1e6
+
+        stats[0] = 0
+        aio.run_until_complete(asyncio.sleep(idle))
+        stats_per_second = stats[0] / idle
+
+        latencies = []
+        for i in range(changes):
+            path = paths[i * n // changes]
+            changed[0] = aio.create_future()
+            start = time.perf_counter()
+            with open(path, "a") as f:
+                f.write("changed")
+            aio.run_until_complete(changed[0])
+            latencies.append(time.perf_counter() - start)
+
+        for watcher in watchers:
+            watcher.stop()
+    finally:
+        stat_watcher._stat = stat
+        loop.destroy()
+        aio.close()
+        shutil.rmtree(directory)
+
+    return start_us, stats_per_second, sum(latencies) / len(latencies) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("-n", type=int, default=20000)
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--interval", type=float, default=0.5)
+    parser.add_argument("--idle", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'us/start':>10}{'stats/s':>12}{'latency ms':>12}")
+    for mode in args.modes:
+        start_us, stats_per_second, latency = bench(mode, args.n, args.changes, args.interval, args.idle)
+        print(f"{mode:<10}{start_us:>10.2f}{stats_per_second:>12.0f}{latency:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
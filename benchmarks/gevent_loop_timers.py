@@ -0,0 +1,106 @@
+"""
+Run many periodic timers on `asyncio_gevent.gevent_loop.GeventLoop`.
+
+Modes:
+
+- repeat: one repeating timer watcher per timer (`loop.timer(after, repeat)`)
+- recreate: a new one-shot timer watcher per tick, which is what periodic
+  work had to do before timers could repeat
+
+Reported per tick: the time and the number of asyncio timer handles and
+timer watchers allocated. The peak memory traced by `tracemalloc` while the
+timers run is reported as well.
+
+Usage: python -m benchmarks.gevent_loop_timers [--modes repeat recreate] [-n 100000] [--ticks 5]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+from typing import Callable
+
+from asyncio_gevent.gevent_loop import GeventLoop
+from asyncio_gevent.gevent_loop import TimerWatcher
+
+MODES = ["repeat", "recreate"]
+
+
+def count_instances(cls, created: list) -> Callable[[], None]:
+    init = cls.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created[0] += 1
+        init(self, *args, **kwargs)
+
+    def restore():
+        cls.__init__ = init
+
+    cls.__init__ = counting_init
+    return restore
+
+
+def bench(mode: str, n: int, ticks: int, interval: float):
+    # The loop is driven directly, it doesn't need a hub to run timers
+    loop = GeventLoop()
+    aio = loop.aio
+    done = aio.create_future()
+    remaining = [n * ticks]
+    counts = [0] * n
+
+    def tick(i, watcher):
+        counts[i] += 1
+        if counts[i] == ticks:
+            watcher.stop()
+        elif mode == "recreate":
+            watcher.stop()
+            watcher = loop.timer(interval)
+            watcher.start(tick, i, watcher)
+        remaining[0] -= 1
+        if not remaining[0]:
+            done.set_result(None)
+
+    for i in range(n):
+        # Spread the timers over one interval
+        if mode == "repeat":
+            watcher = loop.timer(interval * i / n, interval)
+        else:
+            watcher = loop.timer(interval * i / n)
+        watcher.start(tick, i, watcher)
+
+    handles = [0]
+    watchers = [0]
+    restore_handles = count_instances(asyncio.TimerHandle, handles)
+    restore_watchers = count_instances(TimerWatcher, watchers)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        aio.run_until_complete(done)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        restore_handles()
+        restore_watchers()
+        aio.close()
+
+    total = n * ticks
+    return elapsed / total * 1e6, handles[0] / total, watchers[0] / total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("--ticks", type=int, default=5)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'us/tick':>10}{'handles/tick':>14}{'watchers/tick':>15}{'peak KiB':>12}")
+    for mode in args.modes:
+        us, handles, watchers, peak = bench(mode, args.n, args.ticks, args.interval)
+        print(f"{mode:<10}{us:>10.2f}{handles:>14.2f}{watchers:>15.2f}{peak / 1024:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Measure `greenlet_to_future` throughput with many concurrently bridged greenlets.
+
+Compares the previous implementation, which awaited `greenlet.join` in the default executor, with the current
+link-based implementation.
+
+Usage: python -m benchmarks.greenlet_to_future [--sizes 1000 10000 100000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+from asyncio_gevent.greenlet_to_future import _dead_greenlet_to_future  # noqa: E402
+
+
+async def _executor_greenlet_to_future(greenlet: gevent.Greenlet):
+    # The implementation of `greenlet_to_future` prior to the link-based one
+    if not greenlet:
+        greenlet.start()
+
+    future: asyncio.Future = asyncio.Future()
+
+    if greenlet.dead:
+        _dead_greenlet_to_future(greenlet, future, True)
+    else:
+        greenlet.link(lambda _: _dead_greenlet_to_future(greenlet, future, True))
+
+    loop = asyncio.get_running_loop()
+    result, _ = await asyncio.gather(future, loop.run_in_executor(None, greenlet.join))
+    return result
+
+
+def _work():
+    gevent.sleep(0)
+    return 1
+
+
+async def _run_executor(n: int):
+    await asyncio.gather(*(_executor_greenlet_to_future(gevent.Greenlet(_work)) for _ in range(n)))
+
+
+async def _run_link(n: int):
+    await asyncio.gather(*(asyncio_gevent.greenlet_to_future(gevent.Greenlet(_work)) for _ in range(n)))
+
+
+IMPLEMENTATIONS = {
+    "executor": _run_executor,
+    "link": _run_link,
+}
+
+
+def bench(implementation: str, n: int) -> float:
+    loop = asyncio_gevent.EventLoop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(IMPLEMENTATIONS[implementation](n))
+        return n / (time.perf_counter() - start)
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--implementations", nargs="+", default=list(IMPLEMENTATIONS), choices=list(IMPLEMENTATIONS))
+    args = parser.parse_args()
+
+    print(f"{'implementation':<16}{'concurrency':>12}{'calls/s':>14}")
+    for n in args.sizes:
+        for implementation in args.implementations:
+            print(f"{implementation:<16}{n:>12}{bench(implementation, n):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
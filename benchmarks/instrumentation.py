@@ -0,0 +1,113 @@
+"""
+Measure the overhead of bridge instrumentation.
+
+Modes:
+
+- off: no observers are added
+- observer: an observer that does nothing
+- collector: an `asyncio_gevent.BridgeCollector`
+
+Bridges:
+
+- sync_to_async: a function that returns without blocking, awaited from a coroutine
+- async_to_sync: a coroutine that returns without awaiting anything, called from a greenlet
+- greenlet_to_future: a greenlet that returns right away, awaited as a future
+
+Every crossing is finished before the next one starts. Reports the throughput and the time per crossing on an
+`asyncio_gevent.EventLoop`.
+
+Usage: python -m benchmarks.instrumentation [--modes ...] [--bridges ...] [-n 20000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+MODES = ["off", "observer", "collector"]
+
+
+def _noop_observer(event):
+    pass
+
+
+def _return_one():
+    return 1
+
+
+async def _async_return_one():
+    return 1
+
+
+async def _sync_to_async(n: int):
+    fn = asyncio_gevent.sync_to_async(_return_one)
+    for _ in range(n):
+        await fn()
+
+
+async def _async_to_sync(n: int):
+    fn = asyncio_gevent.async_to_sync(_async_return_one)
+
+    def calls():
+        for _ in range(n):
+            fn()
+
+    await asyncio_gevent.greenlet_to_future(gevent.spawn(calls))
+
+
+async def _greenlet_to_future(n: int):
+    for _ in range(n):
+        await asyncio_gevent.greenlet_to_future(gevent.Greenlet(_return_one))
+
+
+BRIDGES = {
+    "sync_to_async": _sync_to_async,
+    "async_to_sync": _async_to_sync,
+    "greenlet_to_future": _greenlet_to_future,
+}
+
+
+def bench(mode: str, bridge: str, n: int):
+    observer = None
+    if mode == "observer":
+        observer = _noop_observer
+    elif mode == "collector":
+        observer = asyncio_gevent.BridgeCollector()
+    if observer is not None:
+        asyncio_gevent.add_bridge_observer(observer)
+
+    loop = asyncio_gevent.EventLoop()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(BRIDGES[bridge](n))
+        elapsed = time.perf_counter() - start
+    finally:
+        loop.close()
+        if observer is not None:
+            asyncio_gevent.remove_bridge_observer(observer)
+
+    return n / elapsed, elapsed / n * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--bridges", nargs="+", default=list(BRIDGES), choices=list(BRIDGES))
+    parser.add_argument("-n", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'bridge':<20}{'mode':<11}{'crossings/s':>13}{'us/crossing':>13}")
+    for bridge in args.bridges:
+        for mode in args.modes:
+            rate, us = bench(mode, bridge, args.n)
+            print(f"{bridge:<20}{mode:<11}{rate:>13.0f}{us:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Measure the throughput of a lock that is shared by greenlets and coroutines.
+
+Locks:
+
+- bridge: a `gevent.lock.Semaphore`, which coroutines acquire with `sync_to_async(lock.acquire)`
+- native: `asyncio_gevent.Lock`, which coroutines acquire with `async with`
+
+Workloads:
+
+- uncontended: one coroutine acquires and releases the lock N times
+- contended: `--workers` greenlets and as many tasks acquire the lock N times in total, and yield once while they
+  hold it
+
+Reports acquisitions/s.
+
+Usage: python -m benchmarks.locks [-n 20000] [--workers 10] [--locks bridge native]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+import gevent.lock  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+LOCKS = ["bridge", "native"]
+WORKLOADS = ["uncontended", "contended"]
+
+
+def make_lock(kind: str):
+    if kind == "bridge":
+        lock = gevent.lock.Semaphore()
+        return lock, asyncio_gevent.sync_to_async(lock.acquire)
+    lock = asyncio_gevent.Lock()
+    return lock, lock.aacquire
+
+
+async def uncontended(kind: str, n: int, workers: int):
+    lock, aacquire = make_lock(kind)
+    for _ in range(n):
+        await aacquire()
+        lock.release()
+
+
+async def contended(kind: str, n: int, workers: int):
+    lock, aacquire = make_lock(kind)
+    per_worker = n // (2 * workers)
+
+    def in_greenlet():
+        for _ in range(per_worker):
+            with lock:
+                gevent.sleep(0)
+
+    async def in_task():
+        for _ in range(per_worker):
+            await aacquire()
+            try:
+                await asyncio.sleep(0)
+            finally:
+                lock.release()
+
+    greenlets = [gevent.spawn(in_greenlet) for _ in range(workers)]
+    await asyncio.gather(*[in_task() for _ in range(workers)])
+    await asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.joinall, greenlets, raise_error=True))
+
+
+WORKLOAD_FUNCTIONS = {
+    "uncontended": uncontended,
+    "contended": contended,
+}
+
+
+def bench(workload: str, kind: str, n: int, workers: int) -> float:
+    start = time.perf_counter()
+    asyncio.run(WORKLOAD_FUNCTIONS[workload](kind, n, workers))
+    return n / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workloads", nargs="+", default=WORKLOADS, choices=WORKLOADS)
+    parser.add_argument("--locks", nargs="+", default=LOCKS, choices=LOCKS)
+    parser.add_argument("-n", type=int, default=20000)
+    parser.add_argument("--workers", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+    print(f"{'workload':<13}{'lock':<8}{'acquisitions/s':>16}")
+    for workload in args.workloads:
+        for kind in args.locks:
+            print(f"{workload:<13}{kind:<8}{bench(workload, kind, args.n, args.workers):>16.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Measure the throughput of `asyncio_gevent.LoopGroup.submit`.
+
+The main thread submits N coroutine functions that return right away to a group of `--threads` threads and then waits
+for all of them.
+
+Modes:
+
+- batched: submissions only wake a loop when no wakeup is pending yet
+- unbatched: every submission wakes its loop with `call_soon_threadsafe`
+
+Reports the throughput and the number of wakeups per job.
+
+Usage: python -m benchmarks.loop_group [--threads 1 2 4] [--modes batched unbatched] [-n 50000]
+"""
+
+import argparse
+import time
+
+import asyncio_gevent
+from asyncio_gevent import loop_group
+
+MODES = ["batched", "unbatched"]
+
+
+class _UnbatchedLoopThread(loop_group._LoopThread):
+    def submit(self, job):
+        job.future._loop_thread = self
+        self.submitted += 1
+        self.wakeups += 1
+        self.inbox.append(job)
+        self.loop.call_soon_threadsafe(self._drain)
+
+
+async def _return_one():
+    return 1
+
+
+def bench(mode: str, threads: int, n: int):
+    group = asyncio_gevent.LoopGroup(threads)
+    if mode == "unbatched":
+        group._threads = [_UnbatchedLoopThread(index, asyncio_gevent.EventLoop) for index in range(threads)]
+
+    with group:
+        start = time.perf_counter()
+        futures = [group.submit(_return_one) for _ in range(n)]
+        for future in futures:
+            future.result()
+        elapsed = time.perf_counter() - start
+        wakeups = sum(stats.wakeups for stats in group.stats())
+
+    return n / elapsed, wakeups / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("-n", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'threads':<9}{'mode':<11}{'jobs/s':>10}{'wakeups/job':>13}")
+    for threads in args.threads:
+        for mode in args.modes:
+            rate, wakeups = bench(mode, threads, args.n)
+            print(f"{threads:<9}{mode:<11}{rate:>10.0f}{wakeups:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
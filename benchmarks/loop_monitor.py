@@ -0,0 +1,99 @@
+"""
+Measure the overhead of `asyncio_gevent.LoopMonitor`.
+
+Modes:
+
+- off: no monitor
+- trace: a monitor that traces greenlet switches, without the sampler thread
+- sample: a monitor that traces switches and samples stalls every 20 ms
+
+Workloads:
+
+- switches: 10 greenlets that yield to each other with `gevent.sleep(0)`
+- sync_to_async: sequential round trips through `sync_to_async` with a function that returns right away
+
+Reports the throughput of each workload on an `asyncio_gevent.EventLoop`.
+
+Usage: python -m benchmarks.loop_monitor [--modes ...] [--workloads ...] [-n 20000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+MODES = ["off", "trace", "sample"]
+
+
+def _yield(n: int):
+    for _ in range(n):
+        gevent.sleep(0)
+
+
+async def _switches(n: int):
+    greenlets = [gevent.spawn(_yield, n // 10) for _ in range(10)]
+    await asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.joinall, greenlets))
+
+
+def _return_one():
+    return 1
+
+
+async def _sync_to_async(n: int):
+    fn = asyncio_gevent.sync_to_async(_return_one)
+    for _ in range(n):
+        await fn()
+
+
+WORKLOADS = {
+    "switches": _switches,
+    "sync_to_async": _sync_to_async,
+}
+
+
+def bench(mode: str, workload: str, n: int) -> float:
+    async def main():
+        monitor = None
+        if mode != "off":
+            monitor = asyncio_gevent.LoopMonitor(
+                asyncio.get_running_loop(), sample_interval=0.02 if mode == "sample" else None
+            )
+            monitor.start()
+        try:
+            start = time.perf_counter()
+            await WORKLOADS[workload](n)
+            return time.perf_counter() - start
+        finally:
+            if monitor is not None:
+                monitor.stop()
+
+    loop = asyncio_gevent.EventLoop()
+    try:
+        return n / loop.run_until_complete(main())
+    finally:
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", default=MODES, choices=MODES)
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("-n", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'workload':<16}{'mode':<8}{'ops/s':>10}")
+    for workload in args.workloads:
+        for mode in args.modes:
+            rate = bench(mode, workload, args.n)
+            print(f"{workload:<16}{mode:<8}{rate:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
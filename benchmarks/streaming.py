@@ -0,0 +1,125 @@
+"""
+Measure the throughput of streaming items across the bridges.
+
+Directions:
+
+- async_to_sync: a greenlet iterates an async generator that runs on the loop
+- sync_to_async: a coroutine iterates a generator that runs in a greenlet
+
+Modes:
+
+- per_item: every item crosses on its own, with `async_to_sync` on `__anext__` or `sync_to_async` on `next`
+- stream: `async_iter_to_sync` or `sync_iter_to_async` with `--prefetch` and the batch sizes of `--batches`
+
+Reports items/s.
+
+Usage: python -m benchmarks.streaming [-n 100000] [--prefetch 256] [--batches 1 16 64]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+_exhausted = object()
+
+
+async def _async_items(n: int):
+    for i in range(n):
+        yield i
+
+
+def _sync_items(n: int):
+    for i in range(n):
+        yield i
+
+
+def _consume_per_item(n: int):
+    anext = asyncio_gevent.async_to_sync(_anext)
+    aiterator = _async_items(n)
+    count = 0
+    while anext(aiterator) is not _exhausted:
+        count += 1
+    return count
+
+
+async def _anext(aiterator):
+    try:
+        return await aiterator.__anext__()
+    except StopAsyncIteration:
+        return _exhausted
+
+
+def _consume_stream(n: int, prefetch: int, batch: int):
+    count = 0
+    for _ in asyncio_gevent.async_iter_to_sync(_async_items(n), prefetch=prefetch, batch=batch):
+        count += 1
+    return count
+
+
+def bench_async_to_sync(n: int, prefetch: int, batch: int) -> float:
+    async def main():
+        if batch:
+            greenlet = gevent.spawn(_consume_stream, n, prefetch, batch)
+        else:
+            greenlet = gevent.spawn(_consume_per_item, n)
+        return await asyncio_gevent.greenlet_to_future(greenlet)
+
+    start = time.perf_counter()
+    assert asyncio.run(main()) == n
+    return n / (time.perf_counter() - start)
+
+
+def bench_sync_to_async(n: int, prefetch: int, batch: int) -> float:
+    async def main():
+        count = 0
+        if batch:
+            async for _ in asyncio_gevent.sync_iter_to_async(_sync_items(n), prefetch=prefetch, batch=batch):
+                count += 1
+        else:
+            next_item = asyncio_gevent.sync_to_async(next)
+            iterator = _sync_items(n)
+            while await next_item(iterator, _exhausted) is not _exhausted:
+                count += 1
+        return count
+
+    start = time.perf_counter()
+    assert asyncio.run(main()) == n
+    return n / (time.perf_counter() - start)
+
+
+DIRECTIONS = {
+    "async_to_sync": bench_async_to_sync,
+    "sync_to_async": bench_sync_to_async,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--directions", nargs="+", default=list(DIRECTIONS), choices=list(DIRECTIONS))
+    parser.add_argument("-n", type=int, default=100000)
+    parser.add_argument("--prefetch", type=int, default=256)
+    parser.add_argument("--batches", nargs="+", type=int, default=[1, 16, 64])
+    args = parser.parse_args()
+
+    asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+    print(f"{'direction':<15}{'mode':<18}{'items/s':>12}")
+    for direction in args.directions:
+        bench = DIRECTIONS[direction]
+        # The per-item crossings are much slower, so they stream fewer items
+        print(f"{direction:<15}{'per_item':<18}{bench(args.n // 10, args.prefetch, 0):>12.0f}")
+        for batch in args.batches:
+            mode = f"stream batch={batch}"
+            print(f"{direction:<15}{mode:<18}{bench(args.n, args.prefetch, batch):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
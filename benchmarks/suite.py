@@ -0,0 +1,490 @@
+"""
+Run the benchmark suite: bridge overhead and loop throughput on every runtime, with JSON output.
+
+Runtimes:
+
+- asyncio: a stock asyncio event loop, without gevent
+- EventLoop: `asyncio_gevent.EventLoop` with gevent's monkey patches
+- HubEventLoop: `asyncio_gevent.HubEventLoop`, which maps asyncio's primitives onto the hub's watchers, with gevent's
+  monkey patches
+- GeventLoop: gevent running on `asyncio_gevent.gevent_loop.GeventLoop`, which shares its asyncio loop with the bridges
+- gevent: gevent on its default libev loop, for reference
+
+Workloads:
+
+- round_trip: a coroutine awaits a greenlet that waits for a coroutine, one at a time (round trips/s, latency)
+- sync_to_async: a coroutine awaits a non-blocking function wrapped with `sync_to_async`, one at a time
+  (calls/s, latency)
+- async_to_sync: a greenlet calls a coroutine function wrapped with `async_to_sync`, one at a time (calls/s, latency)
+- bridge_throughput: 1000 greenlets awaited concurrently with `greenlet_to_future`, in batches (greenlets/s)
+- tcp_echo: 10 clients sending 64 byte messages to an echo server on localhost (round trips/s, latency)
+- timers: timers that are started and cancelled, one in ten of them firing instead (timers/s)
+- callbacks: chains of callbacks scheduled by callbacks (callbacks/s)
+
+The asyncio runtimes run the asyncio variant of a workload and the gevent runtimes run the gevent variant. The bridge
+workloads only run where both worlds are available. Every workload runs in a fresh subprocess.
+
+Usage: python -m benchmarks.suite [--runtimes ...] [--workloads ...] [--scale 1.0] [--json results.json]
+       [--compare baseline.json]
+
+Modules are imported inside the workloads, since the EventLoop runtime has to apply gevent's monkey patches before
+asyncio is imported.
+"""
+
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+
+RUNTIMES = ["asyncio", "EventLoop", "HubEventLoop", "GeventLoop", "gevent"]
+ASYNCIO_RUNTIMES = {"asyncio", "EventLoop", "HubEventLoop"}
+BRIDGE_RUNTIMES = {"EventLoop", "HubEventLoop", "GeventLoop"}
+
+MESSAGE = b"x" * 64
+CLIENTS = 10
+BATCH = 1000
+
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+# Bridges
+
+
+async def _noop():
+    pass
+
+
+def _wait_for_noop(loop):
+    import asyncio_gevent
+
+    greenlet = asyncio_gevent.future_to_greenlet(_noop(), loop=loop)
+    greenlet.start()
+    return greenlet.get()
+
+
+async def round_trip_bridge(n: int) -> List[float]:
+    import asyncio
+
+    import gevent
+
+    import asyncio_gevent
+
+    loop = asyncio.get_running_loop()
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await asyncio_gevent.greenlet_to_future(gevent.Greenlet(_wait_for_noop, loop), loop=loop)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def sync_to_async_bridge(n: int) -> List[float]:
+    import asyncio_gevent
+
+    fn = asyncio_gevent.sync_to_async(int)
+    latencies = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def async_to_sync_bridge(n: int) -> List[float]:
+    import gevent
+
+    import asyncio_gevent
+
+    fn = asyncio_gevent.async_to_sync(_noop)
+    latencies: List[float] = []
+
+    def calls():
+        for _ in range(n):
+            start = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio_gevent.greenlet_to_future(gevent.Greenlet(calls))
+    return latencies
+
+
+async def bridge_throughput_bridge(n: int) -> None:
+    import asyncio
+
+    import gevent
+
+    import asyncio_gevent
+
+    for i in range(0, n, BATCH):
+        await asyncio.gather(*(asyncio_gevent.greenlet_to_future(gevent.spawn(int)) for _ in range(min(BATCH, n - i))))
+
+
+# TCP echo
+
+
+async def tcp_echo_asyncio(n: int) -> List[float]:
+    import asyncio
+
+    async def echo(reader, writer):
+        try:
+            while True:
+                data = await reader.readexactly(len(MESSAGE))
+                writer.write(data)
+        except asyncio.IncompleteReadError:
+            writer.close()
+
+    server = await asyncio.start_server(echo, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    latencies: List[float] = []
+
+    async def client(count: int):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        for _ in range(count):
+            start = time.perf_counter()
+            writer.write(MESSAGE)
+            await reader.readexactly(len(MESSAGE))
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    await asyncio.gather(*(client(n // CLIENTS) for _ in range(CLIENTS)))
+    server.close()
+    await server.wait_closed()
+    return latencies
+
+
+def _recv_exactly(sock, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+
+def tcp_echo_gevent(n: int) -> List[float]:
+    import gevent
+    import gevent.server
+    import gevent.socket
+
+    def echo(sock, _):
+        while True:
+            data = _recv_exactly(sock, len(MESSAGE))
+            if not data:
+                break
+            sock.sendall(data)
+        sock.close()
+
+    server = gevent.server.StreamServer(("127.0.0.1", 0), echo)
+    server.start()
+    latencies: List[float] = []
+
+    def client(count: int):
+        sock = gevent.socket.create_connection(("127.0.0.1", server.server_port))
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        for _ in range(count):
+            start = time.perf_counter()
+            sock.sendall(MESSAGE)
+            _recv_exactly(sock, len(MESSAGE))
+            latencies.append(time.perf_counter() - start)
+        sock.close()
+
+    gevent.joinall([gevent.spawn(client, n // CLIENTS) for _ in range(CLIENTS)])
+    server.stop()
+    return latencies
+
+
+# Timers
+
+
+async def timers_asyncio(n: int) -> None:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    fired = loop.create_future()
+    remaining = [n // 10]
+
+    def fire():
+        remaining[0] -= 1
+        if not remaining[0]:
+            fired.set_result(None)
+
+    for i in range(n):
+        if i % 10 == 0:
+            loop.call_later(0.001, fire)
+        else:
+            loop.call_later(1, fire).cancel()
+        if i % 100 == 0:
+            await asyncio.sleep(0)
+    await fired
+
+
+def timers_gevent(n: int) -> None:
+    import gevent
+    import gevent.event
+
+    loop = gevent.get_hub().loop
+    fired = gevent.event.Event()
+    remaining = [n // 10]
+
+    def fire():
+        remaining[0] -= 1
+        if not remaining[0]:
+            fired.set()
+
+    for i in range(n):
+        if i % 10 == 0:
+            loop.timer(0.001).start(fire)
+        else:
+            timer = loop.timer(1)
+            timer.start(fire)
+            timer.stop()
+        if i % 100 == 0:
+            gevent.sleep(0)
+    fired.wait()
+
+
+# Callbacks
+
+
+async def callbacks_asyncio(n: int) -> None:
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    done = loop.create_future()
+    remaining = [n]
+
+    def callback():
+        remaining[0] -= 1
+        if remaining[0] <= 0:
+            if not done.done():
+                done.set_result(None)
+        else:
+            loop.call_soon(callback)
+
+    # A few chains at once, like concurrent tasks
+    for _ in range(10):
+        loop.call_soon(callback)
+    await done
+
+
+def callbacks_gevent(n: int) -> None:
+    import gevent
+    import gevent.event
+
+    loop = gevent.get_hub().loop
+    done = gevent.event.Event()
+    remaining = [n]
+
+    def callback():
+        remaining[0] -= 1
+        if remaining[0] <= 0:
+            done.set()
+        else:
+            loop.run_callback(callback)
+
+    for _ in range(10):
+        loop.run_callback(callback)
+    done.wait()
+
+
+class Workload:
+    def __init__(
+        self,
+        n: int,
+        asyncio_variant: Optional[Callable] = None,
+        gevent_variant: Optional[Callable] = None,
+        bridge: Optional[Callable] = None,
+    ):
+        self.n = n
+        self.asyncio_variant = asyncio_variant
+        self.gevent_variant = gevent_variant
+        self.bridge = bridge
+
+    def supports(self, runtime: str) -> bool:
+        if self.bridge is not None:
+            return runtime in BRIDGE_RUNTIMES
+        if runtime in ASYNCIO_RUNTIMES:
+            return self.asyncio_variant is not None
+        return self.gevent_variant is not None
+
+
+WORKLOADS: Dict[str, Workload] = {
+    "round_trip": Workload(10000, bridge=round_trip_bridge),
+    "sync_to_async": Workload(20000, bridge=sync_to_async_bridge),
+    "async_to_sync": Workload(20000, bridge=async_to_sync_bridge),
+    "bridge_throughput": Workload(50000, bridge=bridge_throughput_bridge),
+    "tcp_echo": Workload(20000, asyncio_variant=tcp_echo_asyncio, gevent_variant=tcp_echo_gevent),
+    "timers": Workload(200000, asyncio_variant=timers_asyncio, gevent_variant=timers_gevent),
+    "callbacks": Workload(500000, asyncio_variant=callbacks_asyncio, gevent_variant=callbacks_gevent),
+}
+
+
+def run_worker(runtime: str, workload_name: str, n: int):
+    workload = WORKLOADS[workload_name]
+
+    if runtime == "asyncio":
+        import asyncio
+
+        loop = asyncio.new_event_loop()
+        run_async = loop.run_until_complete
+    elif runtime in ("EventLoop", "HubEventLoop"):
+        import gevent.monkey
+
+        gevent.monkey.patch_all()
+
+        import asyncio
+
+        import asyncio_gevent
+
+        if runtime == "EventLoop":
+            asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+        else:
+            asyncio.set_event_loop_policy(asyncio_gevent.HubEventLoopPolicy())
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        run_async = loop.run_until_complete
+    else:
+        import gevent
+
+        if runtime == "GeventLoop":
+            # GeventLoop doesn't support gevent's monkey patches
+            gevent.config.loop = "asyncio_gevent.gevent_loop.GeventLoop"
+        hub = gevent.get_hub()
+
+        def run_async(coro):
+            import asyncio_gevent
+
+            # Tasks on the GeventLoop's asyncio loop don't keep the hub's loop
+            # running, an active watcher does
+            keepalive = hub.loop.async_()
+            keepalive.start(int)
+            try:
+                greenlet = asyncio_gevent.future_to_greenlet(coro, loop=hub.loop.aio)
+                greenlet.start()
+                return greenlet.get()
+            finally:
+                keepalive.stop()
+
+    start = time.perf_counter()
+    if workload.bridge is not None:
+        latencies = run_async(workload.bridge(n))
+    elif runtime in ASYNCIO_RUNTIMES:
+        latencies = run_async(workload.asyncio_variant(n))
+    else:
+        latencies = workload.gevent_variant(n)
+    elapsed = time.perf_counter() - start
+
+    result = {"ops_per_s": round(n / elapsed, 1)}
+    if latencies:
+        result["p50_us"] = round(percentile(latencies, 0.5) * 1e6, 1)
+        result["p99_us"] = round(percentile(latencies, 0.99) * 1e6, 1)
+    print(json.dumps(result))
+
+
+def bench(runtime: str, workload: str, n: int) -> dict:
+    env = dict(os.environ)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [root, env.get("PYTHONPATH")]))
+    output = subprocess.check_output(
+        [sys.executable, "-m", "benchmarks.suite", "--worker", runtime, workload, str(n)],
+        text=True,
+        env=env,
+    )
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def metadata() -> dict:
+    import gevent
+
+    try:
+        commit: Optional[str] = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "gevent": gevent.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def compare(results: dict, baseline: dict):
+    print()
+    print(f"{'workload':<20}{'runtime':<12}{'ops/s':>14}{'baseline':>14}{'change':>10}")
+    for workload, runtimes in results["results"].items():
+        for runtime, result in runtimes.items():
+            base = baseline.get("results", {}).get(workload, {}).get(runtime)
+            if base is None:
+                continue
+            change = result["ops_per_s"] / base["ops_per_s"] - 1
+            print(f"{workload:<20}{runtime:<12}{result['ops_per_s']:>14.0f}{base['ops_per_s']:>14.0f}{change:>+10.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runtimes", nargs="+", default=RUNTIMES, choices=RUNTIMES)
+    parser.add_argument("--workloads", nargs="+", default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplies the number of operations")
+    parser.add_argument("--json", metavar="PATH", help="write the results to PATH, '-' for stdout")
+    parser.add_argument("--compare", metavar="PATH", help="compare with the results in PATH")
+    parser.add_argument("--worker", nargs=3, metavar=("RUNTIME", "WORKLOAD", "N"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        runtime, workload, n = args.worker
+        run_worker(runtime, workload, int(n))
+        return
+
+    results: dict = {"meta": metadata(), "results": {}}
+    table = args.json != "-"
+    if table:
+        print(f"{'workload':<20}{'runtime':<12}{'ops/s':>14}{'p50 us':>10}{'p99 us':>10}")
+    for workload in args.workloads:
+        n = max(1, int(WORKLOADS[workload].n * args.scale))
+        for runtime in args.runtimes:
+            if not WORKLOADS[workload].supports(runtime):
+                continue
+            result = dict(bench(runtime, workload, n), n=n)
+            results["results"].setdefault(workload, {})[runtime] = result
+            if table:
+                p50 = result.get("p50_us")
+                p99 = result.get("p99_us")
+                print(
+                    f"{workload:<20}{runtime:<12}{result['ops_per_s']:>14.0f}"
+                    f"{'' if p50 is None else f'{p50:.1f}':>10}{'' if p99 is None else f'{p99:.1f}':>10}"
+                )
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    elif args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Measure a burst of `sync_to_async` calls against a blocking function, with and without a concurrency limit.
+
+The blocking function simulates a shared resource whose per-call cost grows with the number of concurrent users.
+Reports throughput, latency percentiles, the peak number of concurrently running calls and the peak traced memory.
+
+Usage: python -m benchmarks.sync_to_async [-n 10000] [--limits 0 16 64]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import asyncio  # noqa: E402
+import time  # noqa: E402
+import tracemalloc  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+
+class Resource:
+    def __init__(self):
+        self.users = 0
+        self.peak_users = 0
+
+    def use(self):
+        self.users += 1
+        self.peak_users = max(self.peak_users, self.users)
+        try:
+            # Contention: the more concurrent users, the slower each call
+            gevent.sleep(0.0001 * self.users)
+        finally:
+            self.users -= 1
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def bench(n: int, limit: int):
+    resource = Resource()
+    fn = asyncio_gevent.sync_to_async(resource.use, max_concurrency=limit or None)
+    latencies = []
+
+    async def call():
+        start = time.perf_counter()
+        await fn()
+        latencies.append(time.perf_counter() - start)
+
+    async def main():
+        await asyncio.gather(*(call() for _ in range(n)))
+
+    loop = asyncio_gevent.EventLoop()
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(main())
+        elapsed = time.perf_counter() - start
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        loop.close()
+
+    return {
+        "calls/s": n / elapsed,
+        "p50 ms": percentile(latencies, 0.5) * 1e3,
+        "p99 ms": percentile(latencies, 0.99) * 1e3,
+        "peak running": resource.peak_users,
+        "peak MiB": peak_memory / 2**20,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-n", type=int, default=10000)
+    parser.add_argument("--limits", type=int, nargs="+", default=[0, 16, 64], help="0 means unbounded")
+    args = parser.parse_args()
+
+    columns = ["calls/s", "p50 ms", "p99 ms", "peak running", "peak MiB"]
+    print(f"{'limit':<10}" + "".join(f"{column:>14}" for column in columns))
+    for limit in args.limits:
+        result = bench(args.n, limit)
+        print(f"{limit or 'none':<10}" + "".join(f"{result[column]:>14.1f}" for column in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Measure the latency of `sync_to_async` calls with and without `eager=True`.
+
+Functions:
+
+- fast: returns without blocking
+- blocking: yields to the hub once with `gevent.sleep(0)`
+
+Every call is awaited before the next one starts. Reports throughput and latency percentiles on
+`asyncio_gevent.EventLoop` and `asyncio_gevent.HubEventLoop`.
+
+Usage: python -m benchmarks.sync_to_async_eager [-n 20000]
+"""
+
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import argparse  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+LOOPS = {
+    "EventLoop": asyncio_gevent.EventLoop,
+    "HubEventLoop": asyncio_gevent.HubEventLoop,
+}
+
+
+def fast():
+    return 1
+
+
+def blocking():
+    gevent.sleep(0)
+    return 1
+
+
+FUNCTIONS = {
+    "fast": fast,
+    "blocking": blocking,
+}
+
+
+def percentile(values, p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def bench(loop_name: str, function: str, eager: bool, n: int):
+    fn = asyncio_gevent.sync_to_async(FUNCTIONS[function], eager=eager)
+    latencies = []
+
+    async def main():
+        for _ in range(n):
+            start = time.perf_counter()
+            await fn()
+            latencies.append(time.perf_counter() - start)
+
+    loop = LOOPS[loop_name]()
+    try:
+        start = time.perf_counter()
+        loop.run_until_complete(main())
+        elapsed = time.perf_counter() - start
+    finally:
+        loop.close()
+
+    return {
+        "calls/s": n / elapsed,
+        "p50 us": percentile(latencies, 0.5) * 1e6,
+        "p99 us": percentile(latencies, 0.99) * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loops", nargs="+", default=list(LOOPS), choices=list(LOOPS))
+    parser.add_argument("--functions", nargs="+", default=list(FUNCTIONS), choices=list(FUNCTIONS))
+    parser.add_argument("-n", type=int, default=20000)
+    args = parser.parse_args()
+
+    columns = ["calls/s", "p50 us", "p99 us"]
+    print(f"{'loop':<14}{'function':<10}{'eager':<7}" + "".join(f"{column:>12}" for column in columns))
+    for loop_name in args.loops:
+        for function in args.functions:
+            for eager in (False, True):
+                result = bench(loop_name, function, eager, args.n)
+                print(
+                    f"{loop_name:<14}{function:<10}{str(eager):<7}"
+                    + "".join(f"{result[column]:>12.1f}" for column in columns)
+                )
+
+
+if __name__ == "__main__":
+    main()
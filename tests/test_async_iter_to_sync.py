@@ -0,0 +1,115 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+class Source:
+    def __init__(self, n: int, delay: float = 0, fail: bool = False):
+        self.n = n
+        self.delay = delay
+        self.fail = fail
+        self.produced = 0
+        self.consumed = 0
+        self.max_lead = 0
+        self.closed = False
+
+    async def items(self):
+        try:
+            for i in range(self.n):
+                await asyncio.sleep(self.delay)
+                self.produced += 1
+                self.max_lead = max(self.max_lead, self.produced - self.consumed)
+                yield i
+            if self.fail:
+                raise ValueError()
+        finally:
+            self.closed = True
+
+    def consume(self, iterator, limit=None):
+        items = []
+        for item in iterator:
+            self.consumed += 1
+            items.append(item)
+            if len(items) == limit:
+                break
+        return items
+
+
+def test_async_iter_to_sync_streams_items_with_backpressure():
+    source = Source(200)
+
+    async def main():
+        iterator = asyncio_gevent.async_iter_to_sync(source.items(), prefetch=8, batch=4)
+        return await asyncio_gevent.greenlet_to_future(gevent.spawn(source.consume, iterator))
+
+    assert asyncio.run(main()) == list(range(200))
+    assert source.closed
+    assert source.max_lead <= 8 + 4
+
+    failing = Source(3, fail=True)
+    iterator = asyncio_gevent.async_iter_to_sync(failing.items())
+    assert [next(iterator) for _ in range(3)] == [0, 1, 2]
+    with pytest.raises(ValueError):
+        next(iterator)
+
+    with pytest.raises(ValueError):
+        asyncio_gevent.async_iter_to_sync(Source(1).items(), prefetch=0)
+
+
+def test_async_iter_to_sync_closes_the_async_iterable():
+    async def main():
+        source = Source(100)
+
+        def consume_two():
+            with asyncio_gevent.async_iter_to_sync(source.items(), prefetch=4) as iterator:
+                items = source.consume(iterator, 2)
+                assert not source.closed
+            return items
+
+        assert await asyncio_gevent.greenlet_to_future(gevent.spawn(consume_two)) == [0, 1]
+        assert source.closed
+
+        source = Source(100, delay=10)
+        greenlet = gevent.spawn(source.consume, asyncio_gevent.async_iter_to_sync(source.items()))
+        await asyncio.sleep(0.05)
+        greenlet.kill(block=False)
+        await asyncio.sleep(0.05)
+        assert greenlet.dead
+        assert source.closed
+
+        # Cancelling the task that iterates the async iterable kills the consumer
+        source = Source(100, delay=10)
+        greenlet = gevent.spawn(source.consume, asyncio_gevent.async_iter_to_sync(source.items()))
+        await asyncio.sleep(0.05)
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+        await asyncio.sleep(0.05)
+        assert isinstance(greenlet.value, gevent.GreenletExit)
+        assert source.closed
+
+    asyncio.run(main())
+
+
+def test_async_iter_to_sync_from_threadpool_uses_background_loop():
+    background_loop = asyncio_gevent.start_background_loop()
+    try:
+        source = Source(100)
+
+        def consume():
+            return source.consume(asyncio_gevent.async_iter_to_sync(source.items(), batch=8))
+
+        assert gevent.get_hub().threadpool.apply(consume) == list(range(100))
+        assert source.closed
+        assert background_loop.running
+    finally:
+        asyncio_gevent.stop_background_loop()
@@ -0,0 +1,65 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+@pytest.fixture
+def background_loop():
+    background_loop = asyncio_gevent.start_background_loop()
+    yield background_loop
+    asyncio_gevent.stop_background_loop()
+
+
+async def get_running_loop():
+    await asyncio.sleep(0)
+    return asyncio.get_running_loop()
+
+
+def test_async_to_sync_uses_the_background_loop(background_loop):
+    fn = asyncio_gevent.async_to_sync(get_running_loop)
+    assert {fn() for _ in range(10)} == {background_loop.loop}
+
+
+def test_async_to_sync_from_many_greenlets_uses_the_background_loop(background_loop):
+    fn = asyncio_gevent.async_to_sync(get_running_loop)
+    greenlets = [gevent.spawn(fn) for _ in range(10)]
+    gevent.joinall(greenlets, raise_error=True)
+    assert {greenlet.value for greenlet in greenlets} == {background_loop.loop}
+
+
+def test_killing_the_greenlet_cancels_the_coroutine_on_the_background_loop(background_loop):
+    cancelled = []
+
+    async def sleep():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    greenlet = asyncio_gevent.future_to_greenlet(sleep())
+    greenlet.start()
+    gevent.sleep(0.01)
+    greenlet.kill()
+    gevent.sleep(0.01)
+    assert cancelled == [True]
+
+
+def test_stop_background_loop_closes_the_loop():
+    background_loop = asyncio_gevent.start_background_loop()
+    assert asyncio_gevent.get_background_loop() is background_loop
+    asyncio_gevent.async_to_sync(get_running_loop)()
+
+    asyncio_gevent.stop_background_loop()
+
+    assert asyncio_gevent.get_background_loop() is None
+    assert background_loop.loop.is_closed()
@@ -0,0 +1,160 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def double(i):
+    gevent.sleep(0.001 * (i % 3))
+    return i * 2
+
+
+def fail():
+    gevent.sleep(0)
+    raise ValueError("boom")
+
+
+# gather_greenlets
+
+
+def test_gather_greenlets_returns_results_in_order():
+    async def main():
+        return await asyncio_gevent.gather_greenlets([gevent.spawn(double, i) for i in range(100)])
+
+    assert asyncio.run(main()) == [i * 2 for i in range(100)]
+
+
+def test_gather_greenlets_starts_unstarted_greenlets_with_limit():
+    running = []
+    max_running = []
+
+    def fn(i):
+        running.append(i)
+        max_running.append(len(running))
+        gevent.sleep(0.001)
+        running.remove(i)
+        return i
+
+    async def main():
+        return await asyncio_gevent.gather_greenlets([gevent.Greenlet(fn, i) for i in range(20)], limit=4)
+
+    assert asyncio.run(main()) == list(range(20))
+    assert max(max_running) == 4
+
+
+def test_gather_greenlets_raises_first_exception():
+    async def main():
+        await asyncio_gevent.gather_greenlets([gevent.spawn(double, 1), gevent.spawn(fail)])
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(main())
+
+
+def test_gather_greenlets_with_return_exceptions():
+    async def main():
+        killed = gevent.spawn(gevent.sleep, 10)
+        greenlets = [gevent.spawn(double, 1), gevent.spawn(fail), killed]
+        future = asyncio_gevent.gather_greenlets(greenlets, return_exceptions=True)
+        killed.kill(block=False)
+        return await future
+
+    result, exception, cancelled = asyncio.run(main())
+    assert result == 2
+    assert isinstance(exception, ValueError)
+    assert isinstance(cancelled, asyncio.CancelledError)
+
+
+def test_gather_greenlets_with_dead_and_duplicate_greenlets():
+    dead = gevent.spawn(double, 2)
+    dead.join()
+
+    async def main():
+        alive = gevent.spawn(double, 3)
+        return await asyncio_gevent.gather_greenlets([dead, alive, dead, alive])
+
+    assert asyncio.run(main()) == [4, 6, 4, 6]
+
+
+def test_gather_greenlets_kills_greenlets_when_cancelled():
+    async def main():
+        greenlets = [gevent.spawn(gevent.sleep, 10) for _ in range(3)] + [gevent.Greenlet(gevent.sleep, 10)]
+        future = asyncio_gevent.gather_greenlets(greenlets, limit=3)
+        await asyncio.sleep(0.01)
+        future.cancel()
+        await asyncio.sleep(0.01)
+        return greenlets
+
+    greenlets = asyncio.run(main())
+    assert all(greenlet.dead for greenlet in greenlets)
+
+
+# wait_futures
+
+
+async def sleep_and_return(duration, value):
+    await asyncio.sleep(duration)
+    return value
+
+
+def test_wait_futures_waits_for_all_futures():
+    async def main():
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_task(sleep_and_return(0.001 * i, i)) for i in range(10)]
+        greenlet = gevent.spawn(asyncio_gevent.wait_futures, futures)
+        return await asyncio_gevent.greenlet_to_future(greenlet)
+
+    done = asyncio.run(main())
+    assert [future.result() for future in done] == list(range(10))
+
+
+def test_wait_futures_with_count_and_timeout():
+    async def main():
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_task(sleep_and_return(0.01, 1)), loop.create_task(sleep_and_return(10, 2))]
+        first = await asyncio_gevent.greenlet_to_future(gevent.spawn(asyncio_gevent.wait_futures, futures, count=1))
+        timed_out = await asyncio_gevent.greenlet_to_future(
+            gevent.spawn(asyncio_gevent.wait_futures, futures, timeout=0.01)
+        )
+        futures[1].cancel()
+        return first, timed_out, futures
+
+    first, timed_out, futures = asyncio.run(main())
+    assert first == [futures[0]]
+    assert timed_out == [futures[0]]
+
+
+def test_wait_futures_returns_at_most_count_futures():
+    async def main():
+        loop = asyncio.get_running_loop()
+        done = [loop.create_future() for _ in range(3)]
+        for i, future in enumerate(done):
+            future.set_result(i)
+        first = await asyncio_gevent.greenlet_to_future(gevent.spawn(asyncio_gevent.wait_futures, done, count=1))
+
+        # Both futures are done in the same iteration, after the greenlet
+        # returned only one of them
+        pending = [loop.create_future() for _ in range(2)]
+        greenlet = gevent.spawn(asyncio_gevent.wait_futures, pending, count=1)
+        await asyncio.sleep(0.01)
+        for i, future in enumerate(pending):
+            future.set_result(i)
+        second = await asyncio_gevent.greenlet_to_future(greenlet)
+        await asyncio.sleep(0.01)
+        return first, second, done, pending
+
+    first, second, done, pending = asyncio.run(main())
+    assert first == [done[0]]
+    assert second == [pending[0]]
+
+
+def test_wait_futures_rejects_non_futures():
+    with pytest.raises(TypeError):
+        asyncio_gevent.wait_futures([42])  # type: ignore
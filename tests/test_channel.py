@@ -0,0 +1,149 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+import queue  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def test_channel_hands_items_between_greenlets_and_coroutines_in_order():
+    async def main():
+        channel = asyncio_gevent.Channel(maxsize=4)
+
+        def produce():
+            for i in range(50):
+                channel.put(i)
+            channel.put_many(range(50, 100))
+            channel.close()
+
+        async def consume():
+            return [item async for item in channel]
+
+        greenlet = gevent.spawn(produce)
+        consumers = [asyncio.ensure_future(consume()), asyncio.ensure_future(consume())]
+        results = await asyncio.gather(*consumers)
+        assert greenlet.dead
+        assert sorted(results[0] + results[1]) == list(range(100))
+        assert all(items == sorted(items) for items in results)
+
+        channel = asyncio_gevent.Channel(maxsize=4)
+
+        async def aproduce():
+            await channel.aput_many(range(100))
+            channel.close()
+
+        def consume_batches():
+            batches = []
+            try:
+                while True:
+                    batches.append(channel.get_many(8))
+            except asyncio_gevent.ChannelClosed:
+                return batches
+
+        task = asyncio.ensure_future(aproduce())
+        batches = await asyncio_gevent.greenlet_to_future(gevent.spawn(consume_batches))
+        await task
+        assert [item for batch in batches for item in batch] == list(range(100))
+        assert all(1 <= len(batch) <= 8 for batch in batches)
+
+    asyncio.run(main())
+
+
+def test_channel_serves_greenlets_and_tasks_in_fifo_order():
+    async def main():
+        channel = asyncio_gevent.Channel()
+        order = []
+
+        def get_in_greenlet(name):
+            order.append((name, channel.get()))
+
+        async def get_in_task(name):
+            order.append((name, await channel.aget()))
+
+        # Every waiter starts waiting before the next one is started
+        gevent.spawn(get_in_greenlet, "greenlet 1")
+        await asyncio.sleep(0.01)
+        asyncio.ensure_future(get_in_task("task 1"))
+        await asyncio.sleep(0.01)
+        gevent.spawn(get_in_greenlet, "greenlet 2")
+        await asyncio.sleep(0.01)
+        asyncio.ensure_future(get_in_task("task 2"))
+        await asyncio.sleep(0.01)
+
+        await channel.aput_many(range(4))
+        await asyncio.sleep(0.01)
+        assert dict(order) == {"greenlet 1": 0, "task 1": 1, "greenlet 2": 2, "task 2": 3}
+
+    asyncio.run(main())
+
+
+def test_channel_backpressure_timeouts_and_close():
+    channel = asyncio_gevent.Channel(maxsize=2)
+    channel.put_many([1, 2])
+    assert channel.full()
+    with pytest.raises(queue.Full):
+        channel.put(3, block=False)
+    with pytest.raises(queue.Full):
+        channel.put(3, timeout=0.01)
+
+    putter = gevent.spawn(channel.put, 3)
+    gevent.sleep(0.01)
+    assert not putter.dead
+    assert channel.get() == 1
+    putter.join(timeout=1)
+    assert putter.dead
+    assert channel.get_many() == [2, 3]
+
+    with pytest.raises(ValueError):
+        channel.get_many(0)
+    with pytest.raises(ValueError):
+        asyncio.run(channel.aget_many(0))
+
+    with pytest.raises(queue.Empty):
+        channel.get(timeout=0.01)
+
+    getter = gevent.spawn(channel.get)
+    gevent.sleep(0.01)
+    channel.put("x")
+    channel.close()
+    assert getter.get(timeout=1) == "x"
+    with pytest.raises(asyncio_gevent.ChannelClosed):
+        channel.put(4)
+    with pytest.raises(asyncio_gevent.ChannelClosed):
+        channel.get()
+
+    getter = gevent.spawn(asyncio_gevent.Channel().get)
+    gevent.sleep(0.01)
+    getter.kill()
+    assert getter.dead
+
+
+def test_channel_puts_back_items_of_cancelled_tasks():
+    async def main():
+        channel = asyncio_gevent.Channel()
+        task = asyncio.ensure_future(channel.aget())
+        await asyncio.sleep(0)
+
+        # The item is handed to the task, which is cancelled before it runs
+        channel.put(1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await channel.aget() == 1
+
+        task = asyncio.ensure_future(channel.aget())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        channel.put(2)
+        assert channel.get() == 2
+
+    asyncio.run(main())
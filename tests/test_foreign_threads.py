@@ -0,0 +1,87 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+async def running_loop(delay: float = 0):
+    await asyncio.sleep(delay)
+    return asyncio.get_running_loop()
+
+
+async def fail():
+    raise ValueError()
+
+
+def in_threadpool(fn, *args):
+    return gevent.get_hub().threadpool.apply(fn, args)
+
+
+def catch_cancelled(fn, *args):
+    try:
+        return fn(*args)
+    except asyncio.CancelledError:
+        return "cancelled"
+
+
+def test_async_to_sync_from_threadpool_uses_background_loop():
+    background_loop = asyncio_gevent.start_background_loop()
+    try:
+        fn = asyncio_gevent.async_to_sync(running_loop)
+        greenlets = [gevent.spawn(in_threadpool, fn, 0.01) for _ in range(20)]
+        gevent.joinall(greenlets, raise_error=True)
+        assert {greenlet.value for greenlet in greenlets} == {background_loop.loop}
+
+        with pytest.raises(ValueError):
+            in_threadpool(asyncio_gevent.async_to_sync(fail))
+    finally:
+        asyncio_gevent.stop_background_loop()
+
+
+def test_async_to_sync_from_threadpool_uses_loop_argument():
+    async def main():
+        loop = asyncio.get_running_loop()
+        fn = asyncio_gevent.async_to_sync(running_loop, loop=loop)
+        result = await asyncio_gevent.greenlet_to_future(gevent.spawn(in_threadpool, fn))
+        assert result is loop
+
+        cancelled = asyncio_gevent.async_to_sync(asyncio.sleep, loop=loop, autokill_greenlet=False)
+        greenlet = gevent.spawn(in_threadpool, catch_cancelled, cancelled, 10)
+        await asyncio.sleep(0.05)
+        for task in asyncio.all_tasks():
+            if task is not asyncio.current_task():
+                task.cancel()
+        assert await asyncio_gevent.greenlet_to_future(greenlet) == "cancelled"
+
+    asyncio.run(main())
+
+
+def test_async_to_sync_from_greenlet_of_other_hub_waits_cooperatively():
+    async def main():
+        loop = asyncio.get_running_loop()
+        fn = asyncio_gevent.async_to_sync(running_loop, loop=loop)
+
+        with asyncio_gevent.LoopGroup(1) as group:
+
+            async def other_thread():
+                # The greenlets run concurrently on the hub of the group's
+                # thread while they wait for the loop of the main thread
+                greenlets = [gevent.spawn(fn, 0.05) for _ in range(10)]
+                started = asyncio.get_running_loop().time()
+                results = await asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.joinall, greenlets))
+                return [greenlet.value for greenlet in results], asyncio.get_running_loop().time() - started
+
+            results, elapsed = await group.submit(other_thread)
+
+        assert results == [loop] * 10
+        assert elapsed < 0.4
+
+    asyncio.run(main())
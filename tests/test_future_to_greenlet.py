@@ -0,0 +1,57 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def test_future_to_greenlet_cancels_future_when_greenlet_is_killed():
+    async def main():
+        future = asyncio.get_running_loop().create_future()
+        greenlet = asyncio_gevent.future_to_greenlet(future)
+        greenlet.start()
+        await asyncio.sleep(0.01)
+        greenlet.kill(block=False)
+        await asyncio.sleep(0.01)
+        return future, greenlet
+
+    future, greenlet = asyncio.run(main())
+    assert future.cancelled()
+    assert isinstance(greenlet.value, gevent.GreenletExit)
+
+
+def test_future_to_greenlet_kills_greenlet_when_future_is_cancelled():
+    async def main():
+        future = asyncio.get_running_loop().create_future()
+        greenlet = asyncio_gevent.future_to_greenlet(future)
+        greenlet.start()
+        await asyncio.sleep(0.01)
+        future.cancel()
+        await asyncio.sleep(0.01)
+        return greenlet
+
+    greenlet = asyncio.run(main())
+    assert greenlet.dead
+    assert isinstance(greenlet.value, gevent.GreenletExit)
+
+
+def test_future_to_greenlet_raises_cancelled_error_without_autokill():
+    async def main():
+        future = asyncio.get_running_loop().create_future()
+        greenlet = asyncio_gevent.future_to_greenlet(future, autokill_greenlet=False)
+        greenlet.start()
+        await asyncio.sleep(0.01)
+        future.cancel()
+        await asyncio.sleep(0.01)
+        return greenlet
+
+    greenlet = asyncio.run(main())
+    with pytest.raises(asyncio.CancelledError):
+        greenlet.get()
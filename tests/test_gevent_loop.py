@@ -0,0 +1,615 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The gevent loop can only be chosen before the hub is created, so every
+# scenario runs in a fresh interpreter
+PREAMBLE = """
+import gevent
+
+gevent.config.loop = "asyncio_gevent.gevent_loop.GeventLoop"
+
+hub = gevent.get_hub()
+loop = hub.loop
+"""
+
+
+def run_script(source: str) -> str:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run(
+        [sys.executable, "-c", PREAMBLE + textwrap.dedent(source)],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout.strip()
+
+
+def test_gevent_loop_runs_greenlets():
+    output = run_script(
+        """
+        def work(i):
+            gevent.sleep(0.01)
+            return i
+
+        print(type(loop).__name__, [g.value for g in gevent.joinall([gevent.spawn(work, i) for i in range(3)])])
+        """
+    )
+    assert output == "GeventLoop [0, 1, 2]"
+
+
+def test_gevent_loop_runs_callbacks_in_order_in_one_handle():
+    output = run_script(
+        """
+        order = []
+        handles = []
+        call_soon = loop.aio.call_soon
+
+        def counting_call_soon(*args, **kwargs):
+            if args[0] == loop._run_callbacks:
+                handles.append(args[0])
+            return call_soon(*args, **kwargs)
+
+        loop.aio.call_soon = counting_call_soon
+
+        def callback(i):
+            order.append(i)
+            if i == 0:
+                loop.run_callback(callback, 3)
+
+        for i in range(3):
+            loop.run_callback(callback, i)
+        stopped = loop.run_callback(callback, 4)
+        stopped.stop()
+
+        gevent.sleep(0.01)
+        print(order, stopped.pending, len(handles))
+        """
+    )
+    assert output == "[0, 1, 2, 3] False 1"
+
+
+def test_gevent_loop_stops_without_writing_to_the_self_pipe():
+    output = run_script(
+        """
+        writes = []
+        write_to_self = loop.aio._write_to_self
+        loop.aio._write_to_self = lambda: writes.append(True) or write_to_self()
+
+        for _ in range(100):
+            gevent.sleep(0.0001)
+
+        # Nothing references the loop anymore, so it stops and the hub exits
+        print(len(writes), hub.join(timeout=5), loop._ref_count)
+        """
+    )
+    assert output == "0 True 0"
+
+
+def test_gevent_loop_keeps_running_callbacks_after_an_error():
+    output = run_script(
+        """
+        errors = []
+        order = []
+        hub.handle_error = lambda context, type, value, tb: errors.append(type.__name__)
+
+        loop.run_callback(order.append, 1)
+        loop.run_callback(lambda: 1 / 0)
+        loop.run_callback(order.append, 2)
+
+        gevent.sleep(0.01)
+        print(order, errors)
+        """
+    )
+    assert output == "[1, 2] ['ZeroDivisionError']"
+
+
+def test_gevent_loop_yields_to_timers_while_callbacks_keep_coming():
+    output = run_script(
+        """
+        import sys
+
+        sys.setswitchinterval(0.001)
+        done = []
+
+        def spin():
+            while not done:
+                gevent.sleep(0)
+
+        def timer():
+            gevent.sleep(0.01)
+            done.append(True)
+
+        gevent.joinall([gevent.spawn(spin), gevent.spawn(timer)], timeout=5)
+        print(done)
+        """
+    )
+    assert output == "[True]"
+
+
+def test_gevent_loop_repeating_timer_keeps_firing():
+    output = run_script(
+        """
+        ticks = []
+        timer = loop.timer(0.001, 0.002)
+        timer.start(lambda: ticks.append(loop.now()))
+
+        gevent.sleep(0.05)
+        timer.stop()
+        print(len(ticks) > 5, ticks == sorted(ticks), timer.active, timer._handle is None, loop._ref_count)
+        """
+    )
+    assert output == "True True False True 0"
+
+
+def test_gevent_loop_timer_again_moves_the_deadline():
+    output = run_script(
+        """
+        import time
+
+        fired = []
+        start = time.monotonic()
+        timer = loop.timer(0, 0.05)
+        timer.again(lambda: fired.append(time.monotonic() - start))
+        for _ in range(3):
+            gevent.sleep(0.02)
+            timer.again(timer.callback)
+        gevent.sleep(0.08)
+        timer.stop()
+
+        once = loop.timer(0.01)
+        once.start(fired.append)
+        once.again(fired.append)
+        print(len(fired), 0.1 < fired[0] < 0.15, once.active)
+        """
+    )
+    assert output == "1 True False"
+
+
+def test_gevent_loop_runs_timeouts():
+    output = run_script(
+        """
+        try:
+            with gevent.Timeout(0.01):
+                gevent.sleep(1)
+        except gevent.Timeout:
+            print("timed out")
+        """
+    )
+    assert output == "timed out"
+
+
+def test_gevent_loop_caches_a_monotonic_clock():
+    output = run_script(
+        """
+        import time
+
+        now = loop.now()
+        time.sleep(0.01)
+        cached = loop.now() == now
+        loop.update_now()
+        print(cached, abs(loop.now() - time.monotonic()) < 0.01)
+        """
+    )
+    assert output == "True True"
+
+
+def test_gevent_loop_refreshes_the_clock_once_per_iteration():
+    output = run_script(
+        """
+        import time
+
+        times = []
+
+        def slow():
+            time.sleep(0.01)
+            times.append(loop.now())
+
+        # Both timers are due in the same iteration
+        timers = [loop.timer(0.01) for _ in range(2)]
+        for timer in timers:
+            timer.start(slow)
+        gevent.sleep(0.05)
+        print(len(times), times[0] == times[1], loop.now() > times[1])
+        """
+    )
+    assert output == "2 True True"
+
+
+def test_gevent_loop_timer_wheel_shares_handles_and_never_fires_early():
+    output = run_script(
+        """
+        import time
+
+        loop.timer_slack = 0.02
+        fired = []
+        timers = []
+        start = time.monotonic()
+        loop.update_now()
+        for i in range(100):
+            timer = loop.timer(0.01)
+            timer.start(lambda i: fired.append((i, time.monotonic() - start)), i)
+            timers.append(timer)
+        for timer in timers[::2]:
+            timer.stop()
+
+        print(len(loop.timer_wheel), len(loop.timer_wheel._slots))
+        gevent.sleep(0.05)
+        print(sorted(i for i, _ in fired) == list(range(1, 100, 2)), all(0.01 <= t < 0.05 for _, t in fired))
+        print(len(loop.timer_wheel), loop._ref_count)
+        """
+    )
+    assert output.splitlines() == ["50 1", "True True", "0 0"]
+
+
+def test_gevent_loop_timer_wheel_runs_repeating_timers_and_timeouts():
+    output = run_script(
+        """
+        loop.timer_slack = 0.005
+        ticks = []
+        timer = loop.timer(0.005, 0.005)
+        timer.start(ticks.append, None)
+        try:
+            with gevent.Timeout(0.02):
+                gevent.sleep(1)
+        except gevent.Timeout:
+            pass
+        timer.stop()
+        print(len(ticks) >= 2, timer.active, len(loop.timer_wheel))
+        """
+    )
+    assert output == "True False 0"
+
+
+def test_gevent_loop_fans_io_events_out_to_all_watchers_of_an_fd():
+    output = run_script(
+        """
+        import socket
+
+        a, b = socket.socketpair()
+        fired = []
+        readers = [loop.io(a.fileno(), 1) for _ in range(2)]
+        writer = loop.io(a.fileno(), 2)
+        for i, reader in enumerate(readers):
+            reader.start(fired.append, "read%d" % i)
+        writer.start(lambda events: (fired.append(("write", events)), writer.stop()), pass_events=True)
+
+        gevent.sleep(0.01)
+        b.send(b"x")
+        gevent.sleep(0.01)
+        for reader in readers:
+            reader.stop()
+        gevent.sleep(0.01)
+        print(fired[0], sorted(set(fired[1:])), a.fileno() in loop._io_registrations)
+        """
+    )
+    assert output == "('write', 2) ['read0', 'read1'] False"
+
+
+def test_gevent_loop_doesnt_reregister_busy_sockets():
+    output = run_script(
+        """
+        import gevent.socket
+
+        calls = []
+        selector = loop.aio._selector
+        for name in ("register", "modify", "unregister"):
+            method = getattr(selector, name)
+            setattr(selector, name, lambda *args, method=method, name=name: calls.append(name) or method(*args))
+
+        a, b = gevent.socket.socketpair()
+
+        def echo():
+            for _ in range(100):
+                b.sendall(b.recv(1))
+
+        greenlet = gevent.spawn(echo)
+        for _ in range(100):
+            a.sendall(b"x")
+            a.recv(1)
+        greenlet.join()
+        print(len(calls) < 10)
+        """
+    )
+    assert output == "True"
+
+
+def test_gevent_loop_runs_check_watchers_after_io_callbacks():
+    output = run_script(
+        """
+        import socket
+
+        a, b = socket.socketpair()
+        order = []
+        prepare = loop.prepare()
+        check = loop.check()
+        io = loop.io(a.fileno(), 1)
+        prepare.start(order.append, "prepare")
+        check.start(order.append, "check")
+        io.start(lambda: (order.append("io"), a.recv(1)))
+
+        gevent.sleep(0.01)
+        del order[:]
+        b.send(b"x")
+        gevent.sleep(0.01)
+        for watcher in (prepare, check, io):
+            watcher.stop()
+        print(order[:3], loop._ref_count)
+        """
+    )
+    # Like in libev, the check watchers run after the IO callbacks of the
+    # same iteration
+    assert output == "['prepare', 'io', 'check'] 0"
+
+
+def test_gevent_loop_runs_idle_watchers_without_blocking():
+    output = run_script(
+        """
+        idle = []
+        watcher = loop.idle()
+        watcher.start(idle.append, None)
+        gevent.sleep(0.02)
+        watcher.stop()
+        count = len(idle)
+        gevent.sleep(0.01)
+        print(count > 10, len(idle) == count)
+        """
+    )
+    assert output == "True True"
+
+
+def test_gevent_loop_closing_fd_wakes_up_its_watchers():
+    output = run_script(
+        """
+        import os
+
+        import gevent.socket
+
+        a, b = gevent.socket.socketpair()
+        fired = []
+        watcher = loop.io(a.fileno(), 1)
+        watcher.start(lambda events: (fired.append(events), watcher.stop()), pass_events=True)
+        deferred = loop.closing_fd(a.fileno())
+        gevent.sleep(0.01)
+
+        def recv():
+            try:
+                b.recv(1)
+            except OSError as e:
+                return type(e).__name__
+
+        greenlet = gevent.spawn(recv)
+        gevent.sleep(0.01)
+        # gevent defers closing the socket to a check watcher
+        fd = b.fileno()
+        b.close()
+        result = greenlet.get(timeout=1)
+        gevent.sleep(0.01)
+        try:
+            os.fstat(fd)
+        except OSError:
+            result += " closed"
+        print(deferred, fired, loop.closing_fd(12345), result)
+        """
+    )
+    assert output == "True [1] False cancel_wait_ex closed"
+
+
+def test_gevent_loop_registers_reused_fd_numbers_again():
+    output = run_script(
+        """
+        import os
+
+        import gevent.os
+
+        def read_pipe():
+            r, w = os.pipe()
+            gevent.os.make_nonblocking(r)
+            gevent.spawn_later(0.01, os.write, w, b"x")
+            return r, w, gevent.os.nb_read(r, 1)
+
+        r, w, first = read_pipe()
+        # The fd is closed and its number reused in the same iteration, before
+        # the stopped watcher's registration is synced
+        os.close(r)
+        os.close(w)
+        with gevent.Timeout(2):
+            r2, w2, second = read_pipe()
+        print(r2 == r, first, second)
+        """
+    )
+    assert output == "True b'x' b'x'"
+
+
+def test_gevent_loop_stat_watchers_share_one_inotify_watch_per_directory():
+    output = run_script(
+        """
+        import os
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        paths = [os.path.join(directory, str(i)) for i in range(100)]
+        fired = []
+        watchers = []
+        for path in paths:
+            # The default interval polls every 5 seconds, so only inotify is
+            # fast enough
+            watcher = loop.stat(path)
+            watcher.start(lambda w: fired.append((w.path, w.prev is None, w.attr is None)), watcher)
+            watchers.append(watcher)
+
+        open(paths[0], "w").close()
+        gevent.sleep(0.1)
+        with open(paths[0], "a") as f:
+            f.write("changed")
+        gevent.sleep(0.1)
+        os.unlink(paths[0])
+        gevent.sleep(0.1)
+
+        directories = len(loop._inotify._directories)
+        for watcher in watchers:
+            watcher.stop()
+        print(fired == [(paths[0], True, False), (paths[0], False, False), (paths[0], False, True)], directories, len(loop._inotify._directories))
+        os.rmdir(directory)
+        """
+    )
+    assert output == "True 1 0"
+
+
+def test_gevent_loop_polls_stat_watchers_in_batches():
+    output = run_script(
+        """
+        import os
+        import shutil
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        loop.use_inotify = False
+        fired = []
+        watchers = []
+        for i in range(10):
+            watcher = loop.stat(os.path.join(directory, str(i)), 0.01)
+            watcher.start(lambda w: fired.append(w.attr is not None), watcher)
+            watchers.append(watcher)
+
+        for i in range(10):
+            open(os.path.join(directory, str(i)), "w").close()
+        gevent.sleep(0.3)
+
+        pollers = list(loop._stat_pollers.values())
+        print(watchers[0].interval == 0.1074891, len(pollers), len(pollers[0].watchers), fired == [True] * 10)
+        for watcher in watchers:
+            watcher.stop()
+        shutil.rmtree(directory)
+        """
+    )
+    assert output == "True 1 10 True"
+
+
+def test_gevent_loop_stat_watchers_fall_back_to_polling_when_the_directory_is_removed():
+    output = run_script(
+        """
+        import os
+        import shutil
+        import tempfile
+
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, "file")
+        open(path, "w").close()
+        fired = []
+        watcher = loop.stat(path, 0.11)
+        watcher.start(lambda: fired.append(watcher.attr is not None))
+        backends = [type(watcher._backend).__name__]
+
+        shutil.rmtree(directory)
+        gevent.sleep(0.1)
+        backends.append(type(watcher._backend).__name__)
+        os.mkdir(directory)
+        open(path, "w").close()
+        gevent.sleep(0.3)
+
+        watcher.stop()
+        print(backends, fired)
+        shutil.rmtree(directory)
+        """
+    )
+    assert output == "['Inotify', 'StatPoller'] [False, True]"
+
+
+def test_gevent_loop_removes_the_inotify_watch_of_a_moved_directory():
+    output = run_script(
+        """
+        import os
+        import shutil
+        import tempfile
+
+        def watches():
+            with open("/proc/self/fdinfo/%d" % loop._inotify.fd) as f:
+                return sum(line.startswith("inotify") for line in f)
+
+        parent = tempfile.mkdtemp()
+        directory = os.path.join(parent, "directory")
+        os.mkdir(directory)
+        watcher = loop.stat(os.path.join(directory, "file"), 0.11)
+        watcher.start(lambda: None)
+        before = watches()
+
+        os.rename(directory, os.path.join(parent, "moved"))
+        gevent.sleep(0.1)
+
+        print(before, watches(), type(watcher._backend).__name__)
+        watcher.stop()
+        shutil.rmtree(parent)
+        """
+    )
+    assert output == "1 0 StatPoller"
+
+
+def test_gevent_loop_coalesces_async_sends():
+    output = run_script(
+        """
+        import threading
+
+        import gevent.threadpool
+
+        writes = [0]
+        write_to_self = loop.aio._write_to_self
+
+        def counting_write_to_self():
+            writes[0] += 1
+            write_to_self()
+
+        loop.aio._write_to_self = counting_write_to_self
+
+        fired = []
+        watchers = [loop.async_() for _ in range(10)]
+        for i, watcher in enumerate(watchers):
+            watcher.start(fired.append, i)
+
+        def send():
+            for _ in range(100):
+                for watcher in watchers:
+                    watcher.send()
+
+        thread = threading.Thread(target=send)
+        thread.start()
+        thread.join()
+        gevent.sleep(0.01)
+        coalesced = (sorted(fired) == list(range(10)), writes[0])
+
+        pool = gevent.threadpool.ThreadPool(4)
+        results = [pool.spawn(int, i) for i in range(100)]
+        print(coalesced, [result.get() for result in results] == list(range(100)))
+        pool.kill()
+        """
+    )
+    assert output == "(True, 1) True"
+
+
+def test_gevent_loop_watchers_are_slotted_and_kept_alive_while_active():
+    output = run_script(
+        """
+        import gc
+        import weakref
+
+        objects = [loop.io(0, 1), loop.timer(1), loop.async_(), loop.idle(), loop.run_callback(int)]
+        slotted = not any(hasattr(obj, "__dict__") for obj in objects)
+
+        watcher = loop.async_()
+        watcher.start(print, "sent")
+        ref = weakref.ref(watcher)
+        del watcher
+        gc.collect()
+        ref().send()
+        gevent.sleep(0.01)
+        ref().stop()
+        gc.collect()
+        print(slotted, ref() is None)
+        """
+    )
+    assert output == "sent\nTrue True"
@@ -0,0 +1,157 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def test_greenlet_to_future_resolves_with_result():
+    async def main():
+        return await asyncio_gevent.greenlet_to_future(gevent.spawn(lambda: gevent.sleep(0.01) or 42))
+
+    assert asyncio.run(main()) == 42
+
+
+def test_greenlet_to_future_raises_exception():
+    def fn():
+        gevent.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        await asyncio_gevent.greenlet_to_future(gevent.spawn(fn))
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(main())
+
+
+def test_greenlet_to_future_with_dead_greenlet():
+    greenlet = gevent.spawn(lambda: 42)
+    greenlet.join()
+
+    async def main():
+        return await asyncio_gevent.greenlet_to_future(greenlet)
+
+    assert asyncio.run(main()) == 42
+
+
+def test_greenlet_to_future_starts_the_greenlet_when_called():
+    async def main():
+        greenlet = gevent.Greenlet(lambda: 42)
+        future = asyncio_gevent.greenlet_to_future(greenlet)
+        started = greenlet.started
+        # The greenlet runs even though the future is never awaited
+        await asyncio.sleep(0.01)
+
+        unstarted = gevent.Greenlet(lambda: 42)
+        asyncio_gevent.greenlet_to_future(unstarted, autostart_greenlet=False)
+        await asyncio.sleep(0.01)
+        return started, greenlet.dead, future.result(), unstarted.started
+
+    assert asyncio.run(main()) == (True, True, 42, False)
+
+
+def test_greenlet_to_future_doesnt_wait_for_the_greenlet_when_cancelled():
+    def slow_to_die():
+        try:
+            gevent.sleep(10)
+        except gevent.GreenletExit:
+            gevent.sleep(0.05)
+            return "cleaned up"
+
+    async def main():
+        greenlet = gevent.spawn(slow_to_die)
+        future = asyncio_gevent.greenlet_to_future(greenlet)
+        await asyncio.sleep(0.01)
+        future.cancel()
+        await asyncio.sleep(0)
+        alive = not greenlet.dead
+        await asyncio.sleep(0.1)
+        return alive, greenlet.value
+
+    assert asyncio.run(main()) == (True, "cleaned up")
+
+
+def test_greenlet_to_future_is_cancelled_when_greenlet_is_killed():
+    async def main():
+        greenlet = gevent.spawn(gevent.sleep, 10)
+        future = asyncio_gevent.greenlet_to_future(greenlet)
+        await asyncio.sleep(0.01)
+        greenlet.kill(block=False)
+        with pytest.raises(asyncio.CancelledError):
+            await future
+
+    asyncio.run(main())
+
+
+def test_greenlet_to_future_kills_greenlet_when_cancelled():
+    async def main():
+        greenlet = gevent.spawn(gevent.sleep, 10)
+        future = asyncio_gevent.greenlet_to_future(greenlet)
+        await asyncio.sleep(0.01)
+        future.cancel()
+        await asyncio.sleep(0.01)
+        return greenlet
+
+    greenlet = asyncio.run(main())
+    assert greenlet.dead
+    assert isinstance(greenlet.value, gevent.GreenletExit)
+
+
+def test_greenlet_to_future_does_not_use_the_default_executor():
+    async def main():
+        futures = [asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.sleep, 0.01)) for _ in range(100)]
+        await asyncio.gather(*futures)
+        return asyncio.get_running_loop()._default_executor  # type: ignore
+
+    assert asyncio.run(main()) is None
+
+
+@pytest.mark.parametrize("loop_factory", [asyncio_gevent.EventLoop, asyncio_gevent.HubEventLoop])
+def test_greenlet_to_future_eager_resolves_non_blocking_greenlets_right_away(loop_factory):
+    async def main():
+        future = asyncio_gevent.greenlet_to_future(gevent.Greenlet(lambda: 42), eager=True)
+        done = future.done()
+        blocking = asyncio_gevent.greenlet_to_future(gevent.Greenlet(lambda: gevent.sleep(0.01) or 43), eager=True)
+        return done, await future, await blocking
+
+    loop = loop_factory()
+    try:
+        assert loop.run_until_complete(main()) == (True, 42, 43)
+    finally:
+        loop.close()
+
+
+def test_sync_to_async_eager_returns_without_suspending():
+    fn = asyncio_gevent.sync_to_async(lambda x: x + 1, eager=True)
+
+    # The coroutine finishes on its first step, it never awaits a future
+    with pytest.raises(StopIteration) as info:
+        fn(41).send(None)
+
+    assert info.value.value == 42
+
+
+def test_sync_to_async_eager_falls_back_to_a_future_when_blocking():
+    def fn():
+        gevent.sleep(0.01)
+        raise ValueError("boom")
+
+    killed = asyncio_gevent.sync_to_async(lambda: gevent.getcurrent().kill(block=False) or gevent.sleep(1), eager=True)
+
+    async def main():
+        with pytest.raises(ValueError, match="boom"):
+            await asyncio_gevent.sync_to_async(fn, eager=True)()
+        with pytest.raises(asyncio.CancelledError):
+            await killed()
+
+    asyncio.run(main())
+
+    with pytest.raises(ValueError):
+        asyncio_gevent.sync_to_async(int, eager=True, max_concurrency=1)
@@ -0,0 +1,110 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+import threading  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio_gevent.HubEventLoop()
+    yield loop
+    loop.close()
+
+
+def test_hub_event_loop_runs_coroutines(loop):
+    async def main():
+        await asyncio.sleep(0)
+        return 42
+
+    assert loop.run_until_complete(main()) == 42
+
+
+def test_hub_event_loop_call_later_waits_at_least_the_delay(loop):
+    async def main():
+        start = time.monotonic()
+        await asyncio.sleep(0.05)
+        return time.monotonic() - start
+
+    assert loop.run_until_complete(main()) >= 0.05
+
+
+def test_hub_event_loop_cancelled_timers_do_not_fire(loop):
+    fired = []
+    handle = loop.call_later(0.01, fired.append, 1)
+    handle.cancel()
+    loop.run_until_complete(asyncio.sleep(0.05))
+    assert fired == []
+    assert not loop._timers
+
+
+def test_hub_event_loop_echo_server(loop):
+    async def handle(reader, writer):
+        writer.write(await reader.read(100))
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"hello")
+        await writer.drain()
+        data = await reader.read(100)
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return data
+
+    assert loop.run_until_complete(main()) == b"hello"
+
+
+def test_hub_event_loop_reader_and_writer_share_a_file_descriptor(loop):
+    import socket
+
+    a, b = socket.socketpair()
+    a.setblocking(False)
+    b.setblocking(False)
+
+    async def main():
+        readable = loop.create_future()
+        writable = loop.create_future()
+        loop.add_reader(a.fileno(), lambda: readable.done() or readable.set_result(a.recv(10)))
+        loop.add_writer(a.fileno(), lambda: writable.done() or writable.set_result(True))
+        assert await writable
+        loop.remove_writer(a.fileno())
+        b.send(b"x")
+        data = await readable
+        loop.remove_reader(a.fileno())
+        return data
+
+    try:
+        assert loop.run_until_complete(main()) == b"x"
+        assert a.fileno() not in loop._io_registrations
+    finally:
+        a.close()
+        b.close()
+
+
+def test_hub_event_loop_call_soon_threadsafe_wakes_the_loop(loop):
+    async def main():
+        future = loop.create_future()
+        thread = threading.Thread(target=lambda: loop.call_soon_threadsafe(future.set_result, 42))
+        thread.start()
+        return await future
+
+    assert loop.run_until_complete(main()) == 42
+
+
+def test_hub_event_loop_runs_alongside_greenlets(loop):
+    async def main():
+        return await asyncio_gevent.greenlet_to_future(gevent.spawn(lambda: gevent.sleep(0.01) or 42))
+
+    assert loop.run_until_complete(main()) == 42
@@ -0,0 +1,128 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+@pytest.fixture
+def collector():
+    collector = asyncio_gevent.BridgeCollector()
+    asyncio_gevent.add_bridge_observer(collector)
+    try:
+        yield collector
+    finally:
+        asyncio_gevent.remove_bridge_observer(collector)
+
+
+def test_latency_histogram_percentiles_are_within_its_precision():
+    histogram = asyncio_gevent.LatencyHistogram()
+    for i in range(1, 1001):
+        histogram.record(i / 1e6)
+
+    assert histogram.count == 1000
+    assert histogram.min == pytest.approx(1e-6)
+    assert histogram.max == pytest.approx(1e-3)
+    assert histogram.mean == pytest.approx(500.5e-6)
+    assert histogram.percentile(50) == pytest.approx(500e-6, rel=0.02)
+    assert histogram.percentile(99) == pytest.approx(990e-6, rel=0.02)
+    assert histogram.percentile(100) == pytest.approx(1e-3)
+
+
+def test_collector_counts_outcomes_of_sync_to_async(collector):
+    @asyncio_gevent.sync_to_async
+    def fn(fail):
+        gevent.sleep(0.001)
+        if fail:
+            raise ValueError()
+        return 1
+
+    async def main():
+        assert await fn(False) == 1
+        with pytest.raises(ValueError):
+            await fn(True)
+
+        task = asyncio.ensure_future(fn(False))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    stats = collector.stats()["sync_to_async"]
+    assert stats.crossings == 3
+    assert (stats.results, stats.exceptions, stats.cancelled, stats.killed) == (1, 1, 1, 0)
+    assert stats.wait_time.count == 3
+    assert stats.duration.count == 3
+    assert stats.duration.max >= 0.001 > stats.wait_time.max
+
+
+def test_collector_tells_killed_greenlets_from_cancelled_futures(collector):
+    async def main():
+        greenlet = gevent.spawn(gevent.sleep, 1)
+        future = asyncio_gevent.greenlet_to_future(greenlet)
+        await asyncio.sleep(0.001)
+        greenlet.kill(block=False)
+        with pytest.raises(asyncio.CancelledError):
+            await future
+
+        future = asyncio.get_running_loop().create_future()
+        greenlet = asyncio_gevent.future_to_greenlet(future)
+        greenlet.start()
+        await asyncio.sleep(0.001)
+        future.cancel()
+        await asyncio.sleep(0.001)
+        assert greenlet.dead
+
+    asyncio.run(main())
+
+    stats = collector.stats()
+    assert stats["greenlet_to_future"].killed == 1
+    assert stats["greenlet_to_future"].wait_time.count == 0
+    assert stats["future_to_greenlet"].cancelled == 1
+
+
+def test_collector_counts_async_to_sync_and_pooled_calls(collector):
+    @asyncio_gevent.async_to_sync
+    async def double(x):
+        await asyncio.sleep(0)
+        return 2 * x
+
+    @asyncio_gevent.sync_to_async(max_concurrency=2)
+    def fn(x):
+        gevent.sleep(0)
+        return x
+
+    async def main():
+        return await asyncio.gather(*(fn(i) for i in range(5)))
+
+    assert [double(i) for i in range(3)] == [0, 2, 4]
+    assert asyncio.run(main()) == list(range(5))
+
+    stats = collector.stats()
+    assert stats["async_to_sync"].results == 3
+    assert stats["async_to_sync"].wait_time.count == 3
+    assert stats["sync_to_async"].results == 5
+
+    collector.reset()
+    assert collector.stats() == {}
+
+
+def test_bridges_are_not_instrumented_without_observers():
+    events = []
+    asyncio_gevent.add_bridge_observer(events.append)
+    asyncio_gevent.remove_bridge_observer(events.append)
+
+    async def main():
+        return await asyncio_gevent.sync_to_async(lambda: 1)()
+
+    assert asyncio.run(main()) == 1
+    assert events == []
@@ -0,0 +1,186 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def test_lock_is_shared_by_greenlets_and_tasks_in_fifo_order():
+    async def main():
+        lock = asyncio_gevent.Lock()
+        order = []
+        inside = []
+
+        def in_greenlet(name):
+            with lock:
+                inside.append(name)
+                order.append(name)
+                gevent.sleep(0.001)
+                assert inside == [name]
+                inside.remove(name)
+
+        async def in_task(name):
+            async with lock:
+                inside.append(name)
+                order.append(name)
+                await asyncio.sleep(0.001)
+                assert inside == [name]
+                inside.remove(name)
+
+        await lock.aacquire()
+        greenlets = []
+        tasks = []
+        for i in range(5):
+            # Every waiter starts waiting before the next one is started
+            greenlets.append(gevent.spawn(in_greenlet, f"greenlet {i}"))
+            await asyncio.sleep(0.001)
+            tasks.append(asyncio.ensure_future(in_task(f"task {i}")))
+            await asyncio.sleep(0.001)
+        lock.release()
+
+        await asyncio.gather(*tasks)
+        await asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.joinall, greenlets, raise_error=True))
+        assert order == [name for i in range(5) for name in (f"greenlet {i}", f"task {i}")]
+        assert not lock.locked()
+
+        with pytest.raises(RuntimeError):
+            lock.release()
+
+    asyncio.run(main())
+
+
+def test_semaphore_timeouts_and_cancellation():
+    async def main():
+        semaphore = asyncio_gevent.Semaphore(2)
+        assert semaphore.acquire()
+        await semaphore.aacquire()
+        assert semaphore.locked()
+        assert not semaphore.acquire(blocking=False)
+        assert not await asyncio_gevent.greenlet_to_future(gevent.spawn(semaphore.acquire, timeout=0.01))
+
+        # The semaphore is handed to the task, which is cancelled before it
+        # runs, so it's passed on to the greenlet
+        task = asyncio.ensure_future(semaphore.aacquire())
+        await asyncio.sleep(0)
+        greenlet = gevent.spawn(semaphore.acquire)
+        await asyncio.sleep(0.01)
+        semaphore.release()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await asyncio_gevent.greenlet_to_future(greenlet)
+        assert semaphore.locked()
+
+        semaphore.release()
+        semaphore.release()
+        assert not semaphore.locked()
+
+    asyncio.run(main())
+
+
+def test_event_wakes_greenlets_and_tasks():
+    async def main():
+        event = asyncio_gevent.Event()
+        assert not await asyncio_gevent.greenlet_to_future(gevent.spawn(event.wait, 0.01))
+
+        greenlets = [gevent.spawn(event.wait) for _ in range(3)]
+        tasks = [asyncio.ensure_future(wait_for_event(event)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert not any(task.done() for task in tasks)
+
+        gevent.spawn(event.set)
+        assert await asyncio.gather(*tasks) == [True] * 3
+        await asyncio_gevent.greenlet_to_future(gevent.spawn(gevent.joinall, greenlets))
+        assert [greenlet.value for greenlet in greenlets] == [True] * 3
+
+        assert await event
+        event.clear()
+        assert not event.is_set()
+
+    async def wait_for_event(event):
+        return await event
+
+    asyncio.run(main())
+
+
+def test_condition_between_greenlets_and_coroutines():
+    async def main():
+        condition = asyncio_gevent.Condition()
+        items = []
+
+        def produce():
+            for i in range(10):
+                with condition:
+                    items.append(i)
+                    condition.notify()
+                gevent.sleep(0.001)
+
+        async def consume():
+            consumed = []
+            while len(consumed) < 10:
+                async with condition:
+                    await condition.await_for(lambda: items)
+                    consumed.append(items.pop(0))
+            return consumed
+
+        task = asyncio.ensure_future(consume())
+        greenlet = gevent.spawn(produce)
+        assert await task == list(range(10))
+        await asyncio_gevent.greenlet_to_future(greenlet)
+
+        def wait_in_greenlet():
+            with condition:
+                return condition.wait_for(lambda: items, timeout=0.01)
+
+        assert await asyncio_gevent.greenlet_to_future(gevent.spawn(wait_in_greenlet)) == []
+        assert not condition.locked()
+
+        with pytest.raises(RuntimeError):
+            condition.notify()
+
+    asyncio.run(main())
+
+
+def test_releasing_from_a_task_doesnt_wake_the_loop():
+    loop = asyncio.SelectorEventLoop()
+    writes = []
+    write_to_self = loop._write_to_self
+    loop._write_to_self = lambda: writes.append(True) or write_to_self()
+
+    async def main():
+        semaphore = asyncio_gevent.Semaphore(0)
+        event = asyncio_gevent.Event()
+        condition = asyncio_gevent.Condition()
+
+        async def wait_for_event():
+            await event
+
+        async def wait_for_condition():
+            async with condition:
+                await condition
+
+        waiters = [
+            asyncio.ensure_future(semaphore.aacquire()),
+            asyncio.ensure_future(wait_for_event()),
+            asyncio.ensure_future(wait_for_condition()),
+        ]
+        await asyncio.sleep(0.01)
+        del writes[:]
+        semaphore.release()
+        event.set()
+        async with condition:
+            condition.notify()
+        await asyncio.gather(*waiters)
+        return len(writes)
+
+    try:
+        assert loop.run_until_complete(main()) == 0
+    finally:
+        loop.close()
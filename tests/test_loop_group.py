@@ -0,0 +1,90 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+import concurrent.futures  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+_get_ident = gevent.monkey.get_original("_thread", "get_ident")
+
+
+async def async_thread_id(delay: float = 0):
+    await asyncio.sleep(delay)
+    return _get_ident()
+
+
+def thread_id():
+    gevent.sleep(0)
+    return _get_ident()
+
+
+def test_loop_group_runs_coroutines_and_functions_on_its_threads():
+    with asyncio_gevent.LoopGroup(2) as group:
+        futures = [group.submit(async_thread_id), group.submit(thread_id), group.submit(async_thread_id())]
+        thread_ids = [future.result(timeout=10) for future in futures]
+
+        stats = group.stats()
+
+    assert set(thread_ids) == {stats[0].thread_id, stats[1].thread_id}
+    assert _get_ident() not in thread_ids
+    assert [thread_stats.submitted for thread_stats in stats] == [2, 1]
+    assert [thread_stats.in_flight for thread_stats in stats] == [0, 0]
+
+
+def test_loop_group_futures_can_be_awaited_and_waited_for_by_greenlets():
+    with asyncio_gevent.LoopGroup(2) as group:
+
+        async def main():
+            return await group.submit(async_thread_id, 0.01)
+
+        def wait_in_greenlet():
+            return group.submit(thread_id).get(timeout=10)
+
+        assert asyncio.run(main()) != _get_ident()
+        assert gevent.spawn(wait_in_greenlet).get() != _get_ident()
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            group.submit(asyncio.sleep, 1).get(timeout=0.01)
+
+
+def test_loop_group_propagates_exceptions_and_cancels_running_jobs():
+    def fail():
+        raise ValueError()
+
+    with asyncio_gevent.LoopGroup(1) as group:
+        with pytest.raises(ValueError):
+            group.submit(fail).result(timeout=10)
+
+        future = group.submit(asyncio.sleep, 10)
+        while not future.running():
+            gevent.sleep(0.001)
+        assert not future.cancel()
+        with pytest.raises(concurrent.futures.CancelledError):
+            future.result(timeout=10)
+
+
+def test_loop_group_places_jobs_on_the_least_loaded_thread():
+    with asyncio_gevent.LoopGroup(2, placement="least_loaded") as group:
+        busy = group.submit(asyncio.sleep, 10)
+        results = [group.submit(async_thread_id).result(timeout=10) for _ in range(3)]
+        assert set(results) == {group.stats()[1].thread_id}
+        busy.cancel()
+
+
+def test_loop_group_batches_wakeups():
+    with asyncio_gevent.LoopGroup(1) as group:
+        block = group.submit(gevent.monkey.get_original("time", "sleep"), 0.1)
+        futures = [group.submit(thread_id) for _ in range(100)]
+        for future in [block, *futures]:
+            future.result(timeout=10)
+        stats = group.stats()[0]
+
+    assert stats.submitted == 101
+    assert stats.wakeups < 10
@@ -0,0 +1,85 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+import time  # noqa: E402
+
+import gevent  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def busy_greenlet(duration: float):
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        pass
+
+
+async def busy_coroutine(duration: float):
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        pass
+
+
+def test_loop_monitor_attributes_stalls_to_greenlets_and_tasks():
+    stalls = []
+
+    async def main():
+        monitor = asyncio_gevent.LoopMonitor(
+            asyncio.get_running_loop(), threshold=0.05, lag_interval=0.01, on_stall=stalls.append
+        )
+        monitor.start()
+        try:
+            await asyncio_gevent.greenlet_to_future(gevent.spawn(busy_greenlet, 0.1))
+            await asyncio.create_task(busy_coroutine(0.1), name="busy")
+            await asyncio.sleep(0.02)
+        finally:
+            monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(main())
+
+    stats = monitor.stats()
+    assert stats.stalls == len(stalls) == len(monitor.stalls) == 2
+    assert stats.stall_time >= 0.2
+    assert stats.max_loop_lag >= 0.05
+    assert stats.max_hub_gap >= 0.1
+    assert stats.switches > 0
+
+    greenlet_stall, task_stall = stalls
+    assert greenlet_stall.task is None
+    assert greenlet_stall.duration >= 0.1
+    assert any("busy_greenlet" in line for line in greenlet_stall.stack)
+    assert "busy" in task_stall.task
+    assert any("busy_coroutine" in line for line in task_stall.stack)
+
+
+def test_loop_monitor_without_sampler_records_stalls_without_stacks():
+    async def main():
+        monitor = asyncio_gevent.LoopMonitor(asyncio.get_running_loop(), threshold=0.02, sample_interval=None)
+        monitor.start()
+        try:
+            await asyncio_gevent.greenlet_to_future(gevent.spawn(busy_greenlet, 0.05))
+        finally:
+            monitor.stop()
+        return monitor
+
+    monitor = asyncio.run(main())
+    assert [stall.stack for stall in monitor.stalls] == [None]
+
+
+def test_loop_monitor_stops_tracing():
+    async def main():
+        monitor = asyncio_gevent.LoopMonitor(asyncio.get_running_loop(), threshold=0.02)
+        monitor.start()
+        monitor.stop()
+        await asyncio_gevent.greenlet_to_future(gevent.spawn(busy_greenlet, 0.05))
+        return monitor
+
+    monitor = asyncio.run(main())
+    assert not monitor.running
+    assert monitor.stats().stalls == 0
+    assert monitor.stats().current_stall == 0.0
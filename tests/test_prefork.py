@@ -0,0 +1,91 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The supervisor forks, so it runs in a fresh interpreter. The first worker
+# prints the port, because greenlets of the supervisor would be copied into the
+# workers.
+SERVER = """
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio
+import os
+import sys
+
+import asyncio_gevent
+
+
+async def handle(reader, writer):
+    line = await reader.readline()
+    if line == b"exit\\n":
+        os._exit(1)
+    writer.write(b"%d\\n" % os.getpid())
+    await writer.drain()
+    writer.close()
+
+
+async def main(sockets, index):
+    server = await asyncio.start_server(handle, sock=sockets[0])
+    if index == 0:
+        print(sockets[0].getsockname()[1], flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+server = asyncio_gevent.PreforkServer(main, [("127.0.0.1", 0)], workers=2, reuse_port=sys.argv[1] == "reuse_port")
+server.run()
+print("restarts", server.restarts, flush=True)
+"""
+
+
+def request(port: int, line: bytes = b"pid\n") -> bytes:
+    with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+        sock.sendall(line)
+        return sock.recv(64)
+
+
+@pytest.mark.parametrize("mode", ["shared", "reuse_port"])
+def test_prefork_server_restarts_workers_and_stops_on_sigterm(mode):
+    if mode == "reuse_port" and not hasattr(socket, "SO_REUSEPORT"):
+        pytest.skip("SO_REUSEPORT is not supported")
+
+    process = subprocess.Popen(
+        [sys.executable, "-c", SERVER, mode],
+        env=dict(os.environ, PYTHONPATH=ROOT),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    try:
+        port = int(process.stdout.readline())
+
+        pids = {int(request(port)) for _ in range(20)}
+        assert process.pid not in pids
+
+        request(port, b"exit\n")
+
+        # The replacement of the worker that exited serves requests too. With
+        # SO_REUSEPORT, connections queued on the socket of the worker that
+        # exited are reset.
+        deadline = time.monotonic() + 10
+        while True:
+            assert time.monotonic() < deadline
+            try:
+                if int(request(port)) not in pids:
+                    break
+            except ConnectionResetError:
+                pass
+    finally:
+        process.send_signal(signal.SIGTERM)
+        stdout, stderr = process.communicate(timeout=30)
+
+    assert process.returncode == 0, stderr
+    assert stdout.split(b"\n")[-2] == b"restarts 1"
@@ -0,0 +1,99 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+class Source:
+    def __init__(self, n: int, delay: float = 0, fail: bool = False):
+        self.n = n
+        self.delay = delay
+        self.fail = fail
+        self.produced = 0
+        self.consumed = 0
+        self.max_lead = 0
+        self.closed = False
+
+    def items(self):
+        try:
+            for i in range(self.n):
+                gevent.sleep(self.delay)
+                self.produced += 1
+                self.max_lead = max(self.max_lead, self.produced - self.consumed)
+                yield i
+            if self.fail:
+                raise ValueError()
+        finally:
+            self.closed = True
+
+    async def consume(self, aiterator, limit=None):
+        items = []
+        async for item in aiterator:
+            self.consumed += 1
+            items.append(item)
+            if len(items) == limit:
+                break
+        return items
+
+
+def test_sync_iter_to_async_streams_items_with_backpressure():
+    async def main():
+        source = Source(200)
+        assert await source.consume(asyncio_gevent.sync_iter_to_async(source.items(), prefetch=8, batch=4)) == list(
+            range(200)
+        )
+        assert source.closed
+        assert source.max_lead <= 8 + 4
+
+        failing = Source(3, fail=True)
+        aiterator = asyncio_gevent.sync_iter_to_async(failing.items())
+        assert [await aiterator.__anext__() for _ in range(3)] == [0, 1, 2]
+        with pytest.raises(ValueError):
+            await aiterator.__anext__()
+
+    asyncio.run(main())
+
+    with pytest.raises(ValueError):
+        asyncio_gevent.sync_iter_to_async([], batch=0)
+
+
+def test_sync_iter_to_async_closes_the_iterable():
+    async def main():
+        source = Source(100)
+        async with asyncio_gevent.sync_iter_to_async(source.items(), prefetch=4) as aiterator:
+            assert await source.consume(aiterator, 2) == [0, 1]
+            assert not source.closed
+        assert source.closed
+
+        source = Source(100, delay=10)
+        task = asyncio.ensure_future(source.consume(asyncio_gevent.sync_iter_to_async(source.items())))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0.05)
+        assert source.closed
+
+    asyncio.run(main())
+
+
+def test_sync_iter_to_async_raises_cancelled_error_when_the_greenlet_is_killed():
+    async def main():
+        source = Source(100, delay=10)
+        aiterator = asyncio_gevent.sync_iter_to_async(source.items())
+        task = asyncio.ensure_future(source.consume(aiterator))
+        await asyncio.sleep(0.05)
+        aiterator.greenlet.kill()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert source.closed
+
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+import gevent.monkey
+
+gevent.monkey.patch_all()
+
+import asyncio  # noqa: E402
+
+import gevent  # noqa: E402
+import pytest  # noqa: E402
+
+import asyncio_gevent  # noqa: E402
+
+asyncio.set_event_loop_policy(asyncio_gevent.EventLoopPolicy())
+
+
+def test_sync_to_async_with_max_concurrency_limits_running_calls():
+    running = []
+    max_running = []
+
+    @asyncio_gevent.sync_to_async(max_concurrency=3)
+    def fn(i):
+        running.append(i)
+        max_running.append(len(running))
+        gevent.sleep(0.01)
+        running.remove(i)
+        return i
+
+    async def main():
+        return await asyncio.gather(*(fn(i) for i in range(20)))
+
+    assert asyncio.run(main()) == list(range(20))
+    assert max(max_running) == 3
+
+    stats = fn.pool.stats()
+    assert stats.workers == 3
+    assert stats.submitted == stats.started == stats.completed == 20
+    assert stats.queue_depth == 0
+    assert stats.max_wait_time > 0
+
+
+def test_sync_to_async_with_pool_runs_in_fifo_order():
+    pool = asyncio_gevent.GreenletPool(1)
+    order = []
+
+    @asyncio_gevent.sync_to_async(pool=pool)
+    def fn(i):
+        order.append(i)
+
+    async def main():
+        await asyncio.gather(*(fn(i) for i in range(10)))
+
+    asyncio.run(main())
+    assert order == list(range(10))
+
+
+def test_sync_to_async_with_pool_reuses_workers():
+    pool = asyncio_gevent.GreenletPool(2)
+
+    @asyncio_gevent.sync_to_async(pool=pool)
+    def fn():
+        return gevent.getcurrent()
+
+    async def main():
+        return [await fn() for _ in range(10)]
+
+    assert len(set(asyncio.run(main()))) == 1
+
+
+def test_sync_to_async_with_pool_raises_exception():
+    @asyncio_gevent.sync_to_async(max_concurrency=1)
+    def fn():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(fn())
+
+
+def test_cancelling_a_pooled_call_interrupts_the_function_but_not_the_worker():
+    pool = asyncio_gevent.GreenletPool(1)
+    interrupted = []
+
+    @asyncio_gevent.sync_to_async(pool=pool)
+    def sleep(duration):
+        try:
+            gevent.sleep(duration)
+        except gevent.GreenletExit:
+            interrupted.append(True)
+            raise
+        return duration
+
+    async def main():
+        task = asyncio.ensure_future(sleep(10))
+        queued = asyncio.ensure_future(sleep(0))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await queued
+
+    assert asyncio.run(main()) == 0
+    assert interrupted == [True]
+    assert pool.stats().workers == 1
+    assert pool.stats().cancelled == 1
+
+
+def test_a_pooled_call_that_raises_a_base_exception_settles_and_replaces_the_worker():
+    pool = asyncio_gevent.GreenletPool(1)
+
+    class Abort(BaseException):
+        pass
+
+    @asyncio_gevent.sync_to_async(pool=pool)
+    def fn(abort):
+        if abort:
+            raise Abort()
+        return gevent.getcurrent()
+
+    async def main():
+        return await asyncio.gather(fn(True), fn(False), return_exceptions=True)
+
+    aborted, worker = asyncio.run(main())
+    assert isinstance(aborted, Abort)
+    assert pool.stats().workers == 1
+    assert pool.stats().completed == 2